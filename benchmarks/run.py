@@ -0,0 +1,252 @@
+"""Benchmarks for holidaycal hot paths, with `pandas.tseries.holiday` as a baseline when pandas is installed.
+
+Each case is timed cold (first call on fresh objects, including any index or cache building) and warm (repeated
+calls on the same objects) over 1, 10 and 100-year spans. Results are printed and optionally written as JSON so runs
+of different versions can be compared:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --compare results.json
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dateutil.relativedelta import relativedelta, MO, TH  # noqa: E402
+
+from holidaycal import EasterDelta, JointCalendar, ListHoliday, LondonBankHolidayCalendar, NYBankHolidayCalendar, \
+    RecurringHoliday  # noqa: E402
+from holidaycal import easter, observance  # noqa: E402
+
+try:
+    import pandas as pd
+    from pandas.tseries import holiday as pd_holiday
+    from pandas.tseries.offsets import DateOffset, Day, Easter
+except ImportError:
+    pd = None
+
+START_YEAR = 1950
+SPANS = (1, 10, 100)
+OBSERVANCES = ('weekend_to_monday', 'weekend_to_friday', 'nearest_weekday', 'sunday_to_monday',
+               'saturday_to_friday', 'sunday_to_tuesday')
+# pandas functions with the same behavior, where there is one
+PANDAS_OBSERVANCES = {
+    'weekend_to_monday': 'next_monday',
+    'weekend_to_friday': 'previous_friday',
+    'nearest_weekday': 'nearest_workday',
+    'sunday_to_monday': 'sunday_to_monday',
+}
+
+
+class Case:
+    """A benchmark case.
+
+    `setup` builds fresh objects and `run` takes them and does the timed work. The cold time is the first run on
+    fresh objects, after clearing the holidaycal module caches, the warm times are the following runs on the same
+    objects.
+    """
+
+    def __init__(self, name, library, span, setup, run):
+        self.name = name
+        self.library = library
+        self.span = span
+        self.setup = setup
+        self.run = run
+
+    def measure(self, repeat):
+        state = self.setup()
+        t0 = time.perf_counter()
+        self.run(state)
+        cold = time.perf_counter() - t0
+        warm = []
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            self.run(state)
+            warm.append(time.perf_counter() - t0)
+        return {
+            'name': self.name,
+            'library': self.library,
+            'span': self.span,
+            'cold': cold,
+            'warm_min': min(warm),
+            'warm_median': statistics.median(warm),
+            'repeat': repeat,
+        }
+
+
+def _clear_module_caches():
+    """Clears the caches that holidaycal keeps per process, so cold runs do not reuse the work of earlier cases."""
+    for table in easter._EASTER_TABLES.values():
+        table.clear()
+    with JointCalendar._combinations_lock:
+        JointCalendar._combinations.clear()
+
+
+def _cold(setup):
+    def cold_setup():
+        _clear_module_caches()
+        return setup()
+    return cold_setup
+
+
+def _fresh_calendar(cls):
+    def setup():
+        calendar = cls()
+        for rule in calendar.rules:
+            if hasattr(rule, 'cache_clear'):
+                rule.cache_clear()
+        return calendar
+    return setup
+
+
+def _days(start, end):
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def holidaycal_cases(span):
+    start, end = date(START_YEAR, 1, 1), date(START_YEAR + span - 1, 12, 31)
+    years = range(start.year, end.year + 1)
+    days = _days(start, end)
+    list_dates = NYBankHolidayCalendar().holidays(date(1900, 1, 1), date(2100, 12, 31))
+
+    cases = [
+        Case('RecurringHoliday.dates', 'holidaycal', span,
+             lambda: RecurringHoliday('Thanksgiving', offset=relativedelta(month=11, weekday=TH(4))),
+             lambda rule: rule.dates(start, end)),
+        Case('RecurringHoliday.dates observed', 'holidaycal', span,
+             lambda: RecurringHoliday('Christmas', month=12, day=25, observance=observance.sunday_to_monday),
+             lambda rule: rule.dates(start, end, observed=True)),
+        Case('ListHoliday.dates', 'holidaycal', span,
+             lambda: ListHoliday('List', list_dates),
+             lambda rule: rule.dates(start, end)),
+        Case('EasterDelta addition', 'holidaycal', span,
+             lambda: EasterDelta(days=-2),
+             lambda offset: [date(year, 1, 1) + offset for year in years]),
+    ]
+    for name in OBSERVANCES:
+        cases.append(Case(f'observance {name}', 'holidaycal', span,
+                          lambda name=name: getattr(observance, name),
+                          lambda func: [func(d) for d in days]))
+    for cls in (NYBankHolidayCalendar, LondonBankHolidayCalendar):
+        cases.append(Case(f'{cls.__name__}.holidays', 'holidaycal', span, _fresh_calendar(cls),
+                          lambda calendar: calendar.holidays(start, end)))
+    for case in cases:
+        case.setup = _cold(case.setup)
+    return cases
+
+
+def pandas_cases(span):
+    start, end = pd.Timestamp(START_YEAR, 1, 1), pd.Timestamp(START_YEAR + span - 1, 12, 31)
+    years = range(start.year, end.year + 1)
+    days = _days(date(START_YEAR, 1, 1), date(START_YEAR + span - 1, 12, 31))
+
+    class LondonCalendar(pd_holiday.AbstractHolidayCalendar):
+        rules = [
+            pd_holiday.Holiday('New Year\'s Day', month=1, day=1, observance=pd_holiday.next_monday),
+            pd_holiday.GoodFriday,
+            pd_holiday.EasterMonday,
+            pd_holiday.Holiday('Early May Holiday', month=5, day=1, offset=DateOffset(weekday=MO(1)),
+                               start_date=datetime(1978, 1, 1)),
+            pd_holiday.Holiday('Spring Holiday', month=5, day=31, offset=DateOffset(weekday=MO(-1))),
+            pd_holiday.Holiday('Summer Holiday', month=8, day=31, offset=DateOffset(weekday=MO(-1))),
+            pd_holiday.Holiday('Christmas', month=12, day=25, observance=pd_holiday.next_monday),
+            pd_holiday.Holiday('Boxing Day', month=12, day=26, observance=pd_holiday.next_monday_or_tuesday),
+        ]
+
+    cases = [
+        Case('RecurringHoliday.dates', 'pandas', span,
+             lambda: pd_holiday.Holiday('Thanksgiving', month=11, day=1, offset=DateOffset(weekday=TH(4))),
+             lambda rule: rule.dates(start, end)),
+        Case('RecurringHoliday.dates observed', 'pandas', span,
+             lambda: pd_holiday.Holiday('Christmas', month=12, day=25, observance=pd_holiday.sunday_to_monday),
+             lambda rule: rule.dates(start, end)),
+        Case('EasterDelta addition', 'pandas', span,
+             lambda: None,
+             lambda _: [pd.Timestamp(year, 1, 1) + Easter() - Day(2) for year in years]),
+    ]
+    for name in OBSERVANCES:
+        if name in PANDAS_OBSERVANCES:
+            cases.append(Case(f'observance {name}', 'pandas', span,
+                              lambda name=name: getattr(pd_holiday, PANDAS_OBSERVANCES[name]),
+                              lambda func: [func(d) for d in days]))
+    cases.append(Case('NYBankHolidayCalendar.holidays', 'pandas', span, pd_holiday.USFederalHolidayCalendar,
+                      lambda calendar: calendar.holidays(start, end)))
+    cases.append(Case('LondonBankHolidayCalendar.holidays', 'pandas', span, LondonCalendar,
+                      lambda calendar: calendar.holidays(start, end)))
+    return cases
+
+
+def _version():
+    try:
+        from importlib.metadata import version
+        return version('holidaycal')
+    except Exception:
+        return None
+
+
+def run(spans, repeat, use_pandas=True, pattern=None):
+    cases = []
+    for span in spans:
+        cases.extend(holidaycal_cases(span))
+        if use_pandas and pd is not None:
+            cases.extend(pandas_cases(span))
+    if pattern:
+        cases = [case for case in cases if pattern in case.name]
+
+    results = [case.measure(repeat) for case in cases]
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'holidaycal': _version(),
+        'pandas': pd.__version__ if use_pandas and pd is not None else None,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'start_year': START_YEAR,
+        'results': results,
+    }
+
+
+def _key(result):
+    return result['name'], result['library'], result['span']
+
+
+def print_results(report, baseline=None):
+    previous = {_key(r): r for r in baseline['results']} if baseline else {}
+    header = f'{"case":<40} {"library":<10} {"years":>5} {"cold (ms)":>10} {"warm (ms)":>10}'
+    if baseline:
+        header += f' {"vs base":>8}'
+    print(header)
+    for r in report['results']:
+        line = f'{r["name"]:<40} {r["library"]:<10} {r["span"]:>5} {r["cold"] * 1e3:>10.3f} ' \
+               f'{r["warm_min"] * 1e3:>10.3f}'
+        base = previous.get(_key(r))
+        if base:
+            line += f' {base["warm_min"] / r["warm_min"]:>7.2f}x'
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--spans', type=lambda s: [int(x) for x in s.split(',')], default=list(SPANS),
+                        help='comma-separated spans in years (default: 1,10,100)')
+    parser.add_argument('--repeat', type=int, default=20, help='warm runs per case (default: 20)')
+    parser.add_argument('--filter', help='only run cases whose name contains this text')
+    parser.add_argument('--no-pandas', action='store_true', help='skip the pandas baseline')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', help='JSON results of a previous run to compare warm times with')
+    args = parser.parse_args(argv)
+
+    report = run(args.spans, args.repeat, use_pandas=not args.no_pandas, pattern=args.filter)
+    baseline = json.loads(Path(args.compare).read_text()) if args.compare else None
+    print_results(report, baseline)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,34 @@
-from holidaycal.holiday import ListHoliday, RecurringHoliday
-from holidaycal.calendar import AbstractCalendar, LondonBankHolidayCalendar, NYBankHolidayCalendar
-from holidaycal.observance import sunday_to_monday, sunday_to_tuesday, nearest_weekday, weekend_to_monday, \
-    weekend_to_friday
-from holidaycal.easter import EasterDelta
+import importlib
+
+# public names by the module that defines them, imported on first access so `import holidaycal` stays cheap
+_exports = {
+    'holidaycal.holiday': ('ListHoliday', 'RecurringHoliday'),
+    'holidaycal.calendar': ('AbstractCalendar', 'JointCalendar', 'LondonBankHolidayCalendar', 'NYBankHolidayCalendar'),
+    'holidaycal.observance': ('Observance', 'CollisionObservance', 'sunday_to_monday', 'sunday_to_tuesday',
+                              'nearest_weekday', 'weekend_to_monday', 'weekend_to_friday', 'weekend_to_next_weekdays'),
+    'holidaycal.easter': ('EasterDelta',),
+    'holidaycal.bitmap': ('BusinessDayBitmap',),
+    'holidaycal.snapshot': ('CalendarSnapshot', 'compile_snapshot', 'load_snapshot', 'save_snapshot'),
+    'holidaycal.shared': ('SharedCalendar', 'attach_calendar', 'publish_calendar'),
+    'holidaycal.instrumentation': ('CalendarStats', 'RuleCall', 'RuleStats'),
+    'holidaycal.registry': ('get_calendar', 'register_calendar', 'registered_calendars', 'unregister_calendar'),
+    'holidaycal.schedule': ('Schedules', 'generate_schedule', 'generate_schedules'),
+    'holidaycal.daycount': ('DAY_COUNT_CONVENTIONS', 'day_count', 'day_count_array', 'year_fraction',
+                            'year_fraction_array'),
+}
+_modules = {name: module for module, names in _exports.items() for name in names}
+
+__all__ = list(_modules)
+
+
+def __getattr__(name):
+    module = _modules.get(name)
+    if module is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,172 @@
+from datetime import date
+from typing import Iterable, List, Sequence
+
+try:
+    _popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+    def _popcount(bits):
+        return bin(bits).count('1')
+
+
+class BusinessDayBitmap:
+    """
+    Business days over a range of years stored as one bit per day, set for business days.
+
+    Bits are held in a Python int with bit i for the i-th day from January 1st of the first year, about 46 bytes per
+    year. Counting business days is a popcount over a slice of bits and calendars are combined with bitwise operators:
+    `a & b` has the business days of both calendars (a union of their holidays) and `a | b` the business days of
+    either. Bitmaps over different years are combined over the years they have in common.
+    """
+
+    def __init__(self, start_year: int, end_year: int, bits: int, weekmask: Sequence[bool]):
+        """
+        Args:
+            start_year: First year covered
+            end_year: Last year covered
+            bits: Business-day bits, bit i for the i-th day from January 1st of start_year
+            weekmask: Business days of the week, Monday through Sunday
+        """
+        if end_year < start_year:
+            raise ValueError('Bitmap end year must not be before its start year')
+        self.start_year = start_year
+        self.end_year = end_year
+        self.origin = date(start_year, 1, 1).toordinal()
+        self.days = date(end_year, 12, 31).toordinal() - self.origin + 1
+        self.bits = bits & ((1 << self.days) - 1)
+        self.weekmask = tuple(bool(d) for d in weekmask)
+
+    @classmethod
+    def from_dates(cls, start_year: int, end_year: int, holidays: Iterable[date],
+                   weekmask: Sequence[bool] = (True, True, True, True, True, False, False)) -> 'BusinessDayBitmap':
+        """Builds a bitmap from a weekmask and a list of holidays, such as `AbstractCalendar.holidays` output.
+
+        Args:
+            start_year: First year covered
+            end_year: Last year covered
+            holidays: Non-business dates, dates outside the years are ignored
+            weekmask: Business days of the week, Monday through Sunday, defaults to Monday through Friday
+
+        Returns:
+            BusinessDayBitmap: Bitmap of the business days
+        """
+        origin = date(start_year, 1, 1).toordinal()
+        days = date(end_year, 12, 31).toordinal() - origin + 1
+        # repeat the 7-day pattern starting on the weekday of January 1st, date.fromordinal(1) is a Monday
+        first_weekday = (origin - 1) % 7
+        week = sum(1 << i for i in range(7) if weekmask[(first_weekday + i) % 7])
+        weeks = days // 7 + 1
+        bits = week * (((1 << (7 * weeks)) - 1) // 127)
+
+        holiday_bits = 0
+        for dt in holidays:
+            i = dt.toordinal() - origin
+            if 0 <= i < days:
+                holiday_bits |= 1 << i
+        return cls(start_year, end_year, bits & ~holiday_bits, weekmask)
+
+    def holidays(self) -> List[date]:
+        """Returns the non-business days that fall on weekmask business days, i.e. the holidays that matter."""
+        week_bits = BusinessDayBitmap.from_dates(self.start_year, self.end_year, [], self.weekmask).bits
+        return self._dates(week_bits & ~self.bits)
+
+    def business_days(self) -> List[date]:
+        """Returns the business days."""
+        return self._dates(self.bits)
+
+    def is_business_day(self, dt) -> bool:
+        """Returns True if dt is a business day, dt must be in the bitmap's years."""
+        return bool((self.bits >> self._offset(dt.toordinal())) & 1)
+
+    def count(self, start_date, end_date) -> int:
+        """Counts the business days from start_date, inclusive, to end_date, exclusive.
+
+        Dates must be in the bitmap's years (end_date may be the day after the last year). The count is negative if
+        end_date is before start_date, like `AbstractCalendar.business_days_between`.
+        """
+        start, end = start_date.toordinal(), end_date.toordinal()
+        if end < start:
+            return -self.count(date.fromordinal(end + 1), date.fromordinal(start + 1))
+        lo, hi = self._offset(start), self._offset(end, end=True)
+        return _popcount((self.bits >> lo) & ((1 << (hi - lo)) - 1))
+
+    @property
+    def nbytes(self) -> int:
+        """Number of bytes of bit data."""
+        return (self.days + 7) // 8
+
+    def to_bytes(self) -> bytes:
+        """Returns the bits as little-endian bytes, bit i of the bitmap is bit i % 8 of byte i // 8."""
+        return self.bits.to_bytes(self.nbytes, 'little')
+
+    @classmethod
+    def from_bytes(cls, start_year: int, end_year: int, data: bytes, weekmask: Sequence[bool]) -> 'BusinessDayBitmap':
+        """Builds a bitmap from the output of `to_bytes`."""
+        return cls(start_year, end_year, int.from_bytes(data, 'little'), weekmask)
+
+    def replace_years(self, other: 'BusinessDayBitmap') -> 'BusinessDayBitmap':
+        """Returns a copy of the bitmap with the days of other's years taken from other.
+
+        Args:
+            other: Bitmap over years within this bitmap's years
+
+        Returns:
+            BusinessDayBitmap: Updated bitmap
+        """
+        if other.start_year < self.start_year or other.end_year > self.end_year:
+            raise ValueError('Replacement years must be within the bitmap years')
+        offset = other.origin - self.origin
+        mask = ((1 << other.days) - 1) << offset
+        return BusinessDayBitmap(self.start_year, self.end_year, (self.bits & ~mask) | (other.bits << offset),
+                                 self.weekmask)
+
+    def __and__(self, other):
+        if not isinstance(other, BusinessDayBitmap):
+            return NotImplemented
+        return self._combine(other, lambda a, b: a & b, lambda a, b: a and b)
+
+    def __or__(self, other):
+        if not isinstance(other, BusinessDayBitmap):
+            return NotImplemented
+        return self._combine(other, lambda a, b: a | b, lambda a, b: a or b)
+
+    def __eq__(self, other):
+        if not isinstance(other, BusinessDayBitmap):
+            return NotImplemented
+        return (self.start_year, self.end_year, self.bits, self.weekmask) == \
+               (other.start_year, other.end_year, other.bits, other.weekmask)
+
+    def __hash__(self):
+        return hash((self.start_year, self.end_year, self.bits, self.weekmask))
+
+    def __repr__(self):
+        return f'BusinessDayBitmap({self.start_year}-{self.end_year}, {self.nbytes} bytes)'
+
+    def _combine(self, other, op, weekday_op):
+        start_year, end_year = max(self.start_year, other.start_year), min(self.end_year, other.end_year)
+        if end_year < start_year:
+            raise ValueError('Bitmaps do not have any years in common')
+        weekmask = [weekday_op(a, b) for a, b in zip(self.weekmask, other.weekmask)]
+        return BusinessDayBitmap(start_year, end_year, op(self._years(start_year), other._years(start_year)),
+                                 weekmask)
+
+    def _years(self, start_year):
+        """Returns the bits from January 1st of start_year on."""
+        return self.bits >> (date(start_year, 1, 1).toordinal() - self.origin)
+
+    def _offset(self, ordinal, end=False):
+        offset = ordinal - self.origin
+        if not 0 <= offset < self.days + end:
+            raise ValueError(f'{date.fromordinal(ordinal)} is outside of the bitmap years '
+                             f'{self.start_year}-{self.end_year}')
+        return offset
+
+    def _dates(self, bits):
+        origin = self.origin
+        dates = []
+        # walk the set bits a byte at a time
+        for i, byte in enumerate(bits.to_bytes(self.nbytes, 'little')):
+            while byte:
+                low = byte & -byte
+                dates.append(date.fromordinal(origin + i * 8 + low.bit_length() - 1))
+                byte ^= low
+        return dates
@@ -1,6 +1,254 @@
-from typing import List, Optional
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from heapq import merge
+from itertools import accumulate, chain, repeat
+from operator import attrgetter, itemgetter
+from datetime import date, timedelta
+from threading import Lock, RLock
+from weakref import WeakSet
+from time import perf_counter
+from typing import Callable, List, Optional, Sequence, Tuple, Union
 
-from holidaycal.holiday import AbstractHoliday, LondonBankHolidays, NYBankHolidays
+from holidaycal.bitmap import BusinessDayBitmap
+from holidaycal.instrumentation import CalendarStats, RuleCall
+from holidaycal.holiday import AbstractHoliday, LondonBankHolidays, NYBankHolidays, _BuiltIn
+
+
+class _HolidayIndex:
+    """Sorted (date ordinal, rule) entries covering every holiday dated in a contiguous range of years.
+
+    An index is never modified after it is built. Extending the range creates a new index, so a reference to an
+    index always gives a consistent view. A calendar keeps one index per queried range of years (see `_Segments`).
+    """
+
+    def __init__(self, start_year: int, end_year: int, ordinals: Sequence[int], rules: List[AbstractHoliday]):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.ordinals = ordinals
+        self.rules = rules
+
+    def covers(self, start_year: int, end_year: int) -> bool:
+        return self.start_year <= start_year and end_year <= self.end_year
+
+    def bounds(self, start: int, end: int):
+        """Returns the slice bounds of the entries between the ordinals start and end, inclusive."""
+        return bisect_left(self.ordinals, start), bisect_right(self.ordinals, end)
+
+
+class _BusinessDays:
+    """Cumulative business-day counts for a contiguous range of years, stored as one block per year.
+
+    A calendar keeps one instance per queried range of years (see `_Segments`), and reuses the blocks of the years it
+    has already counted when ranges are merged.
+
+    `blocks[j][i]` is the number of business days in block j before its i-th day, so each block has one more entry
+    than it has days. Like `_HolidayIndex`, instances are never modified after they are built.
+    """
+
+    def __init__(self, start_year: int, end_year: int, starts: List[int], blocks: List[Sequence[int]]):
+        self.start_year = start_year
+        self.end_year = end_year
+        self.starts = starts
+        self.blocks = blocks
+        prefix = [0]
+        for block in blocks:
+            prefix.append(prefix[-1] + block[-1])
+        self.prefix = prefix
+        self.total = prefix[-1]
+
+    def covers(self, start_year: int, end_year: int) -> bool:
+        return self.start_year <= start_year and end_year <= self.end_year
+
+    def count_before(self, ordinal: int) -> int:
+        """Returns the number of business days in the range before ordinal (ordinal may be one past the end)."""
+        j = bisect_right(self.starts, ordinal) - 1
+        return self.prefix[j] + self.blocks[j][ordinal - self.starts[j]]
+
+    def nth(self, k: int) -> int:
+        """Returns the ordinal of the k-th (0-based) business day in the range."""
+        j = bisect_right(self.prefix, k) - 1
+        return self.starts[j] + bisect_right(self.blocks[j], k - self.prefix[j]) - 1
+
+
+def _roll_ordinal(step, ordinal: int, convention: str) -> int:
+    """Adjusts a date ordinal to a business day under a roll convention.
+
+    step(ordinal, n) returns the n-th business day counted from the first business day on or after ordinal, so
+    calendars and snapshots share the conventions over their own business-day counts.
+    """
+    if convention == 'following':
+        return step(ordinal, 0)
+    if convention == 'preceding':
+        return step(ordinal + 1, -1)
+    if convention == 'modified_following':
+        rolled = step(ordinal, 0)
+        if date.fromordinal(rolled).month != date.fromordinal(ordinal).month:
+            rolled = step(ordinal + 1, -1)
+        return rolled
+    if convention == 'modified_preceding':
+        rolled = step(ordinal + 1, -1)
+        if date.fromordinal(rolled).month != date.fromordinal(ordinal).month:
+            rolled = step(ordinal, 0)
+        return rolled
+    raise ValueError(f'Unknown roll convention {convention!r}, expected one of {ROLL_CONVENTIONS}')
+
+
+class _Segments:
+    """Disjoint segments of years in ascending order, each a `_HolidayIndex` or `_BusinessDays`.
+
+    Calendars keep their holiday indexes and business-day counts as segments, so a query only builds the years it
+    needs and a far-away query does not build the years in between. Segments are merged when a query spans or adjoins
+    several of them. Like the segments, instances are never modified after they are built.
+    """
+
+    def __init__(self, segments: Sequence = ()):
+        self.segments = list(segments)
+        self.starts = [segment.start_year for segment in self.segments]
+
+    def find(self, start_year: int, end_year: int):
+        """Returns the segment covering start_year through end_year, or None."""
+        j = bisect_right(self.starts, start_year) - 1
+        if j >= 0:
+            # the segment starts at or before start_year
+            segment = self.segments[j]
+            if end_year <= segment.end_year:
+                return segment
+        return None
+
+    def touching(self, start_year: int, end_year: int) -> list:
+        """Returns the segments that overlap or adjoin start_year through end_year, in ascending order."""
+        return [s for s in self.segments if s.start_year <= end_year + 1 and s.end_year >= start_year - 1]
+
+    def replace(self, segment) -> '_Segments':
+        """Returns new segments with segment in place of the segments it overlaps."""
+        kept = [s for s in self.segments if s.end_year < segment.start_year or s.start_year > segment.end_year]
+        return _Segments(sorted(kept + [segment], key=attrgetter('start_year')))
+
+
+_NO_SEGMENTS = _Segments()
+
+# number of rules below which the rule interval tree stops splitting and scans them
+_RULE_LEAF_SIZE = 16
+
+
+class _RuleIntervals:
+    """Centered interval tree over the years in which each rule of a calendar can have holidays.
+
+    Rules are found by the years they can have actual or observed holidays in, from their `bounds`, so queries only
+    evaluate the rules that are active in the queried years. Like `_HolidayIndex`, instances are never modified after
+    they are built.
+    """
+
+    def __init__(self, rules: Sequence[AbstractHoliday]):
+        self.rules = rules
+        self.size = len(rules)
+        intervals = []
+        for position, rule in enumerate(rules):
+            first, last = _rule_years(rule)
+            # rules without any dates (e.g. an empty ListHoliday) are never active
+            if first <= last:
+                intervals.append((first, last, position))
+        self._root = self._build(intervals)
+
+    @classmethod
+    def _build(cls, intervals):
+        """Returns a tree node (center, by start, by end descending, left node, right node), None if there are no
+        intervals, or a leaf (None, intervals) that is scanned in full if there are only a few."""
+        if len(intervals) <= _RULE_LEAF_SIZE:
+            return (None, intervals) if intervals else None
+        endpoints = [i[0] for i in intervals] + [i[1] for i in intervals]
+        endpoints.sort()
+        center = endpoints[len(endpoints) // 2]
+        left, right, here = [], [], []
+        for i in intervals:
+            (left if i[1] < center else right if i[0] > center else here).append(i)
+        here.sort()
+        return center, here, sorted(here, key=itemgetter(1), reverse=True), cls._build(left), cls._build(right)
+
+    def overlapping(self, start_year: int, end_year: int) -> List[int]:
+        """Returns the positions, in ascending order, of the rules that can have holidays in start_year to end_year."""
+        positions = []
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+            center = node[0]
+            if center is None:
+                positions.extend(i[2] for i in node[1] if i[0] <= end_year and i[1] >= start_year)
+                continue
+            _, by_start, by_end, left, right = node
+            if end_year < center:
+                # every interval of the node ends at or after center, so it overlaps if it starts by end_year
+                for first, _, position in by_start:
+                    if first > end_year:
+                        break
+                    positions.append(position)
+                nodes.append(left)
+            elif start_year > center:
+                for _, last, position in by_end:
+                    if last < start_year:
+                        break
+                    positions.append(position)
+                nodes.append(right)
+            else:
+                positions.extend(i[2] for i in by_start)
+                nodes.append(left)
+                nodes.append(right)
+        positions.sort()
+        return positions
+
+
+ROLL_CONVENTIONS = ('following', 'preceding', 'modified_following', 'modified_preceding')
+
+# number of years of a rule's dates computed at a time when streaming holidays
+_STREAM_YEARS = 10
+
+# number of years in each window of the date to holiday name index
+_NAME_WINDOW_YEARS = 16
+
+# date ordinal of numpy's datetime64 epoch, 1970-01-01, to convert between date ordinals and datetime64[D] days
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def _numpy():
+    """Imports numpy, which is only needed by the array methods."""
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError('numpy is required for array methods, install it with `pip install numpy`') from None
+    return numpy
+
+
+def _flat_counts(bdays):
+    """Returns the cumulative counts of a `_BusinessDays` as a single numpy array, cached on the object."""
+    counts = getattr(bdays, '_flat', None)
+    if counts is None:
+        np = _numpy()
+        counts = np.concatenate([np.asarray(block[:-1], dtype=np.int64) + prefix
+                                 for block, prefix in zip(bdays.blocks, bdays.prefix)] + [np.array([bdays.total])])
+        bdays._flat = counts
+    return counts
+
+
+def _rule_years(rule):
+    """Returns the first and last years that a rule's actual or observed dates can fall in."""
+    first, last = rule.bounds()
+    return date.min.year if first is None else first.year, date.max.year if last is None else last.year
+
+
+def _parse_weekmask(weekmask):
+    if isinstance(weekmask, str):
+        if len(weekmask) != 7 or set(weekmask) - {'0', '1'}:
+            raise ValueError(f'Invalid weekmask string {weekmask!r}, expected seven 0/1 characters')
+        weekmask = [c == '1' for c in weekmask]
+    weekmask = tuple(bool(d) for d in weekmask)
+    if len(weekmask) != 7:
+        raise ValueError('Weekmask must have seven entries, Monday through Sunday')
+    if not any(weekmask):
+        raise ValueError('Weekmask must have at least one business day')
+    return weekmask
 
 
 class AbstractCalendar:
@@ -9,9 +257,14 @@ class AbstractCalendar:
     """
 
     rules: List[AbstractHoliday] = []
+    weekmask = (True, True, True, True, True, False, False)
+    bitmap_years = (1970, 2079)
+    # number of rule changes kept for `changes_since`, older changes are collapsed into one change of every year
+    change_log_size = 256
 
     def __init__(self, name: Optional[str] = None,
-                 rules: Optional[List[AbstractHoliday]] = None):
+                 rules: Optional[List[AbstractHoliday]] = None,
+                 weekmask: Union[str, Sequence[bool], None] = None):
         """Base calendar object.
 
         Initializes a calendar with holidays. Normally the class defines the list of holiday rules.
@@ -19,6 +272,8 @@ class AbstractCalendar:
         Args:
             name: Name of the calendar, defaults to class name
             rules: Holiday or list of Holiday objects
+            weekmask: Business days of the week, Monday through Sunday, as seven booleans or a string such as
+                '1111100' (the `numpy` convention). Defaults to the class `weekmask`, Monday through Friday
         """
         super().__init__()
         if name is None:
@@ -26,31 +281,854 @@ class AbstractCalendar:
         self.name = name
         if rules is not None:
             self.rules = rules
+        self.weekmask = _parse_weekmask(self.weekmask if weekmask is None else weekmask)
+        # observed flag to _Segments of holiday indexes, and _Segments of business-day counts
+        self._indexes = {}
+        self._business_days = _NO_SEGMENTS
+        self._bitmaps = {}
+        self._name_windows = {}
+        self._rule_intervals = _RuleIntervals(self.rules)
+        self._stats = None
+        # (rule, RuleStats) of the rules instrumented by this calendar
+        self._instrumented = []
+        self.version = 0
+        self._changes = []
+        # changes_since a version before this one returns every year
+        self._changes_floor = 0
+        self._dependents = WeakSet()
+        # guards building and extending the indexes, which readers use without locking
+        self._lock = RLock()
+
+    def __getstate__(self):
+        # the lock, the dependents and instrumentation are per process and the derived indexes are rebuilt on first
+        # use, so pickles leave them out
+        state = self.__dict__.copy()
+        del state['_lock'], state['_dependents']
+        state.update(_indexes={}, _business_days=_NO_SEGMENTS, _bitmaps={}, _name_windows={}, _stats=None,
+                     _instrumented=[])
+        return state
 
-    def holidays(self, start_date, end_date, names=False, observed=False):
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._dependents = WeakSet()
+        self._lock = RLock()
+
+    def holidays(self, start_date, end_date, names=False, observed=False, as_ordinals=False):
         """Returns the holidays between start_date and end_date.
 
         Returns the holidays between start_date and end_date, inclusive, optionally with holiday names.
-        If observed is True, adjusts holidays to observed weekday dates.
+        If observed is True, adjusts holidays to observed weekday dates. Holidays are read from the calendar's
+        holiday index, which is built lazily for the years requested.
+
         Args:
             start_date (datetime-like): Starting date
             end_date (datetime-like): Ending date
             names (bool): If True, return
             observed (bool): Observed holidays, default True
+            as_ordinals (bool): If True, return date ordinals instead of dates
+
+        Returns:
+            list: List of dates or (date, holiday name), an `array('i')` of date ordinals or (date ordinal, holiday
+            name) if as_ordinals is True
+        """
+        ordinals, rules = self._index_slice(start_date, end_date, observed)
+
+        if names is False:
+            return ordinals if as_ordinals else list(map(date.fromordinal, ordinals))
+        if as_ordinals:
+            return [(r.name, o) for o, r in zip(ordinals, rules)]
+        return [(r.name, date.fromordinal(o)) for o, r in zip(ordinals, rules)]
+
+    def holidays_between(self, start_date, end_date, observed=False):
+        """Returns the holidays between start_date and end_date, inclusive, with the rule that generated them.
+
+        Args:
+            start_date (datetime-like): Starting date
+            end_date (datetime-like): Ending date
+            observed (bool): Whether holidays should be adjusted to observed dates, defaults to False
+
+        Returns:
+            list: List of (date, holiday rule), in ascending date order
+        """
+        ordinals, rules = self._index_slice(start_date, end_date, observed)
+        return [(date.fromordinal(o), r) for o, r in zip(ordinals, rules)]
+
+    def iter_holidays(self, start_date, direction='forward', observed=False, names=False):
+        """Lazily iterates over the holidays from start_date, without an end date.
+
+        The holidays of each rule are generated a few years at a time and merged, so memory use does not grow with
+        the number of holidays iterated. Iteration stops when no rule has further dates.
+
+        Args:
+            start_date (datetime-like): Starting date, included
+            direction (str): 'forward' for ascending dates on or after start_date, 'backward' for descending dates on
+                or before start_date
+            observed (bool): Whether holidays should be adjusted to observed dates, defaults to False
+            names (bool): If True, yield (holiday name, date)
+
+        Returns:
+            iterator: Iterator of dates or (holiday name, date)
+        """
+        self._check_rules()
+        if direction not in ('forward', 'backward'):
+            raise ValueError(f"Unknown direction {direction!r}, expected 'forward' or 'backward'")
+        entries = self._entry_stream(start_date, direction == 'forward', observed)
+
+        if names is False:
+            return (date.fromordinal(o) for o, _ in entries)
+        return ((rule.name, date.fromordinal(o)) for o, rule in entries)
+
+    def is_holiday(self, dt, observed=False):
+        """Returns True if dt is a holiday.
+
+        Args:
+            dt (datetime-like): Date to check
+            observed (bool): Whether to check observed holiday dates, defaults to False
+        """
+        index = self._holiday_index(dt.year, dt.year, observed)
+        ordinal = dt.toordinal()
+        i = bisect_left(index.ordinals, ordinal)
+        return i < len(index.ordinals) and index.ordinals[i] == ordinal
+
+    def next_holiday(self, dt, observed=False):
+        """Returns the first holiday after dt, or None if there are no later holidays.
+
+        Args:
+            dt (datetime-like): Reference date, not included in the search
+            observed (bool): Whether to search observed holiday dates, defaults to False
+        """
+        ordinal = dt.toordinal()
+        span = 1
+        end_year = dt.year
+        while True:
+            index = self._holiday_index(dt.year, end_year, observed)
+            i = bisect_right(index.ordinals, ordinal)
+            if i < len(index.ordinals):
+                return date.fromordinal(index.ordinals[i])
+            if end_year >= date.max.year:
+                return None
+            end_year = min(end_year + span, date.max.year)
+            span *= 2
+
+    def previous_holiday(self, dt, observed=False):
+        """Returns the last holiday before dt, or None if there are no earlier holidays.
+
+        Args:
+            dt (datetime-like): Reference date, not included in the search
+            observed (bool): Whether to search observed holiday dates, defaults to False
+        """
+        ordinal = dt.toordinal()
+        span = 1
+        start_year = dt.year
+        while True:
+            index = self._holiday_index(start_year, dt.year, observed)
+            i = bisect_left(index.ordinals, ordinal)
+            if i > 0:
+                return date.fromordinal(index.ordinals[i - 1])
+            if start_year <= date.min.year:
+                return None
+            start_year = max(start_year - span, date.min.year)
+            span *= 2
+
+    def holiday_name(self, dt, observed=False) -> Optional[str]:
+        """Returns the name of the holiday on dt, or None if dt is not a holiday.
+
+        Names of several holidays on the same date are joined with ' / '. Lookups use a dictionary index of the
+        holidays, built once for each window of years.
+
+        Args:
+            dt (datetime-like): Date to check
+            observed (bool): Whether to check observed holiday dates, defaults to False
+        """
+        entry = self._name_window(dt.year, observed).get(dt.toordinal())
+        return None if entry is None else entry[0]
+
+    def holiday_names_for(self, dates, observed=False) -> List[Optional[str]]:
+        """Returns the holiday name of each date, None for dates that are not holidays. See `holiday_name`.
+
+        Args:
+            dates (iterable of datetime-like): Dates to check, in any order
+            observed (bool): Whether to check observed holiday dates, defaults to False
+        """
+        windows = {}
+        names = []
+        for dt in dates:
+            window = windows.get(dt.year)
+            if window is None:
+                window = windows[dt.year] = self._name_window(dt.year, observed)
+            entry = window.get(dt.toordinal())
+            names.append(None if entry is None else entry[0])
+        return names
+
+    def holiday_rules(self, dt, observed=False) -> List[Tuple[date, AbstractHoliday]]:
+        """Returns the actual date and rule of each holiday on dt, e.g. to find the holiday behind an observed date.
+
+        Args:
+            dt (datetime-like): Date to check
+            observed (bool): Whether dt is an observed holiday date, defaults to False
+
+        Returns:
+            list: List of (actual date, holiday rule), empty if dt is not a holiday
+        """
+        entry = self._name_window(dt.year, observed).get(dt.toordinal())
+        return [] if entry is None else list(entry[1])
+
+    def is_business_day(self, dt):
+        """Returns True if dt falls on a weekmask business day and is not an observed holiday.
+
+        Args:
+            dt (datetime-like): Date to check
+        """
+        return self.weekmask[dt.weekday()] and not self.is_holiday(dt, observed=True)
+
+    def roll(self, dt, convention='following'):
+        """Adjusts dt to a business day.
+
+        Business days exclude observed holidays. Conventions are:
+            following: the first business day on or after dt
+            preceding: the last business day on or before dt
+            modified_following: following, unless that is in the next month, then preceding
+            modified_preceding: preceding, unless that is in the previous month, then following
+
+        Args:
+            dt (datetime-like): Date to adjust
+            convention (str): Roll convention, defaults to 'following'
+
+        Returns:
+            date: Adjusted date
+        """
+        return date.fromordinal(self._roll(dt.toordinal(), convention))
+
+    def add_business_days(self, dt, n, roll='following'):
+        """Returns the date n business days after dt (before dt if n is negative).
+
+        If dt is not a business day, it is first adjusted with the roll convention, so adding zero business days
+        rolls dt. This matches `numpy.busday_offset`.
+
+        Args:
+            dt (datetime-like): Starting date
+            n (int): Number of business days
+            roll (str): Roll convention applied to dt, defaults to 'following'
+
+        Returns:
+            date: Offset date
+        """
+        return date.fromordinal(self._step(self._roll(dt.toordinal(), roll), n))
+
+    def business_days_between(self, start_date, end_date):
+        """Counts the business days from start_date, inclusive, to end_date, exclusive.
+
+        If end_date is before start_date, the count is negative and covers the dates after end_date up to and
+        including start_date. This matches `numpy.busday_count`.
+
+        Args:
+            start_date (datetime-like): Starting date
+            end_date (datetime-like): Ending date
+
+        Returns:
+            int: Number of business days
+        """
+        start, end = start_date.toordinal(), end_date.toordinal()
+        if end < start:
+            return -self.business_days_between(end_date + timedelta(days=1), start_date + timedelta(days=1))
+        bdays = self._business_day_index(start_date.year, end_date.year)
+        return bdays.count_before(end) - bdays.count_before(start)
+
+    def business_day_bitmap(self, start_year: Optional[int] = None, end_year: Optional[int] = None):
+        """Returns the business days from start_year through end_year as a bitmap, one bit per day.
+
+        Bitmaps are cached per range of years. Combine the bitmaps of several calendars with `&` (business day in
+        all of them) or `|` (business day in any of them).
+
+        Args:
+            start_year (int, optional): First year, defaults to the first of the class `bitmap_years`
+            end_year (int, optional): Last year, defaults to the last of the class `bitmap_years`
+
+        Returns:
+            BusinessDayBitmap: Business-day bitmap
+        """
+        if start_year is None:
+            start_year = self.bitmap_years[0]
+        if end_year is None:
+            end_year = self.bitmap_years[1]
+        bitmap = self._bitmaps.get((start_year, end_year))
+        if bitmap is None:
+            with self._lock:
+                bitmap = self._bitmaps.get((start_year, end_year))
+                if bitmap is None:
+                    holidays = self.holidays(date(start_year, 1, 1), date(end_year, 12, 31), observed=True)
+                    bitmap = BusinessDayBitmap.from_dates(start_year, end_year, holidays, self.weekmask)
+                    self._bitmaps[(start_year, end_year)] = bitmap
+        return bitmap
+
+    def holidays_array(self, start_date, end_date, observed=False):
+        """Returns the holidays between start_date and end_date, inclusive, as a numpy `datetime64[D]` array.
+
+        Requires numpy.
+
+        Args:
+            start_date (datetime-like): Starting date
+            end_date (datetime-like): Ending date
+            observed (bool): Whether holidays should be adjusted to observed dates, defaults to False
 
         Returns:
-            list: List of dates or (date, holiday name)
+            numpy.ndarray: Sorted holiday dates
         """
+        np = _numpy()
+        ordinals, _ = self._index_slice(start_date, end_date, observed)
+        return (np.array(ordinals, dtype=np.int64) - EPOCH_ORDINAL).astype('datetime64[D]')
+
+    def busdaycalendar(self, start_date, end_date):
+        """Exports the calendar as a `numpy.busdaycalendar` with the observed holidays between start_date and end_date.
+
+        Requires numpy.
+
+        Args:
+            start_date (datetime-like): Starting date of the holidays included
+            end_date (datetime-like): Ending date of the holidays included
+
+        Returns:
+            numpy.busdaycalendar: Business-day calendar with the calendar's weekmask
+        """
+        np = _numpy()
+        return np.busdaycalendar(weekmask=list(self.weekmask),
+                                 holidays=self.holidays_array(start_date, end_date, observed=True))
+
+    def is_holiday_array(self, dates, observed=False):
+        """Vectorized `is_holiday` for an array of dates. Requires numpy.
+
+        Args:
+            dates (array-like): Dates, converted to `datetime64[D]`
+            observed (bool): Whether to check observed holiday dates, defaults to False
+
+        Returns:
+            numpy.ndarray: Boolean array
+        """
+        np = _numpy()
+        ordinals = self._array_ordinals(dates)
+        if ordinals.size == 0:
+            return np.zeros(ordinals.shape, dtype=bool)
+        start_year, end_year = self._array_years(ordinals)
+        index = self._holiday_index(start_year, end_year, observed)
+        return np.isin(ordinals, np.array(index.ordinals, dtype=np.int64))
+
+    def is_business_day_array(self, dates):
+        """Vectorized `is_business_day` for an array of dates. Requires numpy.
+
+        Args:
+            dates (array-like): Dates, converted to `datetime64[D]`
+
+        Returns:
+            numpy.ndarray: Boolean array
+        """
+        np = _numpy()
+        ordinals = self._array_ordinals(dates)
+        if ordinals.size == 0:
+            return np.zeros(ordinals.shape, dtype=bool)
+        bdays = self._business_day_index(*self._array_years(ordinals))
+        counts = _flat_counts(bdays)
+        i = ordinals - bdays.starts[0]
+        return counts[i + 1] > counts[i]
+
+    def roll_array(self, dates, convention='following'):
+        """Vectorized `roll` for an array of dates. Requires numpy.
+
+        Args:
+            dates (array-like): Dates, converted to `datetime64[D]`
+            convention (str): Roll convention, defaults to 'following'
+
+        Returns:
+            numpy.ndarray: Adjusted dates as `datetime64[D]`
+        """
+        ordinals = self._array_ordinals(dates)
+        return self._ordinals_to_array(self._roll_ordinals(ordinals, convention))
+
+    def add_business_days_array(self, dates, n, roll='following'):
+        """Vectorized `add_business_days` for an array of dates. Requires numpy.
+
+        Args:
+            dates (array-like): Dates, converted to `datetime64[D]`
+            n (int or array-like): Number of business days, broadcast against dates
+            roll (str): Roll convention applied to dates, defaults to 'following'
+
+        Returns:
+            numpy.ndarray: Offset dates as `datetime64[D]`
+        """
+        np = _numpy()
+        ordinals = self._roll_ordinals(self._array_ordinals(dates), roll)
+        ordinals, n = np.broadcast_arrays(ordinals, np.asarray(n, dtype=np.int64))
+        return self._ordinals_to_array(self._step_ordinals(ordinals, n))
+
+    def business_days_between_array(self, start_dates, end_dates):
+        """Vectorized `business_days_between` for arrays of dates. Requires numpy.
+
+        Args:
+            start_dates (array-like): Starting dates, converted to `datetime64[D]`
+            end_dates (array-like): Ending dates, converted to `datetime64[D]`
+
+        Returns:
+            numpy.ndarray: Number of business days
+        """
+        np = _numpy()
+        start, end = np.broadcast_arrays(self._array_ordinals(start_dates), self._array_ordinals(end_dates))
+        if start.size == 0:
+            return np.zeros(start.shape, dtype=np.int64)
+        # negative spans count the dates after end up to and including start, like numpy.busday_count
+        reverse = end < start
+        lo, hi = np.where(reverse, end + 1, start), np.where(reverse, start + 1, end)
+        bounds = np.array([min(start.min(), end.min()), max(start.max(), end.max()) + 1])
+        bdays = self._business_day_index(*self._array_years(bounds))
+        counts = _flat_counts(bdays)
+        origin = bdays.starts[0]
+        count = counts[hi - origin] - counts[lo - origin]
+        return np.where(reverse, -count, count)
+
+    @staticmethod
+    def _array_ordinals(dates):
+        np = _numpy()
+        return np.asarray(dates, dtype='datetime64[D]').astype(np.int64) + EPOCH_ORDINAL
+
+    @staticmethod
+    def _ordinals_to_array(ordinals):
+        return (ordinals - EPOCH_ORDINAL).astype('datetime64[D]')
+
+    @staticmethod
+    def _array_years(ordinals):
+        return date.fromordinal(int(ordinals.min())).year, date.fromordinal(int(ordinals.max())).year
+
+    def _roll_ordinals(self, ordinals, convention):
+        np = _numpy()
+        if ordinals.size == 0:
+            return ordinals
+        if convention == 'following':
+            return self._step_ordinals(ordinals, np.zeros_like(ordinals))
+        if convention == 'preceding':
+            return self._step_ordinals(ordinals + 1, -np.ones_like(ordinals))
+        if convention in ('modified_following', 'modified_preceding'):
+            following = self._step_ordinals(ordinals, np.zeros_like(ordinals))
+            preceding = self._step_ordinals(ordinals + 1, -np.ones_like(ordinals))
+            months = self._ordinals_to_array(ordinals).astype('datetime64[M]')
+            if convention == 'modified_following':
+                keep = self._ordinals_to_array(following).astype('datetime64[M]') == months
+                return np.where(keep, following, preceding)
+            keep = self._ordinals_to_array(preceding).astype('datetime64[M]') == months
+            return np.where(keep, preceding, following)
+        raise ValueError(f'Unknown roll convention {convention!r}, expected one of {ROLL_CONVENTIONS}')
+
+    def _step_ordinals(self, ordinals, n):
+        """Vectorized `_step`, extending the business-day counts until every result is covered."""
+        np = _numpy()
+        if ordinals.size == 0:
+            return ordinals
+        bdays = self._business_day_index(*self._array_years(ordinals))
+        per_year = 52 * sum(self.weekmask)
+        while True:
+            counts = _flat_counts(bdays)
+            k = counts[ordinals - bdays.starts[0]] + n
+            low, high = int(k.min()), int(k.max())
+            if low < 0:
+                if bdays.start_year == date.min.year:
+                    raise OverflowError('date value out of range')
+                start_year = max(bdays.start_year - (-low // per_year + 1), date.min.year)
+                bdays = self._business_day_index(start_year, bdays.end_year)
+            elif high >= bdays.total:
+                if bdays.end_year == date.max.year:
+                    raise OverflowError('date value out of range')
+                end_year = min(bdays.end_year + ((high - bdays.total) // per_year + 1), date.max.year)
+                bdays = self._business_day_index(bdays.start_year, end_year)
+            else:
+                return bdays.starts[0] + np.searchsorted(counts, k, side='right') - 1
+
+    def _roll(self, ordinal, convention):
+        return _roll_ordinal(self._step, ordinal, convention)
+
+    def _step(self, ordinal, n):
+        """Returns the n-th business day counted from the first business day on or after ordinal."""
+        year = date.fromordinal(ordinal).year
+        bdays = self._business_day_index(year, year)
+        per_year = 52 * sum(self.weekmask)
+        while True:
+            k = bdays.count_before(ordinal) + n
+            if 0 <= k < bdays.total:
+                return bdays.nth(k)
+            if k < 0:
+                if bdays.start_year == date.min.year:
+                    raise OverflowError('date value out of range')
+                start_year = max(bdays.start_year - (-k // per_year + 1), date.min.year)
+                bdays = self._business_day_index(start_year, bdays.end_year)
+            else:
+                if bdays.end_year == date.max.year:
+                    raise OverflowError('date value out of range')
+                end_year = min(bdays.end_year + ((k - bdays.total) // per_year + 1), date.max.year)
+                bdays = self._business_day_index(bdays.start_year, end_year)
+
+    def _business_day_index(self, start_year, end_year):
+        """Returns cumulative business-day counts covering start_year through end_year, building them if needed."""
+        bdays = self._business_days.find(start_year, end_year)
+        if bdays is not None:
+            return bdays
+        with self._lock:
+            return self._extend_business_days(start_year, end_year)
+
+    def _extend_business_days(self, start_year, end_year):
+        """Builds the business-day counts for start_year through end_year, with the lock held.
+
+        The counts of the years already built are reused and merged with those of the new years into one segment.
+        """
+        segments = self._business_days
+        bdays = segments.find(start_year, end_year)
+        if bdays is not None:
+            return bdays
+
+        merged = segments.touching(start_year, end_year)
+        start_year = min([start_year] + [b.start_year for b in merged])
+        end_year = max([end_year] + [b.end_year for b in merged])
+        starts, blocks = [], []
+        year = start_year
+        for bdays in merged + [None]:
+            gap_end = end_year if bdays is None else bdays.start_year - 1
+            if year <= gap_end:
+                index = self._holiday_index(year, gap_end, True)
+                for y in range(year, gap_end + 1):
+                    first = date(y, 1, 1).toordinal()
+                    lo, hi = index.bounds(first, date(y, 12, 31).toordinal())
+                    starts.append(first)
+                    blocks.append(self._business_day_block(y, index.ordinals[lo:hi]))
+            if bdays is not None:
+                starts.extend(bdays.starts)
+                blocks.extend(bdays.blocks)
+                year = bdays.end_year + 1
+
+        bdays = _BusinessDays(start_year, end_year, starts, blocks)
+        self._business_days = segments.replace(bdays)
+        return bdays
+
+    def _business_day_block(self, year, holidays):
+        """Computes the cumulative business-day counts for one year, given its observed holiday ordinals."""
+        first = date(year, 1, 1).toordinal()
+        days = date(year, 12, 31).toordinal() - first + 1
+        # the weekmask repeated from the weekday of January 1st, date.fromordinal(1) is a Monday
+        weekday = (first - 1) % 7
+        flags = bytearray((bytes(self.weekmask) * 54)[weekday:weekday + days])
+        for ordinal in holidays:
+            flags[ordinal - first] = 0
+        return array('i', accumulate(chain((0,), flags)))
+
+    def _index_slice(self, start_date, end_date, observed):
+        """Returns the index ordinals and rules between start_date and end_date, inclusive."""
+        if start_date > end_date:
+            self._check_rules()
+            return array('i'), []
+        index = self._holiday_index(start_date.year, end_date.year, observed)
+        lo, hi = index.bounds(start_date.toordinal(), end_date.toordinal())
+        return index.ordinals[lo:hi], index.rules[lo:hi]
+
+    def _check_rules(self):
         if len(self.rules) == 0:
             raise ValueError('Calendar must have holiday rules.')
 
-        holidays = [(r.name, h) for r in self.rules for h in r.dates(start_date, end_date, observed)]
-        holidays.sort(key=lambda h: h[1])
+    def _holiday_index(self, start_year, end_year, observed):
+        """Returns a holiday index covering start_year through end_year, building it if needed."""
+        index = self._indexes.get(observed, _NO_SEGMENTS).find(start_year, end_year)
+        stats = self._stats
+        if index is not None:
+            if stats is not None:
+                stats.record_index(True)
+            return index
+        with self._lock:
+            return self._extend_index(start_year, end_year, observed)
 
-        if names is False:
-            holidays = [h[1] for h in holidays]
+    def _extend_index(self, start_year, end_year, observed):
+        """Builds the holiday index for start_year through end_year, with the calendar lock held.
+
+        The entries of the indexes already built for years in or next to the range are reused and merged with those
+        of the new years into one index, and indexes of other years are kept as they are.
+        """
+        # another thread may have built the index while this one waited for the lock
+        segments = self._indexes.get(observed, _NO_SEGMENTS)
+        index = segments.find(start_year, end_year)
+        if index is not None:
+            return index
+        self._check_rules()
+        stats = self._stats
+        if stats is not None:
+            t0 = perf_counter()
+
+        merged = segments.touching(start_year, end_year)
+        start_year = min([start_year] + [i.start_year for i in merged])
+        end_year = max([end_year] + [i.end_year for i in merged])
+        ordinals, rules = array('i'), []
+        year = start_year
+        for index in merged + [None]:
+            gap_end = end_year if index is None else index.start_year - 1
+            if year <= gap_end:
+                new_ordinals, new_rules = self._index_entries(year, gap_end, observed)
+                ordinals.extend(new_ordinals)
+                rules.extend(new_rules)
+            if index is not None:
+                ordinals.extend(index.ordinals)
+                rules.extend(index.rules)
+                year = index.end_year + 1
+
+        index = _HolidayIndex(start_year, end_year, ordinals, rules)
+        self._indexes[observed] = segments.replace(index)
+        if stats is not None:
+            stats.record_index(False, perf_counter() - t0)
+        return index
+
+    def _rule_position(self, rule):
+        for i, r in enumerate(self.rules):
+            if r is rule or isinstance(rule, str) and r.name == rule:
+                return i
+        raise ValueError(f'{rule!r} is not a rule of the calendar')
+
+    def _change_rules(self, rules, ranges, added=None):
+        """Sets new rules that change the holidays in the (start year, end year) ranges, with the lock held.
+
+        Records a new version and updates the caches. added is the rule appended to the rules, if that is the only
+        change.
+        """
+        self.rules = rules
+        self._rule_intervals = _RuleIntervals(rules)
+        self.version += 1
+        for start_year, end_year in ranges:
+            if start_year <= end_year:
+                self._changes.append((self.version, start_year, end_year))
+                self._invalidate_years(start_year, end_year, added)
+        if len(self._changes) > self.change_log_size:
+            dropped = len(self._changes) - self.change_log_size
+            self._changes_floor = self._changes[dropped - 1][0]
+            del self._changes[:dropped]
+
+    def _notify_dependents(self, ranges):
+        # joint calendars lock their calendars while extending their indexes, so they are notified without the lock
+        for dependent in list(self._dependents):
+            dependent._member_changed(ranges)
+
+    def _invalidate_years(self, start_year, end_year, added=None):
+        """Recomputes the cached holiday index, business days, bitmaps and name index for start_year to end_year.
+
+        If added is the rule appended by the change, its dates are merged into the holiday index instead of
+        recomputing the index entries of every rule.
+        """
+        if len(self.rules) == 0:
+            self._indexes, self._business_days, self._bitmaps, self._name_windows = {}, _NO_SEGMENTS, {}, {}
+            return
+
+        for observed, segments in list(self._indexes.items()):
+            self._indexes[observed] = _Segments([self._invalidated_index(index, start_year, end_year, observed, added)
+                                                 for index in segments.segments])
+
+        self._business_days = _Segments([self._invalidated_business_days(bdays, start_year, end_year)
+                                         for bdays in self._business_days.segments])
+
+        for key, bitmap in list(self._bitmaps.items()):
+            first, last = max(start_year, bitmap.start_year), min(end_year, bitmap.end_year)
+            if first <= last:
+                holidays = self.holidays(date(first, 1, 1), date(last, 12, 31), observed=True)
+                self._bitmaps[key] = bitmap.replace_years(
+                    BusinessDayBitmap.from_dates(first, last, holidays, self.weekmask))
+
+        windows = range(start_year // _NAME_WINDOW_YEARS, end_year // _NAME_WINDOW_YEARS + 1)
+        for key in [key for key in self._name_windows if key[1] in windows]:
+            del self._name_windows[key]
 
-        return holidays
+    def _invalidated_index(self, index, start_year, end_year, observed, added):
+        """Returns index with the entries of start_year through end_year recomputed, see `_invalidate_years`."""
+        first, last = max(start_year, index.start_year), min(end_year, index.end_year)
+        if first > last:
+            return index
+        lo, hi = index.bounds(date(first, 1, 1).toordinal(), date(last, 12, 31).toordinal())
+        if added is None:
+            ordinals, rules = self._index_entries(first, last, observed)
+        else:
+            new = [(o, added) for o in sorted(added._ordinal_dates(date(first, 1, 1), date(last, 12, 31), observed))]
+            # merge is stable and the added rule is last, so it follows other rules on the same date
+            entries = list(merge(zip(index.ordinals[lo:hi], index.rules[lo:hi]), new, key=itemgetter(0)))
+            ordinals, rules = array('i', [e[0] for e in entries]), [e[1] for e in entries]
+        return _HolidayIndex(index.start_year, index.end_year, index.ordinals[:lo] + ordinals + index.ordinals[hi:],
+                             index.rules[:lo] + rules + index.rules[hi:])
+
+    def _invalidated_business_days(self, bdays, start_year, end_year):
+        """Returns bdays with the counts of start_year through end_year recomputed, see `_invalidate_years`."""
+        first, last = max(start_year, bdays.start_year), min(end_year, bdays.end_year)
+        if first > last:
+            return bdays
+        index = self._holiday_index(first, last, True)
+        blocks = list(bdays.blocks)
+        for year in range(first, last + 1):
+            lo, hi = index.bounds(date(year, 1, 1).toordinal(), date(year, 12, 31).toordinal())
+            blocks[year - bdays.start_year] = self._business_day_block(year, index.ordinals[lo:hi])
+        return _BusinessDays(bdays.start_year, bdays.end_year, bdays.starts, blocks)
+
+    def _name_window(self, year, observed):
+        """Returns the name index of the window of years containing year, a dict of ordinal to (name, entries)."""
+        key = (observed, year // _NAME_WINDOW_YEARS)
+        window = self._name_windows.get(key)
+        if window is None:
+            with self._lock:
+                window = self._name_windows.get(key)
+                if window is None:
+                    first = max(key[1] * _NAME_WINDOW_YEARS, date.min.year)
+                    last = min(key[1] * _NAME_WINDOW_YEARS + _NAME_WINDOW_YEARS - 1, date.max.year)
+                    window = self._name_windows[key] = self._build_name_window(first, last, observed)
+        return window
+
+    def _build_name_window(self, first, last, observed):
+        ordinals, rules = self._index_slice(date(first, 1, 1), date(last, 12, 31), observed)
+        indexed = set(zip(ordinals, map(id, rules)))
+        # holidays observed in the window can have an actual date in the year before or after it
+        start, end = date(max(first - 1, date.min.year), 1, 1), date(min(last + 1, date.max.year), 12, 31)
+        entries = {}
+        active = [self.rules[i] for i in self._active_rules(start.year, end.year)]
+        for rule in {id(rule): rule for rule in active}.values():
+            for actual, observed_date in rule.date_pairs(start, end):
+                o = (observed_date if observed else actual).toordinal()
+                if (o, id(rule)) in indexed:
+                    entries.setdefault(o, []).append((actual, rule))
+        return {o: (' / '.join(rule.name for _, rule in e), tuple(e)) for o, e in entries.items()}
+
+    def _active_rules(self, start_year, end_year):
+        """Returns the positions of the rules that can have holidays in start_year through end_year."""
+        intervals = self._rule_intervals
+        # rebuild the interval tree if the rules were reassigned or changed in place
+        if intervals.rules is not self.rules or intervals.size != len(self.rules):
+            intervals = self._rule_intervals = _RuleIntervals(self.rules)
+        return intervals.overlapping(start_year, end_year)
+
+    def _index_entries(self, start_year, end_year, observed):
+        """Computes the sorted index entries for the holidays dated in start_year through end_year."""
+        start_date, end_date = date(start_year, 1, 1), date(end_year, 12, 31)
+        rules = self.rules
+        # ties are ordered by rule position, matching the order of `rules`
+        streams = [[(o, i) for o in sorted(rules[i]._ordinal_dates(start_date, end_date, observed))]
+                   for i in self._active_rules(start_year, end_year)]
+        entries = list(merge(*streams))
+        return array('i', [e[0] for e in entries]), [self.rules[e[1]] for e in entries]
+
+    def _entry_stream(self, start_date, forward, observed):
+        """Lazily generates (ordinal, rule) entries from start_date by merging the streams of each rule."""
+        rules = list(self.rules)
+        streams = [self._rule_stream(i, rule, start_date, forward, observed) for i, rule in enumerate(rules)]
+        return ((o, rules[i]) for o, i in merge(*streams, reverse=not forward))
+
+    def _rule_stream(self, position, rule, start_date, forward, observed):
+        """Lazily generates (ordinal, position) entries for a rule from start_date, inclusive, in either direction."""
+        first, last = rule.bounds()
+        if forward:
+            start = start_date.toordinal()
+            end_year = date.max.year if last is None else last.year
+            year = start_date.year if first is None else max(start_date.year, first.year)
+            while year <= end_year:
+                chunk_end = min(year + _STREAM_YEARS - 1, end_year)
+                ordinals = rule._ordinal_dates(date(year, 1, 1), date(chunk_end, 12, 31), observed)
+                for ordinal in sorted(ordinals):
+                    if ordinal >= start:
+                        yield ordinal, position
+                year = chunk_end + 1
+        else:
+            start = start_date.toordinal()
+            start_year = date.min.year if first is None else first.year
+            year = start_date.year if last is None else min(start_date.year, last.year)
+            while year >= start_year:
+                chunk_start = max(year - _STREAM_YEARS + 1, start_year)
+                ordinals = rule._ordinal_dates(date(chunk_start, 1, 1), date(year, 12, 31), observed)
+                for ordinal in sorted(ordinals, reverse=True):
+                    if ordinal <= start:
+                        yield ordinal, position
+                year = chunk_start - 1
+
+    def add_rule(self, rule: AbstractHoliday):
+        """Adds a holiday rule to the calendar.
+
+        Only the years the rule can fall in (see `AbstractHoliday.bounds`) are recomputed in the holiday index,
+        business-day counts, bitmaps and name index, and in those of joint calendars that include this calendar.
+
+        Args:
+            rule: Holiday rule to add
+        """
+        ranges = [_rule_years(rule)]
+        with self._lock:
+            self._change_rules(list(self.rules) + [rule], ranges, added=rule)
+        self._notify_dependents(ranges)
+
+    def remove_rule(self, rule: Union[AbstractHoliday, str]) -> AbstractHoliday:
+        """Removes a holiday rule from the calendar, recomputing only the years it can fall in. See `add_rule`.
+
+        Args:
+            rule: Holiday rule, or the name of the rule, to remove. The first matching rule is removed
+
+        Returns:
+            AbstractHoliday: Removed rule
+        """
+        with self._lock:
+            rules = list(self.rules)
+            removed = rules.pop(self._rule_position(rule))
+            ranges = [_rule_years(removed)]
+            self._change_rules(rules, ranges)
+        self._notify_dependents(ranges)
+        return removed
+
+    def replace_rule(self, rule: Union[AbstractHoliday, str], new_rule: AbstractHoliday) -> AbstractHoliday:
+        """Replaces a holiday rule, keeping its position, recomputing only the years either rule can fall in.
+
+        Args:
+            rule: Holiday rule, or the name of the rule, to replace. The first matching rule is replaced
+            new_rule: Replacement rule
+
+        Returns:
+            AbstractHoliday: Replaced rule
+        """
+        with self._lock:
+            rules = list(self.rules)
+            position = self._rule_position(rule)
+            replaced, rules[position] = rules[position], new_rule
+            ranges = [_rule_years(replaced), _rule_years(new_rule)]
+            self._change_rules(rules, ranges)
+        self._notify_dependents(ranges)
+        return replaced
+
+    def changes_since(self, version: int) -> List[Tuple[int, int]]:
+        """Returns the (start year, end year) ranges of the holidays changed after version of the calendar.
+
+        The calendar `version` increases by one with every rule change, e.g. from `add_rule`, so a cache derived from
+        the calendar can record the version it was built from and recompute only the changed years. The last
+        `change_log_size` changes are kept; for an older version, every year is returned as changed.
+        """
+        if version < self._changes_floor:
+            return [(date.min.year, date.max.year)]
+        return [(start_year, end_year) for v, start_year, end_year in self._changes if v > version]
+
+    @property
+    def stats(self) -> Optional[CalendarStats]:
+        """Instrumentation measurements of the calendar, None if instrumentation is disabled."""
+        return self._stats
+
+    def enable_instrumentation(self, callback: Optional[Callable[[RuleCall], None]] = None) -> CalendarStats:
+        """Starts recording holiday index hits and misses and the `dates` calls of each rule.
+
+        See `AbstractHoliday.enable_instrumentation`. Rules of the built-in calendars are shared by all instances of a
+        calendar class. Each calendar adds its own measurements to the shared rules, which record every call of the
+        rules, including calls made for other instances that share them.
+
+        Args:
+            callback: Function called with a `RuleCall` after each `dates` call of a rule
+
+        Returns:
+            CalendarStats: Measurements, updated as the calendar is used
+        """
+        self.disable_instrumentation()
+        rules = list({id(rule): rule for rule in self.rules}.values())
+        self._instrumented = [(rule, rule.enable_instrumentation(callback)) for rule in rules]
+        self._stats = CalendarStats(self.name, [stats for _, stats in self._instrumented])
+        return self._stats
+
+    def disable_instrumentation(self):
+        """Stops recording measurements for the calendar and its rules, leaving those of other calendars."""
+        for rule, stats in self._instrumented:
+            rule.disable_instrumentation(stats)
+        self._instrumented = []
+        self._stats = None
 
     def holiday_names(self):
         """Returns the names of the holiday rules in the calendar."""
@@ -61,9 +1139,170 @@ class AbstractCalendar:
         return f'Calendar: {self.name} ({num_rules} holiday rules)'
 
 
+class JointCalendar(AbstractCalendar):
+    """
+    Calendar whose holidays are the union or intersection of the holidays of other calendars.
+
+    A union calendar has the business days common to all of its calendars, e.g. settlement days for a cross-currency
+    trade. Holidays are merged from the sorted holiday indexes of the calendars, and the calendars each holiday date
+    comes from are available from `holiday_sources`.
+    """
+
+    combination_cache_size = 64
+    _combinations = OrderedDict()
+    _combinations_lock = Lock()
+
+    def __init__(self, calendars: Sequence[AbstractCalendar], mode: str = 'union', name: Optional[str] = None):
+        """
+        Args:
+            calendars: Calendars to combine
+            mode: 'union' for dates that are holidays in any calendar, 'intersection' for dates that are holidays in
+                every calendar. Defaults to 'union'
+            name: Name of the calendar, defaults to the calendar names joined with ' | ' (union) or ' & '
+                (intersection)
+        """
+        if mode not in ('union', 'intersection'):
+            raise ValueError(f"Unknown mode {mode!r}, expected 'union' or 'intersection'")
+        if len(calendars) == 0:
+            raise ValueError('JointCalendar must have at least one calendar.')
+        self.calendars = tuple(calendars)
+        self.mode = mode
+        if name is None:
+            name = (' | ' if mode == 'union' else ' & ').join(c.name for c in self.calendars)
+        # a union has a business day when every calendar has one, an intersection when any calendar has one
+        combine = all if mode == 'union' else any
+        weekmask = [combine(c.weekmask[i] for c in self.calendars) for i in range(7)]
+        super(JointCalendar, self).__init__(name, [r for c in self.calendars for r in c.rules], weekmask)
+        # the rules lists the joint rules were last built from
+        self._member_rules = tuple(c.rules for c in self.calendars)
+        self._sources = {False: {}, True: {}}
+        for calendar in self.calendars:
+            calendar._dependents.add(self)
+
+    def __getstate__(self):
+        state = super(JointCalendar, self).__getstate__()
+        state['_sources'] = {False: {}, True: {}}
+        return state
+
+    def __setstate__(self, state):
+        super(JointCalendar, self).__setstate__(state)
+        for calendar in self.calendars:
+            calendar._dependents.add(self)
+
+    @classmethod
+    def combine(cls, calendars: Sequence[AbstractCalendar], mode: str = 'union') -> 'JointCalendar':
+        """Returns a joint calendar, reusing the cached instance for the same combination of calendars.
+
+        Calendars are the same if they are the same instances, so the joint calendar returned always wraps the
+        calendars passed and follows their rule changes. A new joint calendar is created if rules were assigned to a
+        calendar directly. Use shared instances (see `holidaycal.get_calendar`) to
+        share joint calendars across callers. Up to `combination_cache_size` combinations are kept, least recently
+        used first out; a cached joint calendar keeps its calendars alive until it is dropped.
+        """
+        calendars = tuple(calendars)
+        key = (cls, mode) + tuple(id(c) for c in calendars)
+        combinations = cls._combinations
+        with cls._combinations_lock:
+            joint = combinations.get(key)
+            # the cached joint calendar references its calendars, so their ids are not reused while it is cached,
+            # but rules assigned without the calendar's methods are not followed
+            if joint is not None and all(m is c and rules is c.rules
+                                         for m, c, rules in zip(joint.calendars, calendars, joint._member_rules)):
+                combinations.move_to_end(key)
+                return joint
+            joint = cls(calendars, mode)
+            combinations[key] = joint
+            combinations.move_to_end(key)
+            while len(combinations) > cls.combination_cache_size:
+                combinations.popitem(last=False)
+        return joint
+
+    def holiday_sources(self, start_date, end_date, observed=False) -> List[Tuple[date, Tuple[AbstractCalendar]]]:
+        """Returns each holiday date between start_date and end_date, inclusive, with the calendars it comes from.
+
+        Args:
+            start_date (datetime-like): Starting date
+            end_date (datetime-like): Ending date
+            observed (bool): Whether holidays should be adjusted to observed dates, defaults to False
+
+        Returns:
+            list: List of (date, tuple of calendars), one entry per date
+        """
+        ordinals, _ = self._index_slice(start_date, end_date, observed)
+        sources = self._sources[observed]
+        unique = [o for i, o in enumerate(ordinals) if i == 0 or o != ordinals[i - 1]]
+        return [(date.fromordinal(o), sources[o]) for o in unique]
+
+    def add_rule(self, rule: AbstractHoliday):
+        raise TypeError('Change the rules of the calendars of a JointCalendar instead')
+
+    def remove_rule(self, rule: Union[AbstractHoliday, str]) -> AbstractHoliday:
+        raise TypeError('Change the rules of the calendars of a JointCalendar instead')
+
+    def replace_rule(self, rule: Union[AbstractHoliday, str], new_rule: AbstractHoliday) -> AbstractHoliday:
+        raise TypeError('Change the rules of the calendars of a JointCalendar instead')
+
+    def _member_changed(self, ranges):
+        """Updates the joint calendar after the rules of one of its calendars changed in the ranges of years."""
+        with self._lock:
+            self._member_rules = tuple(c.rules for c in self.calendars)
+            self._change_rules([r for c in self.calendars for r in c.rules], ranges)
+        self._notify_dependents(ranges)
+
+    def _invalidate_years(self, start_year, end_year, added=None):
+        start, end = date(start_year, 1, 1).toordinal(), date(end_year, 12, 31).toordinal()
+        for sources in self._sources.values():
+            for ordinal in [o for o in sources if start <= o <= end]:
+                del sources[ordinal]
+        super(JointCalendar, self)._invalidate_years(start_year, end_year)
+
+    def _index_entries(self, start_year, end_year, observed):
+        """Merges the index entries of the calendars for start_year through end_year."""
+        start, end = date(start_year, 1, 1).toordinal(), date(end_year, 12, 31).toordinal()
+        streams = []
+        for calendar in self.calendars:
+            index = calendar._holiday_index(start_year, end_year, observed)
+            lo, hi = index.bounds(start, end)
+            streams.append(zip(index.ordinals[lo:hi], index.rules[lo:hi]))
+
+        ordinals, rules = array('i'), []
+        sources = self._sources[observed]
+        for ordinal, group_rules, calendars in self._merge_groups(streams, True):
+            ordinals.extend([ordinal] * len(group_rules))
+            rules.extend(group_rules)
+            sources[ordinal] = calendars
+        return ordinals, rules
+
+    def _entry_stream(self, start_date, forward, observed):
+        streams = [c._entry_stream(start_date, forward, observed) for c in self.calendars]
+        return ((ordinal, rule) for ordinal, group_rules, _ in self._merge_groups(streams, forward)
+                for rule in group_rules)
+
+    def _merge_groups(self, streams, forward):
+        """Merges sorted (ordinal, rule) streams, one per calendar, into (ordinal, rules, calendars) groups.
+
+        Groups are in date order, with rules in calendar order. For an intersection, only groups with entries from
+        every calendar are kept.
+        """
+        tagged = [zip(stream, repeat(p)) for p, stream in enumerate(streams)]
+        required = len(self.calendars) if self.mode == 'intersection' else 1
+        group, group_rules, positions = None, [], []
+        # merge is stable, so entries from one calendar on the same date keep their order
+        for (ordinal, rule), position in merge(*tagged, key=lambda e: (e[0][0], e[1]), reverse=not forward):
+            if ordinal != group:
+                if len(positions) >= required:
+                    yield group, group_rules, tuple(self.calendars[p] for p in positions)
+                group, group_rules, positions = ordinal, [], []
+            group_rules.append(rule)
+            if position not in positions:
+                positions.append(position)
+        if group is not None and len(positions) >= required:
+            yield group, group_rules, tuple(self.calendars[p] for p in positions)
+
+
 class NYBankHolidayCalendar(AbstractCalendar):
 
-    rules = [
+    rules = _BuiltIn(lambda: [
         NYBankHolidays.NewYearsDay,
         NYBankHolidays.MLKDay,
         # NYBankHolidays.LincolnsBirthday,
@@ -78,12 +1317,12 @@ class NYBankHolidayCalendar(AbstractCalendar):
         NYBankHolidays.VeteransDay,
         NYBankHolidays.Thanksgiving,
         NYBankHolidays.ChristmasDay
-    ]
+    ])
 
 
 class LondonBankHolidayCalendar(AbstractCalendar):
 
-    rules = [
+    rules = _BuiltIn(lambda: [
         LondonBankHolidays.NewYearsDay,
         LondonBankHolidays.GoodFriday,
         LondonBankHolidays.EasterMonday,
@@ -94,4 +1333,4 @@ class LondonBankHolidayCalendar(AbstractCalendar):
         LondonBankHolidays.Christmas,
         LondonBankHolidays.BoxingDay,
         LondonBankHolidays.Jubilees
-    ]
+    ])
@@ -0,0 +1,156 @@
+from datetime import date
+from dateutil.relativedelta import relativedelta
+from typing import Callable, Optional
+
+from holidaycal.easter import EasterDelta, easter_ordinal
+
+# relativedelta fields that the compiled steps do not handle
+_RELATIVE_FIELDS = ('years', 'months', 'leapdays', 'hours', 'minutes', 'seconds', 'microseconds')
+_ABSOLUTE_FIELDS = ('year', 'hour', 'minute', 'second', 'microsecond')
+# relativedelta fields that, with the absolute fields, make an offset non-periodic
+_TIME_FIELDS = ('hours', 'minutes', 'seconds', 'microseconds')
+
+# the Gregorian calendar repeats every 400 years
+CYCLE_YEARS = 400
+CYCLE_DAYS = 146097
+
+_DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+
+def _days_in_month(year, month):
+    if month == 2 and year % 4 == 0 and (year % 100 != 0 or year % 400 == 0):
+        return 29
+    return _DAYS_IN_MONTH[month]
+
+
+class _Step:
+    """A compiled offset that maps a date, given either as (year, month, day) or as an ordinal, to an ordinal."""
+
+    def __init__(self, from_ymd: Callable, from_ordinal: Callable):
+        self.from_ymd = from_ymd
+        self.from_ordinal = from_ordinal
+
+
+def _weekday_jump(weekday):
+    """Returns a function that applies a relativedelta weekday (e.g. `MO(-1)`) to an ordinal."""
+    wd, nth = weekday.weekday, weekday.n or 1
+    weeks = (abs(nth) - 1) * 7
+
+    # date.fromordinal(1) is a Monday, so the weekday of an ordinal is (ordinal - 1) % 7
+    if nth > 0:
+        return lambda o: o + weeks + (wd - o + 1) % 7
+    return lambda o: o - weeks - (o - 1 - wd) % 7
+
+
+def _compile_relativedelta(rd: relativedelta) -> Optional[_Step]:
+    if any(getattr(rd, f) for f in _RELATIVE_FIELDS) or any(getattr(rd, f) is not None for f in _ABSOLUTE_FIELDS):
+        return None
+
+    days = rd.days
+    jump = _weekday_jump(rd.weekday) if rd.weekday is not None else None
+
+    if rd.month is None and rd.day is None:
+        # fixed shift and/or n-th weekday on or after/before the date
+        if jump is None:
+            def from_ordinal(o):
+                return o + days
+        elif days:
+            def from_ordinal(o):
+                return jump(o + days)
+        else:
+            from_ordinal = jump
+
+        def from_ymd(y, m, d):
+            return from_ordinal(date(y, m, d).toordinal())
+
+        return _Step(from_ymd, from_ordinal)
+
+    # n-th weekday of a month, or a fixed month/day, optionally shifted
+    month, day = rd.month, rd.day
+
+    def from_ymd(y, m, d):
+        m = month or m
+        o = date(y, m, min(_days_in_month(y, m), day or d)).toordinal() + days
+        return o if jump is None else jump(o)
+
+    def from_ordinal(o):
+        dt = date.fromordinal(o)
+        return from_ymd(dt.year, dt.month, dt.day)
+
+    return _Step(from_ymd, from_ordinal)
+
+
+def _compile_easter(ed: EasterDelta) -> Optional[_Step]:
+    inner = _compile_relativedelta(ed.relativedelta)
+    if inner is None:
+        return None
+    method = ed.method
+    inner_ordinal = inner.from_ordinal
+
+    def from_ymd(y, m, d):
+        return inner_ordinal(easter_ordinal(y, method))
+
+    def from_ordinal(o):
+        return from_ymd(date.fromordinal(o).year, 1, 1)
+
+    return _Step(from_ymd, from_ordinal)
+
+
+def _compile_step(offset) -> Optional[_Step]:
+    if type(offset) is relativedelta:
+        return _compile_relativedelta(offset)
+    if type(offset) is EasterDelta:
+        return _compile_easter(offset)
+    return None
+
+
+def compile_offset(offset) -> Optional[Callable[[int], int]]:
+    """Compiles a `RecurringHoliday` offset into a function of the year that returns the holiday's date ordinal.
+
+    Recognizes `relativedelta` offsets made of a fixed month and/or day, a days shift and a weekday (e.g. the n-th or
+    last weekday of a month), `EasterDelta` offsets of the same shapes and lists of these. The compiled function gives
+    the same date as adding the offset to January 1st of the year.
+
+    Args:
+        offset: `relativedelta`, `EasterDelta` or a list of them
+
+    Returns:
+        Function that takes a year and returns a date ordinal, or None if the offset shape is not recognized
+    """
+    offsets = offset if isinstance(offset, list) else [offset]
+    if not offsets:
+        return None
+    steps = [_compile_step(o) for o in offsets]
+    if any(step is None for step in steps):
+        return None
+
+    first = steps[0].from_ymd
+    rest = [step.from_ordinal for step in steps[1:]]
+    if not rest:
+        return lambda year: first(year, 1, 1)
+
+    def compiled(year):
+        o = first(year, 1, 1)
+        for step in rest:
+            o = step(o)
+        return o
+
+    return compiled
+
+
+def is_periodic_offset(offset) -> bool:
+    """Returns True if adding the offset to January 1st gives dates that repeat with the 400-year Gregorian cycle.
+
+    That is the case for `relativedelta` offsets, or lists of them, without an absolute year or time fields. Adding
+    such an offset to January 1st of year + 400 gives the date for year shifted by exactly `CYCLE_DAYS` days.
+    `EasterDelta` offsets are not periodic in the 400-year cycle.
+
+    Args:
+        offset: `relativedelta`, `EasterDelta` or a list of them
+
+    Returns:
+        bool: Whether the offset is periodic
+    """
+    offsets = offset if isinstance(offset, list) else [offset]
+    return all(type(o) is relativedelta and not any(getattr(o, f) for f in _TIME_FIELDS)
+               and all(getattr(o, f) is None for f in _ABSOLUTE_FIELDS) for o in offsets)
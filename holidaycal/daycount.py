@@ -0,0 +1,138 @@
+from calendar import monthrange
+from datetime import date
+from typing import Optional
+
+from holidaycal.calendar import AbstractCalendar, _numpy
+
+DAY_COUNT_CONVENTIONS = ('ACT/360', 'ACT/365F', '30/360', '30U/360', '30E/360', '30E/360 ISDA', 'BUS/252')
+
+_DENOMINATORS = {'ACT/360': 360, 'ACT/365F': 365, '30/360': 360, '30U/360': 360, '30E/360': 360,
+                 '30E/360 ISDA': 360, 'BUS/252': 252}
+
+
+def _check(convention, calendar):
+    if convention not in _DENOMINATORS:
+        raise ValueError(f'Unknown day count convention {convention!r}, expected one of {DAY_COUNT_CONVENTIONS}')
+    if convention == 'BUS/252' and calendar is None:
+        raise ValueError('BUS/252 requires a calendar')
+
+
+def day_count(start_date: date, end_date: date, convention: str, calendar: Optional[AbstractCalendar] = None,
+              maturity_date: Optional[date] = None) -> int:
+    """Returns the number of days from start_date to end_date under a day count convention.
+
+    Actual conventions count calendar days, 30/360 conventions count 30-day months and BUS/252 counts the calendar's
+    business days from start_date, inclusive, to end_date, exclusive. Business days come from the calendar's
+    cumulative business-day index, so counting does not depend on the length of the period. Counts are negative if
+    end_date is before start_date.
+
+    Args:
+        start_date: Start of the accrual period
+        end_date: End of the accrual period
+        convention: One of 'ACT/360', 'ACT/365F', '30/360' (bond basis), '30U/360' (US, with the February end of
+            month rules), '30E/360' (Eurobond basis), '30E/360 ISDA' and 'BUS/252'
+        calendar: Business day calendar, required for BUS/252
+        maturity_date: Maturity of the instrument, used by 30E/360 ISDA to leave an end_date at the end of February
+            unadjusted if it is the maturity date
+
+    Returns:
+        int: Number of days
+    """
+    _check(convention, calendar)
+    if convention in ('ACT/360', 'ACT/365F'):
+        return end_date.toordinal() - start_date.toordinal()
+    if convention == 'BUS/252':
+        return calendar.business_days_between(start_date, end_date)
+
+    y1, m1, d1 = start_date.year, start_date.month, start_date.day
+    y2, m2, d2 = end_date.year, end_date.month, end_date.day
+    if convention == '30/360':
+        if d1 == 31:
+            d1 = 30
+        if d2 == 31 and d1 == 30:
+            d2 = 30
+    elif convention == '30U/360':
+        start_feb_end = m1 == 2 and d1 == monthrange(y1, 2)[1]
+        if start_feb_end and m2 == 2 and d2 == monthrange(y2, 2)[1]:
+            d2 = 30
+        if start_feb_end or d1 == 31:
+            d1 = 30
+        if d2 == 31 and d1 == 30:
+            d2 = 30
+    elif convention == '30E/360':
+        d1, d2 = min(d1, 30), min(d2, 30)
+    else:
+        if d1 == monthrange(y1, m1)[1]:
+            d1 = 30
+        if d2 == monthrange(y2, m2)[1] and not (m2 == 2 and end_date == maturity_date):
+            d2 = 30
+    return 360 * (y2 - y1) + 30 * (m2 - m1) + d2 - d1
+
+
+def year_fraction(start_date: date, end_date: date, convention: str, calendar: Optional[AbstractCalendar] = None,
+                  maturity_date: Optional[date] = None) -> float:
+    """Returns the fraction of a year from start_date to end_date under a day count convention, see `day_count`."""
+    return day_count(start_date, end_date, convention, calendar, maturity_date) / _DENOMINATORS[convention]
+
+
+def day_count_array(start_dates, end_dates, convention: str, calendar: Optional[AbstractCalendar] = None,
+                    maturity_dates=None):
+    """Vectorized `day_count` for arrays of dates. Requires numpy.
+
+    Args:
+        start_dates (array-like): Starts of the accrual periods, converted to `datetime64[D]`
+        end_dates (array-like): Ends of the accrual periods, converted to `datetime64[D]`, broadcast against
+            start_dates
+        convention (str): Day count convention, see `day_count`
+        calendar (AbstractCalendar): Business day calendar, required for BUS/252
+        maturity_dates (array-like): Maturities, used by 30E/360 ISDA
+
+    Returns:
+        numpy.ndarray: Number of days
+    """
+    _check(convention, calendar)
+    np = _numpy()
+    start, end = np.broadcast_arrays(np.asarray(start_dates, dtype='datetime64[D]'),
+                                     np.asarray(end_dates, dtype='datetime64[D]'))
+    if convention in ('ACT/360', 'ACT/365F'):
+        return (end - start).astype(np.int64)
+    if convention == 'BUS/252':
+        return calendar.business_days_between_array(start, end)
+
+    y1, m1, d1, last1 = _ymd(start)
+    y2, m2, d2, last2 = _ymd(end)
+    if convention == '30/360':
+        d1 = np.minimum(d1, 30)
+        d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+    elif convention == '30U/360':
+        start_feb_end = (m1 == 2) & last1
+        d2 = np.where(start_feb_end & (m2 == 2) & last2, 30, d2)
+        d1 = np.where(start_feb_end, 30, np.minimum(d1, 30))
+        d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+    elif convention == '30E/360':
+        d1, d2 = np.minimum(d1, 30), np.minimum(d2, 30)
+    else:
+        d1 = np.where(last1, 30, d1)
+        keep = m2 == 2
+        if maturity_dates is None:
+            keep = np.zeros_like(keep)
+        else:
+            keep &= end == np.asarray(maturity_dates, dtype='datetime64[D]')
+        d2 = np.where(last2 & ~keep, 30, d2)
+    return 360 * (y2 - y1) + 30 * (m2 - m1) + d2 - d1
+
+
+def year_fraction_array(start_dates, end_dates, convention: str, calendar: Optional[AbstractCalendar] = None,
+                        maturity_dates=None):
+    """Vectorized `year_fraction` for arrays of dates, see `day_count_array`. Requires numpy."""
+    return day_count_array(start_dates, end_dates, convention, calendar, maturity_dates) / _DENOMINATORS[convention]
+
+
+def _ymd(dates):
+    """Returns the years, months, days and end of month flags of a `datetime64[D]` array."""
+    np = _numpy()
+    months = dates.astype('datetime64[M]')
+    years = months.astype('datetime64[Y]')
+    last = (dates + 1).astype('datetime64[M]') != months
+    return (years.astype(np.int64) + 1970, (months - years).astype(np.int64) + 1,
+            (dates - months).astype(np.int64) + 1, last)
@@ -1,18 +1,121 @@
+import sys
 from datetime import date
-from dateutil.easter import easter
+from dateutil.easter import easter, EASTER_JULIAN, EASTER_ORTHODOX, EASTER_WESTERN
 from dateutil.relativedelta import relativedelta
+from typing import List
+
+# Easter date ordinals by method and year, shared by all EasterDelta instances and compiled offsets
+_EASTER_TABLES = {EASTER_JULIAN: {}, EASTER_ORTHODOX: {}, EASTER_WESTERN: {}}
+
+# batches of at least this many missing years are computed with numpy, if it has been imported
+_NUMPY_MIN_YEARS = 100
+
+# ordinal of numpy's datetime64 epoch, 1970-01-01
+_EPOCH_ORDINAL = 719163
+
+
+def _table(method):
+    try:
+        return _EASTER_TABLES[method]
+    except KeyError:
+        raise ValueError('invalid method') from None
+
+
+def easter_ordinal(year: int, method: int = EASTER_WESTERN) -> int:
+    """Returns the date ordinal of Easter in year, like `dateutil.easter.easter`, from a shared table.
+
+    Args:
+        year: Year
+        method: `dateutil.easter` method, EASTER_JULIAN (1), EASTER_ORTHODOX (2) or EASTER_WESTERN (3)
+
+    Returns:
+        int: Date ordinal of Easter Sunday
+    """
+    table = _table(method)
+    ordinal = table.get(year)
+    if ordinal is None:
+        ordinal = table[year] = easter(year, method).toordinal()
+    return ordinal
+
+
+def easter_ordinals(start_year: int, end_year: int, method: int = EASTER_WESTERN) -> List[int]:
+    """Returns the date ordinals of Easter from start_year through end_year, inclusive.
+
+    Years missing from the shared table are computed together, with numpy for large batches if numpy is already
+    imported (importing it takes longer than computing all years of the Gregorian calendar without it).
+
+    Args:
+        start_year: First year
+        end_year: Last year
+        method: `dateutil.easter` method, EASTER_JULIAN (1), EASTER_ORTHODOX (2) or EASTER_WESTERN (3)
+
+    Returns:
+        list: Date ordinals of Easter Sunday, one per year
+    """
+    table = _table(method)
+    years = range(start_year, end_year + 1)
+    missing = [year for year in years if year not in table]
+    if missing:
+        np = sys.modules.get('numpy')
+        if np is not None and len(missing) >= _NUMPY_MIN_YEARS:
+            ordinals = _easter_days(np, np.array(missing, dtype=np.int64), method) + _EPOCH_ORDINAL
+            table.update(zip(missing, ordinals.tolist()))
+        for year in missing:
+            if year not in table:
+                table[year] = easter(year, method).toordinal()
+    return [table[year] for year in years]
+
+
+def easter_array(start_year: int, end_year: int, method: int = EASTER_WESTERN):
+    """Returns the dates of Easter from start_year through end_year, inclusive, as a numpy `datetime64[D]` array.
+
+    Computed with vectorized arithmetic, without the shared table. Requires numpy.
+    """
+    import numpy as np
+    _table(method)
+    days = _easter_days(np, np.arange(start_year, end_year + 1, dtype=np.int64), method)
+    return days.astype('datetime64[D]')
+
+
+def _easter_days(np, y, method):
+    """Vectorized `dateutil.easter.easter`, returns the days since 1970-01-01 for an int64 array of years."""
+    if y.size and (y.min() < date.min.year or y.max() > date.max.year):
+        raise ValueError(f'Years must be between {date.min.year} and {date.max.year}')
+    g = y % 19
+    e = 0
+    if method < 3:
+        i = (19 * g + 15) % 30
+        j = (y + y // 4 + i) % 7
+        if method == 2:
+            # Julian to Gregorian date conversion
+            e = np.where(y > 1600, 10 + y // 100 - 16 - (y // 100 - 16) // 4, 10)
+    else:
+        c = y // 100
+        h = (c - c // 4 - (8 * c + 13) // 25 + 19 * g + 15) % 30
+        i = h - (h // 28) * (1 - (h // 28) * (29 // (h + 1)) * ((21 - g) // 11))
+        j = (y + y // 4 + i + 2 - c + c // 4) % 7
+    p = i - j + e
+    d = 1 + (p + 27 + (p + 6) // 40) % 31
+    m = 3 + (p + 26) // 30
+    # as dateutil, fail for the far future Orthodox dates that fall on the 31st of April or June
+    if np.any(((m == 4) | (m == 6)) & (d > 30)):
+        raise ValueError('day is out of range for month')
+    months = (y - 1970) * 12 + m - 1
+    return months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64) + d - 1
 
 
 class EasterDelta:
     """Class for Easter-based date offsets.
 
     `dateutil.relativedelta.relativedelta`-like object that applies the specified offset relative to Easter.
-    Uses `relativedelta` and `dateutil.easter` to find Eastern for the applicable year.
+    Uses `relativedelta` and a shared table of `dateutil.easter` dates to find Easter for the applicable year.
     The Easter offset is applied prior to any other offsets. Adding to a datetime object does not preserve time.
 
     Accepts the same arguments as `relativedelta`, except for creating an instance from two dates.
     """
 
+    __slots__ = ('relativedelta', 'method')
+
     def __init__(self, method=3, **kwargs):
         super(EasterDelta, self).__init__()
         if 'dt1' in kwargs.keys() or 'dt2' in kwargs.keys():
@@ -23,7 +126,7 @@ class EasterDelta:
     def __add__(self, other):
         if not isinstance(other, date):
             return NotImplemented
-        ret = easter(other.year, method=self.method)
+        ret = date.fromordinal(easter_ordinal(other.year, self.method))
 
         return ret + self.relativedelta
 
@@ -0,0 +1,271 @@
+import argparse
+import csv
+import importlib
+import io
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import BinaryIO, Iterator, List, Tuple
+
+from holidaycal.bitmap import BusinessDayBitmap
+from holidaycal.calendar import AbstractCalendar
+from holidaycal.registry import get_calendar, registered_calendars
+
+TABLES = ('holidays', 'pairs', 'business-days')
+FORMATS = ('csv', 'jsonl', 'binary')
+
+COLUMNS = {
+    'holidays': ('calendar', 'date', 'name'),
+    'pairs': ('calendar', 'name', 'actual', 'observed'),
+    'business-days': ('calendar', 'date', 'business_day'),
+}
+
+# Binary output is a sequence of self-describing blocks, one per calendar and range of years (little-endian):
+#   header      magic, version, table (position in TABLES), calendar name size, row count and names size
+#   calendar    calendar name, UTF-8, padded to a multiple of 4 bytes
+#   names       holiday names of the block, UTF-8, separated by null bytes and padded to a multiple of 4 bytes
+#   columns     holidays:       int32 date ordinal, uint16 name id
+#               pairs:          int32 actual date ordinal, int32 observed date ordinal, uint16 name id
+#               business-days:  int32 date ordinal, uint8 business day flag
+#   padding     to a multiple of 4 bytes
+MAGIC = b'HCBK'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sBBHII')
+_COLUMN_TYPES = {
+    'holidays': ('i', 'H'),
+    'pairs': ('i', 'i', 'H'),
+    'business-days': ('i', 'B'),
+}
+
+# number of years of each block of rows, so memory does not depend on the range of years exported
+_CHUNK_YEARS = 10
+# number of blocks submitted to each worker process ahead of the block being written
+_BLOCKS_PER_WORKER = 2
+
+# calendars resolved by each worker process
+_calendars = {}
+
+
+def resolve_calendar(spec: str) -> AbstractCalendar:
+    """Returns the calendar for a registered name or a `module:attribute` path to a calendar class or instance."""
+    calendar = _calendars.get(spec)
+    if calendar is not None:
+        return calendar
+    if spec in registered_calendars():
+        calendar = get_calendar(spec)
+    elif ':' in spec:
+        module, _, attribute = spec.partition(':')
+        target = importlib.import_module(module)
+        for part in attribute.split('.'):
+            target = getattr(target, part)
+        if isinstance(target, type) and issubclass(target, AbstractCalendar):
+            calendar = target()
+        elif isinstance(target, AbstractCalendar):
+            calendar = target
+        else:
+            raise TypeError(f'{spec} is not a calendar class or instance')
+    else:
+        raise KeyError(f'No calendar is registered as {spec!r}, use module:attribute for other calendars')
+    _calendars[spec] = calendar
+    return calendar
+
+
+def rows(calendar: AbstractCalendar, table: str, start_year: int, end_year: int,
+         observed: bool = False) -> Tuple[list, ...]:
+    """Returns the rows of a table from start_year through end_year as columns, dates as ordinals.
+
+    Args:
+        calendar: Calendar to export
+        table: 'holidays' (date and name), 'pairs' (name, actual and observed date of each holiday) or
+            'business-days' (date and business day flag of every day)
+        start_year: First year
+        end_year: Last year
+        observed: If True, the holidays table has observed dates instead of actual dates
+
+    Returns:
+        tuple: Column lists, without the calendar column
+    """
+    start, end = date(start_year, 1, 1), date(end_year, 12, 31)
+    if table == 'holidays':
+        ordinals, rules = calendar._index_slice(start, end, observed)
+        return list(ordinals), [r.name for r in rules]
+    if table == 'pairs':
+        ordinals, rules = calendar._index_slice(start, end, False)
+        # observed dates of each rule, from the rule so that they match the rest of the library
+        observed_ordinals = {}
+        for r in {id(r): r for r in rules}.values():
+            observed_ordinals[id(r)] = {a.toordinal(): o.toordinal() for a, o in r.date_pairs(start, end)}
+        return [r.name for r in rules], list(ordinals), [observed_ordinals[id(r)][o] for o, r in zip(ordinals, rules)]
+    if table == 'business-days':
+        holidays = calendar.holidays(start, end, observed=True)
+        bitmap = BusinessDayBitmap.from_dates(start_year, end_year, holidays, calendar.weekmask)
+        bits = bitmap.bits
+        return list(range(bitmap.origin, bitmap.origin + bitmap.days)), [(bits >> i) & 1 for i in range(bitmap.days)]
+    raise ValueError(f'Unknown table {table!r}, expected one of {TABLES}')
+
+
+def encode(calendar: AbstractCalendar, table: str, start_year: int, end_year: int, fmt: str,
+           observed: bool = False) -> bytes:
+    """Returns the rows of a table from start_year through end_year encoded as CSV (without header), JSON Lines or a
+    binary block."""
+    columns = rows(calendar, table, start_year, end_year, observed)
+    if fmt == 'binary':
+        return _encode_binary(calendar.name, table, columns)
+
+    if table == 'holidays':
+        ordinals, names = columns
+        records = ((calendar.name, date.fromordinal(o).isoformat(), n) for o, n in zip(ordinals, names))
+    elif table == 'pairs':
+        names, actual, observed_ordinals = columns
+        records = ((calendar.name, n, date.fromordinal(a).isoformat(), date.fromordinal(o).isoformat())
+                   for n, a, o in zip(names, actual, observed_ordinals))
+    else:
+        ordinals, flags = columns
+        records = ((calendar.name, date.fromordinal(o).isoformat(), f) for o, f in zip(ordinals, flags))
+
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(records)
+        return buffer.getvalue().encode('utf-8')
+    if fmt == 'jsonl':
+        keys = COLUMNS[table]
+        if table == 'business-days':
+            records = ((c, d, bool(f)) for c, d, f in records)
+        return ''.join(json.dumps(dict(zip(keys, record))) + '\n' for record in records).encode('utf-8')
+    raise ValueError(f'Unknown format {fmt!r}, expected one of {FORMATS}')
+
+
+def _pad(data: bytes) -> bytes:
+    return data + b'\0' * (-len(data) % 4)
+
+
+def _encode_binary(calendar_name, table, columns):
+    if table == 'holidays':
+        ordinals, names = columns
+        columns = [ordinals]
+    elif table == 'pairs':
+        names, actual, observed = columns
+        columns = [actual, observed]
+    else:
+        names, columns = [], list(columns)
+    if names:
+        ids = {}
+        columns.append([ids.setdefault(n, len(ids)) for n in names])
+        names = list(ids)
+
+    calendar_bytes = calendar_name.encode('utf-8')
+    names_bytes = _pad('\0'.join(names).encode('utf-8'))
+    sections = []
+    for typecode, column in zip(_COLUMN_TYPES[table], columns):
+        values = array(typecode, column)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        sections.append(values.tobytes())
+    header = _HEADER.pack(MAGIC, VERSION, TABLES.index(table), len(calendar_bytes), len(columns[0]),
+                          len(names_bytes))
+    return _pad(header + _pad(calendar_bytes) + names_bytes + b''.join(sections))
+
+
+def read_binary(stream: BinaryIO) -> Iterator[Tuple[str, str, List[array]]]:
+    """Reads binary output block by block.
+
+    Args:
+        stream: Binary file object
+
+    Returns:
+        iterator: (calendar name, table, columns) of each block, with name ids replaced by names
+    """
+    while True:
+        header = stream.read(_HEADER.size)
+        if not header:
+            return
+        magic, version, table, calendar_size, count, names_size = _HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError('Not a holidaycal binary export or unsupported version')
+        table = TABLES[table]
+        calendar_name = stream.read(calendar_size + -calendar_size % 4)[:calendar_size].decode('utf-8')
+        names = stream.read(names_size).rstrip(b'\0').decode('utf-8').split('\0')
+        columns, size = [], 0
+        for typecode in _COLUMN_TYPES[table]:
+            values = array(typecode)
+            values.frombytes(stream.read(count * values.itemsize))
+            if sys.byteorder != 'little':
+                values.byteswap()
+            columns.append(values)
+            size += count * values.itemsize
+        stream.read(-size % 4)
+        if table != 'business-days':
+            columns[-1] = [names[i] for i in columns[-1]]
+        yield calendar_name, table, columns
+
+
+def _encode_task(task):
+    spec, table, start_year, end_year, fmt, observed = task
+    return encode(resolve_calendar(spec), table, start_year, end_year, fmt, observed)
+
+
+def main(argv=None):
+    """Command-line entry point, see `python -m holidaycal --help`."""
+    parser = argparse.ArgumentParser(
+        prog='python -m holidaycal',
+        description='Streams holidays, actual and observed holiday pairs or daily business-day flags of calendars.')
+    parser.add_argument('calendars', nargs='+',
+                        help='registered calendar names (e.g. NYBankHolidayCalendar) or module:attribute paths to '
+                             'calendar classes or instances')
+    parser.add_argument('--table', choices=TABLES, default='holidays', help='table to export, default holidays')
+    parser.add_argument('--format', choices=FORMATS, default='csv', dest='fmt', help='output format, default csv')
+    parser.add_argument('--start', type=int, default=1900, help='first year, default 1900')
+    parser.add_argument('--end', type=int, default=2100, help='last year, default 2100')
+    parser.add_argument('--observed', action='store_true', help='export observed instead of actual holiday dates')
+    parser.add_argument('--output', '-o', help='output file, default stdout')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes, default 1')
+    args = parser.parse_args(argv)
+
+    if args.end < args.start:
+        parser.error('--end must not be before --start')
+    for spec in args.calendars:
+        try:
+            resolve_calendar(spec)
+        except (ImportError, AttributeError, KeyError, TypeError) as e:
+            parser.error(f'cannot load calendar {spec}: {e}')
+
+    tasks = [(spec, args.table, year, min(year + _CHUNK_YEARS - 1, args.end), args.fmt, args.observed)
+             for spec in args.calendars for year in range(args.start, args.end + 1, _CHUNK_YEARS)]
+    output = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        if args.fmt == 'csv':
+            output.write((','.join(COLUMNS[args.table]) + '\n').encode('utf-8'))
+        if args.workers > 1:
+            with ProcessPoolExecutor(args.workers) as pool:
+                # a bounded window of blocks, written in order, so memory does not depend on the range of years
+                pending = deque()
+                try:
+                    for task in tasks:
+                        if len(pending) == args.workers * _BLOCKS_PER_WORKER:
+                            output.write(pending.popleft().result())
+                        pending.append(pool.submit(_encode_task, task))
+                    while pending:
+                        output.write(pending.popleft().result())
+                finally:
+                    for future in pending:
+                        future.cancel()
+        else:
+            for task in tasks:
+                output.write(_encode_task(task))
+        output.flush()
+    except BrokenPipeError:
+        if args.output:
+            raise
+        # the reader closed the pipe, e.g. `head`: stop quietly, and keep Python from flushing stdout again at exit
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if args.output:
+            output.close()
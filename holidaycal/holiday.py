@@ -1,33 +1,186 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple, OrderedDict
 from datetime import date
+from threading import Lock, RLock
+from time import perf_counter
 from dateutil.relativedelta import relativedelta, MO, TH, SU
 from typing import Union, List, Optional, Callable
 
-from holidaycal.easter import EasterDelta
-from holidaycal.observance import sunday_to_monday, weekend_to_monday, sunday_to_tuesday
+from holidaycal.compiler import compile_offset, is_periodic_offset, CYCLE_DAYS, CYCLE_YEARS
+from holidaycal.easter import EasterDelta, easter_ordinals
+from holidaycal.instrumentation import RuleCall, RuleStats, record_call
+from holidaycal.observance import CollisionObservance, Observance, sunday_to_monday, weekend_to_monday, \
+    weekend_to_next_weekdays
+
+
+# enabling and disabling instrumentation of shared rules from several threads
+_instrumentation_lock = Lock()
 
 
 class AbstractHoliday:
     """
     Abstract holiday class that helps with type checking (e.g. `isinstance`).
+
+    Subclasses implement either `dates`, which returns the holiday dates in a range, or `_ordinals_between`, which
+    returns their sorted date ordinals and lets `dates` convert them to dates at the API boundary. Calendars get the
+    ordinals of any rule through `_ordinal_dates`.
     """
 
+    __slots__ = ('name', '_observance', '_stats')
+
     def __init__(self, name: str, observance: Optional[Callable] = None):
         self.name = name
         self._observance = observance
+        self._stats = None
+
+    def dates(self, start_date, end_date, observed: bool = False, as_ordinals: bool = False):
+        """Computes the holidays dates between start and end date, inclusive.
 
-    def dates(self, start_date, end_date, observed):
+        Args:
+            start_date (datetime-like): Starting date
+            end_date (datetime-like): Ending date
+            observed: Whether holidays should be adjusted to observed date, defaults to False
+            as_ordinals: If True, return the date ordinals instead of creating `date` objects
+
+        Returns:
+            list: List of `date`, or `array('i')` of date ordinals if as_ordinals is True
+        """
+        subscribers = self._stats
+        if subscribers is None:
+            ordinals = self._ordinals_between(start_date, end_date, observed)
+        else:
+            ordinals = record_call(subscribers, self, self._ordinals_between, start_date, end_date, observed)
+        return ordinals if as_ordinals else list(map(date.fromordinal, ordinals))
+
+    def _ordinals_between(self, start_date, end_date, observed, timings=None):
+        """Returns the sorted date ordinals of the holidays between start and end date, inclusive.
+
+        timings is None, or the offset, skip and observance times of an instrumented call to add to.
+        """
         raise NotImplementedError
 
+    def _ordinal_dates(self, start_date, end_date, observed):
+        """Returns the date ordinals of the holidays between start and end date, inclusive.
+
+        Uses `_ordinals_between`, unless a subclass implements `dates` itself, in which case its dates are converted.
+        """
+        if type(self).dates is AbstractHoliday.dates:
+            return self.dates(start_date, end_date, observed, as_ordinals=True)
+        subscribers = getattr(self, '_stats', None)
+        if subscribers is None:
+            dates = self.dates(start_date, end_date, observed)
+        else:
+            # rules that implement `dates` do not measure offset, skip and observance times
+            dates = record_call(subscribers, self, lambda start, end, obs, timings: self.dates(start, end, obs),
+                                start_date, end_date, observed)
+        return array('i', [dt.toordinal() for dt in dates])
+
+    @property
+    def stats(self) -> Optional[RuleStats]:
+        """Measurements of the latest enabled `enable_instrumentation` call, None if instrumentation is disabled."""
+        subscribers = getattr(self, '_stats', None)
+        return subscribers[-1] if subscribers is not None else None
+
+    def enable_instrumentation(self, callback: Optional[Callable[[RuleCall], None]] = None) -> RuleStats:
+        """Starts recording the calls, dates and time of the rule's `dates` calls.
+
+        Instrumentation applies to this rule only, rules without it only check that it is disabled. Each call returns
+        new measurements, which record every later call of the rule until they are disabled. Rules of the built-in
+        calendars are shared by all instances of a calendar class, which enable their own measurements.
+
+        Args:
+            callback: Function called with a `RuleCall` after each `dates` call
+
+        Returns:
+            RuleStats: Measurements, updated as the rule is used
+        """
+        stats = RuleStats(self.name, callback)
+        with _instrumentation_lock:
+            self._stats = (self._stats or ()) + (stats,)
+        return stats
+
+    def disable_instrumentation(self, stats: Optional[RuleStats] = None):
+        """Stops recording measurements.
+
+        Args:
+            stats: Measurements returned by `enable_instrumentation` to stop, defaults to all of them
+        """
+        with _instrumentation_lock:
+            subscribers = tuple(s for s in self._stats or () if stats is not None and s is not stats)
+            self._stats = subscribers or None
+
+    def date_pairs(self, start_date, end_date):
+        """Returns the (actual, observed) dates of the holidays whose actual date is between start and end date.
+
+        Args:
+            start_date (datetime-like): Starting date
+            end_date (datetime-like): Ending date
+
+        Returns:
+            list: List of (actual date, observed date)
+        """
+        observance = self._observance
+        return [(dt, dt if observance is None else observance(dt)) for dt in self.dates(start_date, end_date, False)]
+
+    # attributes left out of pickles, restored by `__setstate__`; instrumentation is not pickled
+    _transient = ('_stats',)
+
+    def __getstate__(self):
+        state = dict(getattr(self, '__dict__', {}))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get('__slots__', ()):
+                if name not in self._transient and hasattr(self, name):
+                    state[name] = getattr(self, name)
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._stats = None
+
+    def bounds(self):
+        """Returns the first and last dates that the holiday can fall on, actual or observed.
+
+        Either date is None if the holiday is unbounded in that direction. Subclasses should override this if they
+        know their bounds, calendars use them to stop searching for more dates.
+        """
+        return None, None
+
+
+# queries over at least this many years switch periodic rules to the 400-year cycle table
+_CYCLE_MIN_YEARS = 50
+# queries over at least this many years compute the Easter dates of Easter-based rules in one batch
+_EASTER_BATCH_YEARS = 50
+# first year of the cycle table, a multiple of CYCLE_YEARS so that table positions are year % CYCLE_YEARS
+_CYCLE_FIRST_YEAR = 2000
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
 
 class RecurringHoliday(AbstractHoliday):
     """
     Class for creating holidays based on recurrence rules.
+
+    Common offset shapes are compiled into date ordinal arithmetic (see `holidaycal.compiler`), other offsets are added
+    to January 1st with `relativedelta`. Actual and observed dates are memoized per year in a least recently used
+    cache. The cache assumes the rule is not modified after construction, call `cache_clear` if it is. Observed dates
+    under a `CollisionObservance` depend on other holidays and are computed on every query.
+
+    Rules without an Easter offset or `skip` function, and with no observance or an `Observance` table, repeat with
+    the 400-year Gregorian cycle (see `periodic`). Once such a rule is queried over many years (or has computed a
+    cycle's worth of years), it computes one 400-year table of actual and observed dates and answers any year by a
+    table lookup and a shift of the date ordinal.
     """
 
+    __slots__ = ('month', 'day', 'offset', '_compiled', 'start_date', 'end_date', '_skip', 'cache_size', '_periodic',
+                 '_cycle', '_easter_methods', '_cache', '_lock', '_hits', '_misses')
+
     def __init__(self, name: str, month: int = None, day: int = None,
                  offset: Union[relativedelta, List, EasterDelta, None] = None,
                  start_date: Optional[date] = None, end_date: Optional[date] = None,
-                 observance: Optional[Callable] = None, skip: Optional[Callable] = None):
+                 observance: Optional[Callable] = None, skip: Optional[Callable] = None,
+                 cache_size: Optional[int] = 512):
         """
         Args:
             name (str): Holiday name
@@ -37,6 +190,8 @@ class RecurringHoliday(AbstractHoliday):
             observance: Function that takes a holiday date and returns the observed date
             skip: Function that takes a holiday and returns True if that holiday should be skipped, should reference
             holiday unadjusted for observance
+            cache_size (int, optional): Maximum number of years kept in the date cache, None for no limit and 0 to
+            disable caching. Can be changed later through the `cache_size` attribute
         """
         super(RecurringHoliday, self).__init__(name=name, observance=observance)
         if offset is None and (month is None or day is None):
@@ -46,47 +201,171 @@ class RecurringHoliday(AbstractHoliday):
         self.month = month
         self.day = day
         self.offset = offset
+        self._compiled = compile_offset(offset) if offset is not None else None
         self.start_date = start_date
         self.end_date = end_date
         self._skip = skip
-
-    def dates(self, start_date, end_date, observed: bool = False):
-        """Computes the holidays dates between start and end date, inclusive.
-
-        Args:
-            start_date (datetime-like): Starting date
-            end_date (datetime-like): Ending date
-            observed: Whether holidays should be adjusted to observed date, defaults to False
-
-        Returns:
-            list: List of `date`
-        """
+        self.cache_size = cache_size
+        self._periodic = skip is None and (observance is None or isinstance(observance, Observance)) and \
+            (offset is None or is_periodic_offset(offset))
+        offsets = offset if isinstance(offset, list) else [offset]
+        self._easter_methods = sorted({o.method for o in offsets if isinstance(o, EasterDelta)})
+        self._init_cache()
+
+    # compiled offsets are closures, and the lock and the date cache are per process, so pickles leave them out
+    _transient = AbstractHoliday._transient + ('_compiled', '_cycle', '_cache', '_lock', '_hits', '_misses')
+
+    def _init_cache(self):
+        self._cycle = None
+        self._cache = OrderedDict()
+        # the date cache is shared by every thread using the rule
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __setstate__(self, state):
+        super(RecurringHoliday, self).__setstate__(state)
+        self._compiled = compile_offset(self.offset) if self.offset is not None else None
+        self._init_cache()
+
+    def _ordinals_between(self, start_date, end_date, observed, timings=None):
+        """Returns the date ordinals of the holidays between start and end date, inclusive, in one pass over years."""
         if self.start_date is not None: start_date = max(self.start_date, start_date)
         if self.end_date is not None: end_date = min(self.end_date, end_date)
-
-        reference_dates = self._reference_dates(start_date.year - 1, end_date.year + 1)
-
-        if self._skip is not None:
-            reference_dates = [dt for dt in reference_dates if self._skip(dt) is False]
-
-        if self._observance is not None and observed:
-            reference_dates = [self._observance(dt) for dt in reference_dates]
-
-        return [dt for dt in reference_dates if start_date <= dt <= end_date]
-
-    def _reference_dates(self, start_year, end_year):
-        year_range = range(start_year, end_year + 1)
-
-        if self.offset is not None:
-            if isinstance(self.offset, list):
-                hols = [date(yr, 1, 1) for yr in year_range]
-                for offset in self.offset:
-                    hols = [h + offset for h in hols]
-                return hols
+        start, end = start_date.toordinal(), end_date.toordinal()
+        i = 1 if observed and self._observance is not None else 0
+
+        # a holiday can be observed in the year before or after it occurs
+        years = range(max(start_date.year - 1, date.min.year), min(end_date.year + 1, date.max.year) + 1)
+        if self._cycle is not None or self._periodic and \
+                (len(years) >= _CYCLE_MIN_YEARS or self._misses >= CYCLE_YEARS):
+            table = self._cycle_table(timings)[i]
+            ordinals = array('i', [table[year % CYCLE_YEARS] + year // CYCLE_YEARS * CYCLE_DAYS for year in years])
+            # the dates of consecutive years are in order, so only the ends of the years can be out of range
+            return ordinals[bisect_left(ordinals, start):bisect_right(ordinals, end)]
+
+        if len(years) >= _EASTER_BATCH_YEARS:
+            for method in self._easter_methods:
+                easter_ordinals(years.start, years.stop - 1, method)
+        year_dates = map(self._year_dates, years) if timings is None else \
+            (self._year_dates(year, timings) for year in years)
+        return array('i', [dts[i] for dts in year_dates if dts is not None and start <= dts[i] <= end])
+
+    def bounds(self):
+        """Returns the start and end dates of the holiday, which also bound its observed dates."""
+        return self.start_date, self.end_date
+
+    @property
+    def periodic(self) -> bool:
+        """Whether the rule's dates repeat with the 400-year Gregorian cycle, so it can use a cycle table."""
+        return self._periodic
+
+    def cache_info(self):
+        """Returns the hits, misses, maximum size and current size of the date cache."""
+        return CacheInfo(self._hits, self._misses, self.cache_size, len(self._cache))
+
+    def cache_clear(self):
+        """Clears the date cache, its statistics and the cycle table."""
+        with self._lock:
+            self._cache.clear()
+            self._cycle = None
+            self._hits = 0
+            self._misses = 0
+
+    def _cycle_table(self, timings=None):
+        """Returns the (actual, observed) date ordinals of the rule in each year of a cycle, shifted to cycle zero."""
+        if self._cycle is None:
+            t0 = perf_counter()
+            shift = _CYCLE_FIRST_YEAR // CYCLE_YEARS * CYCLE_DAYS
+            ordinals = self._reference_ordinals(_CYCLE_FIRST_YEAR, _CYCLE_FIRST_YEAR + CYCLE_YEARS - 1)
+            actual = array('i', [o - shift for o in ordinals])
+            t1 = perf_counter()
+            # a shift of whole cycles keeps the weekdays, so the observance applies to the shifted ordinals
+            observed = actual if self._observance is None else array('i', self._observance.apply_ordinals(actual))
+            if timings is not None:
+                timings[0] += t1 - t0
+                timings[2] += perf_counter() - t1
+            self._cycle = actual, observed
+        return self._cycle
+
+    def _year_dates(self, year, timings=None):
+        """Returns the (actual, observed) date ordinals for year, or None if the holiday is skipped that year.
+
+        If timings is not None, the offset, skip and observance times are added to it.
+        """
+        cache = self._cache
+        with self._lock:
+            if year in cache:
+                self._hits += 1
+                cache.move_to_end(year)
+                dts = cache[year]
             else:
-                return [date(yr, 1, 1) + self.offset for yr in year_range]
+                dts = False
+                self._misses += 1
+        if dts is not False:
+            # observed dates that avoid other holidays change with those holidays, so only actual dates are reused
+            if dts is None or not isinstance(self._observance, CollisionObservance):
+                return dts
+            return dts[0], self._observe(dts[0])
+
+        if timings is not None:
+            dts = self._timed_year_dates(year, timings)
         else:
-            return [date(yr, self.month, self.day) for yr in year_range]
+            o = self._reference_ordinal(year)
+            if self._skip is not None and self._skip(date.fromordinal(o)) is not False:
+                dts = None
+            else:
+                dts = (o, self._observe(o))
+
+        if self.cache_size != 0:
+            with self._lock:
+                cache[year] = dts
+                while self.cache_size is not None and len(cache) > self.cache_size:
+                    cache.popitem(last=False)
+        return dts
+
+    def _timed_year_dates(self, year, timings):
+        """Same as computing the dates in `_year_dates`, adding the offset, skip and observance times to timings."""
+        t0 = perf_counter()
+        o = self._reference_ordinal(year)
+        t1 = perf_counter()
+        timings[0] += t1 - t0
+        if self._skip is not None:
+            skipped = self._skip(date.fromordinal(o)) is not False
+            t0, t1 = t1, perf_counter()
+            timings[1] += t1 - t0
+            if skipped:
+                return None
+        if self._observance is None:
+            return o, o
+        observed = self._observe(o)
+        timings[2] += perf_counter() - t1
+        return o, observed
+
+    def _reference_ordinals(self, start_year, end_year):
+        """Returns the date ordinals of the holiday in start_year through end_year, before skip and observance."""
+        years = range(start_year, end_year + 1)
+        return list(map(self._reference_ordinal if self._compiled is None else self._compiled, years))
+
+    def _reference_ordinal(self, year):
+        """Returns the date ordinal of the holiday in year, before skip and observance."""
+        if self._compiled is not None:
+            return self._compiled(year)
+        if self.offset is None:
+            return date(year, self.month, self.day).toordinal()
+        dt = date(year, 1, 1)
+        for offset in self.offset if isinstance(self.offset, list) else (self.offset,):
+            dt = dt + offset
+        return dt.toordinal()
+
+    def _observe(self, ordinal):
+        """Returns the observed date ordinal for a holiday date ordinal."""
+        observance = self._observance
+        if observance is None:
+            return ordinal
+        if isinstance(observance, Observance):
+            return observance.apply_ordinal(ordinal)
+        return observance(date.fromordinal(ordinal)).toordinal()
 
     def __repr__(self):
         info = []
@@ -109,8 +388,13 @@ class RecurringHoliday(AbstractHoliday):
 class ListHoliday(AbstractHoliday):
     """
     Class for creating holidays based on a pre-defined list of dates.
+
+    Dates are stored as sorted, deduplicated arrays of date ordinals, with the observed dates computed once at
+    construction (on every query under a `CollisionObservance`), and range queries use bisection.
     """
 
+    __slots__ = ('_ordinals', '_observed')
+
     def __init__(self, name: str, dates: List[date], observance: Optional[Callable] = None):
         """
         Args:
@@ -118,56 +402,102 @@ class ListHoliday(AbstractHoliday):
             dates: List of datetime-like holidays
         """
         super(ListHoliday, self).__init__(name=name, observance=observance)
-        self._dates = dates
+        self._ordinals = array('i', sorted({dt.toordinal() for dt in dates}))
+        if observance is None:
+            self._observed = self._ordinals
+        elif isinstance(observance, Observance):
+            self._observed = array('i', sorted(observance.apply_ordinals(self._ordinals)))
+        elif isinstance(observance, CollisionObservance):
+            self._observed = None
+        else:
+            self._observed = array('i', sorted(observance(date.fromordinal(o)).toordinal() for o in self._ordinals))
 
-    def dates(self, start_date, end_date, observed: bool = False):
-        """Computes the holidays dates between start and end date, inclusive.
+    def _ordinals_between(self, start_date, end_date, observed, timings=None):
+        """Returns the date ordinals between start and end date, inclusive.
 
-        Args:
-            start_date (datetime-like): Starting date
-            end_date (datetime-like): Ending date
-            observed: Whether holidays should be adjusted to observed date, defaults to False
-
-        Returns:
-            list: List of dates
+        If observed is True, start and end date apply to the observed dates, so holidays that observance moves into
+        the range are included and holidays that it moves out of the range are not.
         """
-        if self._observance is None or not observed:
-            ref_dates = self._dates
-        else:
-            ref_dates = [self._observance(dt) for dt in self._dates if start_date <= dt <= end_date]
-
-        return [dt for dt in ref_dates if start_date <= dt <= end_date]
+        ordinals = self._observed_ordinals() if observed else self._ordinals
+        return ordinals[bisect_left(ordinals, start_date.toordinal()):bisect_right(ordinals, end_date.toordinal())]
+
+    def bounds(self):
+        """Returns the first and last actual or observed dates. For an empty list, the first date is after the last."""
+        if not self._ordinals:
+            return date.max, date.min
+        observed = self._observed_ordinals()
+        first = min(self._ordinals[0], observed[0])
+        last = max(self._ordinals[-1], observed[-1])
+        return date.fromordinal(first), date.fromordinal(last)
+
+    def _observed_ordinals(self):
+        """Returns the sorted observed date ordinals."""
+        if self._observed is not None:
+            return self._observed
+        # observed dates that avoid other holidays change with those holidays, so they are computed on every query
+        return array('i', sorted(self._observance(date.fromordinal(o)).toordinal() for o in self._ordinals))
 
     def __repr__(self):
         info = []
-        if self._dates:
-            info.append(f'number of dates={len(self._dates)}')
+        if self._ordinals:
+            info.append(f'number of dates={len(self._ordinals)}')
         if self._observance is not None:
             info.append(f'observance={self._observance.__name__}')
 
         return f'ListHoliday: {self.name} ({", ".join(info)})'
 
 
+class _BuiltIn:
+    """Class attribute for a built-in rule or list of rules that is created on first access.
+
+    On first access the value replaces the attribute in the class that defines it, so later lookups are plain class
+    attribute lookups and every access returns the same object.
+    """
+
+    # reentrant, as a list of rules accesses the rules it holds
+    _lock = RLock()
+
+    def __init__(self, factory: Callable):
+        self.factory = factory
+        self.owner = None
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.owner = owner
+        self.name = name
+
+    def __get__(self, instance, owner):
+        with self._lock:
+            value = self.owner.__dict__[self.name]
+            if value is self:
+                value = self.factory()
+                setattr(self.owner, self.name, value)
+        return value
+
+
 # New York banking holidays
 # https://www.nysenate.gov/legislation/laws/GCN/24
 class NYBankHolidays:
-    NewYearsDay = RecurringHoliday('New Year\'s Day', month=1, day=1, observance=sunday_to_monday)
-    MLKDay = RecurringHoliday('Dr. Martin Luther King, Jr. Day', offset=relativedelta(month=1, weekday=MO(3)))
+    NewYearsDay = _BuiltIn(lambda: RecurringHoliday('New Year\'s Day', month=1, day=1, observance=sunday_to_monday))
+    MLKDay = _BuiltIn(lambda: RecurringHoliday('Dr. Martin Luther King, Jr. Day',
+                                               offset=relativedelta(month=1, weekday=MO(3))))
     # LincolnsBirthday = RecurringHoliday('Lincoln\'s Birthday', month=2, day=12, observance=sunday_to_monday)
-    WashingtonsBirthday = RecurringHoliday('Washington\'s Birthday', offset=relativedelta(month=2, weekday=MO(3)))
-    MemorialDay = RecurringHoliday('Memorial Day', offset=relativedelta(month=5, weekday=MO(-1)))
+    WashingtonsBirthday = _BuiltIn(lambda: RecurringHoliday('Washington\'s Birthday',
+                                                            offset=relativedelta(month=2, weekday=MO(3))))
+    MemorialDay = _BuiltIn(lambda: RecurringHoliday('Memorial Day', offset=relativedelta(month=5, weekday=MO(-1))))
     # FlagDay = RecurringHoliday('Flag Day', offset=relativedelta(month=6, weekday=SU(2)))
-    Juneteenth = RecurringHoliday('Juneteenth', month=6, day=19, observance=sunday_to_monday,
-                                  start_date=date(2021, 6, 19))
-    IndependenceDay = RecurringHoliday('Independence Day', month=7, day=4, observance=sunday_to_monday)
-    LaborDay = RecurringHoliday('Labor Day', offset=relativedelta(month=9, weekday=MO(1)))
-    ColumbusDay = RecurringHoliday('Columbus Day', offset=relativedelta(month=10, weekday=MO(2)))
+    Juneteenth = _BuiltIn(lambda: RecurringHoliday('Juneteenth', month=6, day=19, observance=sunday_to_monday,
+                                                   start_date=date(2021, 6, 19)))
+    IndependenceDay = _BuiltIn(lambda: RecurringHoliday('Independence Day', month=7, day=4,
+                                                        observance=sunday_to_monday))
+    LaborDay = _BuiltIn(lambda: RecurringHoliday('Labor Day', offset=relativedelta(month=9, weekday=MO(1))))
+    ColumbusDay = _BuiltIn(lambda: RecurringHoliday('Columbus Day', offset=relativedelta(month=10, weekday=MO(2))))
     # https://www.nysenate.gov/legislation/laws/ELN/8-100
     # GeneralElection = RecurringHoliday('General Election Day', offset=[relativedelta(month=11, weekday=MO(1)),
     #                                                                    relativedelta(days=1)])
-    VeteransDay = RecurringHoliday('Veterans Day', month=11, day=11, observance=sunday_to_monday)
-    Thanksgiving = RecurringHoliday('Thanksgiving Day', offset=relativedelta(month=11, weekday=TH(4)))
-    ChristmasDay = RecurringHoliday('Christmas Day', month=12, day=25, observance=sunday_to_monday)
+    VeteransDay = _BuiltIn(lambda: RecurringHoliday('Veterans Day', month=11, day=11, observance=sunday_to_monday))
+    Thanksgiving = _BuiltIn(lambda: RecurringHoliday('Thanksgiving Day', offset=relativedelta(month=11, weekday=TH(4))))
+    ChristmasDay = _BuiltIn(lambda: RecurringHoliday('Christmas Day', month=12, day=25, observance=sunday_to_monday))
 
 
 # London banking holidays
@@ -181,15 +511,19 @@ class LondonBankHolidays:
     Additionally, ad hoc holidays may be added by royal proclamation.
     """
 
-    NewYearsDay = RecurringHoliday('New Year\'s Day', month=1, day=1, observance=weekend_to_monday)
-    GoodFriday = RecurringHoliday('Good Friday', offset=EasterDelta(days=-2))
-    EasterMonday = RecurringHoliday('Easter Monday', offset=EasterDelta(days=1))
-    EarlyMay = RecurringHoliday('Early May Holiday', offset=relativedelta(month=5, weekday=MO(2)),
-                                start_date=date(1978, 1, 1))
-    EarlyMayVEAnniversary = ListHoliday('Early May Holiday / VE Day Anniversary',
-                                        [date(1995, 5, 8), date(2020, 5, 8)])
-    SpringHoliday = RecurringHoliday('Spring Holiday', offset=relativedelta(month=5, weekday=MO(-1)))
-    SummerHoliday = RecurringHoliday('Summer Holiday', offset=relativedelta(month=8, weekday=MO(-1)))
-    Christmas = RecurringHoliday('Christmas', month=12, day=25, observance=sunday_to_tuesday)
-    BoxingDay = RecurringHoliday('Boxing Day', month=12, day=26, observance=weekend_to_monday)
-    Jubilees = ListHoliday('Jubilee', [date(1977, 2, 6), date(1992, 1,1), date(2002, 2, 6), date(2017, 2, 6)])
+    NewYearsDay = _BuiltIn(lambda: RecurringHoliday('New Year\'s Day', month=1, day=1, observance=weekend_to_monday))
+    GoodFriday = _BuiltIn(lambda: RecurringHoliday('Good Friday', offset=EasterDelta(days=-2)))
+    EasterMonday = _BuiltIn(lambda: RecurringHoliday('Easter Monday', offset=EasterDelta(days=1)))
+    EarlyMay = _BuiltIn(lambda: RecurringHoliday('Early May Holiday', offset=relativedelta(month=5, weekday=MO(2)),
+                                                 start_date=date(1978, 1, 1)))
+    EarlyMayVEAnniversary = _BuiltIn(lambda: ListHoliday('Early May Holiday / VE Day Anniversary',
+                                                         [date(1995, 5, 8), date(2020, 5, 8)]))
+    SpringHoliday = _BuiltIn(lambda: RecurringHoliday('Spring Holiday', offset=relativedelta(month=5, weekday=MO(-1))))
+    SummerHoliday = _BuiltIn(lambda: RecurringHoliday('Summer Holiday', offset=relativedelta(month=8, weekday=MO(-1))))
+    # a Sunday Christmas is observed on Tuesday, after Boxing Day on Monday
+    Christmas = _BuiltIn(lambda: RecurringHoliday('Christmas', month=12, day=25, observance=weekend_to_next_weekdays))
+    # observed the next weekday after Christmas, e.g. on Tuesday if Christmas is observed on Monday
+    BoxingDay = _BuiltIn(lambda: RecurringHoliday('Boxing Day', month=12, day=26,
+                                                  observance=weekend_to_monday.avoiding(LondonBankHolidays.Christmas)))
+    Jubilees = _BuiltIn(lambda: ListHoliday('Jubilee', [date(1977, 2, 6), date(1992, 1,1), date(2002, 2, 6),
+                                                        date(2017, 2, 6)]))
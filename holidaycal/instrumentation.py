@@ -0,0 +1,144 @@
+from collections import namedtuple
+from threading import Lock
+from time import perf_counter
+from typing import Callable, List, Optional
+
+RuleCall = namedtuple('RuleCall', ['rule', 'dates', 'time', 'offset_time', 'skip_time', 'observance_time',
+                                   'cache_hits', 'cache_misses'])
+RuleCall.__doc__ = """Measurements of one `dates` call of a holiday rule, times in seconds.
+
+The offset, skip and observance times are the parts of `time` spent applying the rule's offset, `skip` function and
+observance to dates that were not cached.
+"""
+
+_FIELDS = RuleCall._fields[1:]
+
+
+class RuleStats:
+    """
+    Accumulated measurements of the `dates` calls of a holiday rule.
+
+    Created by `AbstractHoliday.enable_instrumentation`. Each call is also passed to the callback as a `RuleCall`, e.g.
+    for a metrics exporter. Calls from several threads are measured separately and added under a lock. A rule can have
+    several `RuleStats`, e.g. one per calendar sharing it, and each call is added to all of them.
+    """
+
+    def __init__(self, rule: str, callback: Optional[Callable[[RuleCall], None]] = None):
+        """
+        Args:
+            rule: Name of the holiday rule
+            callback: Function called with a `RuleCall` after each `dates` call
+        """
+        self.rule = rule
+        self.callback = callback
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Sets all measurements to zero."""
+        with self._lock:
+            self.calls = 0
+            self.dates = 0
+            self.time = 0.0
+            self.offset_time = 0.0
+            self.skip_time = 0.0
+            self.observance_time = 0.0
+            self.cache_hits = 0
+            self.cache_misses = 0
+
+    def record(self, rule, dates: Callable, start_date, end_date, observed):
+        """Calls the rule's uninstrumented dates function and records the call, see `record_call`."""
+        return record_call((self,), rule, dates, start_date, end_date, observed)
+
+    def add(self, call: RuleCall):
+        """Adds the measurements of a call and passes it to the callback."""
+        with self._lock:
+            self.calls += 1
+            for field, value in zip(_FIELDS, call[1:]):
+                setattr(self, field, getattr(self, field) + value)
+        if self.callback is not None:
+            self.callback(call)
+
+    def as_dict(self) -> dict:
+        """Returns the measurements as a dictionary."""
+        return {'rule': self.rule, 'calls': self.calls, **{field: getattr(self, field) for field in _FIELDS}}
+
+    def __repr__(self):
+        return f'RuleStats: {self.rule} ({self.calls} calls, {self.dates} dates, {self.time * 1e3:.3f} ms)'
+
+
+def record_call(subscribers, rule, dates: Callable, start_date, end_date, observed):
+    """Calls a rule's uninstrumented dates function, measures the call once and adds it to each of the subscribers.
+
+    dates is called with start_date, end_date, observed and a list of the offset, skip and observance times of the
+    call, which rules that measure them add to.
+    """
+    cache_info = getattr(rule, 'cache_info', None)
+    hits, misses = cache_info()[:2] if cache_info is not None else (0, 0)
+    # per call, so concurrent calls of a shared rule do not mix their times
+    timings = [0.0, 0.0, 0.0]
+    t0 = perf_counter()
+    result = dates(start_date, end_date, observed, timings)
+    elapsed = perf_counter() - t0
+    if cache_info is not None:
+        # the cache statistics are shared, so they include concurrent calls
+        info = cache_info()
+        hits, misses = info[0] - hits, info[1] - misses
+
+    call = RuleCall(subscribers[0].rule, len(result), elapsed, timings[0], timings[1], timings[2], hits, misses)
+    for stats in subscribers:
+        stats.add(call)
+    return result
+
+
+class CalendarStats:
+    """
+    Measurements of a calendar's holiday index and of the `dates` calls of its rules.
+
+    Created by `AbstractCalendar.enable_instrumentation`. Index hits are queries answered by the existing holiday index,
+    index misses are queries that built or extended it by evaluating the rules.
+    """
+
+    def __init__(self, calendar: str, rules: List[RuleStats]):
+        """
+        Args:
+            calendar: Name of the calendar
+            rules: Stats of the calendar's rules
+        """
+        self.calendar = calendar
+        self.rules = rules
+        self._lock = Lock()
+        self.index_hits = 0
+        self.index_misses = 0
+        self.index_time = 0.0
+
+    def reset(self):
+        """Sets all measurements, including the rule measurements, to zero."""
+        with self._lock:
+            self.index_hits = 0
+            self.index_misses = 0
+            self.index_time = 0.0
+        for stats in self.rules:
+            stats.reset()
+
+    def record_index(self, hit: bool, time: float = 0.0):
+        """Records a query answered by the holiday index (hit) or one that built or extended it in time seconds."""
+        with self._lock:
+            if hit:
+                self.index_hits += 1
+            else:
+                self.index_misses += 1
+                self.index_time += time
+
+    def slowest(self, n: Optional[int] = None) -> List[RuleStats]:
+        """Returns the stats of the n rules with the most time in `dates` calls, slowest first, or all of them."""
+        return sorted(self.rules, key=lambda stats: stats.time, reverse=True)[:n]
+
+    def as_dict(self) -> dict:
+        """Returns the measurements as a dictionary."""
+        return {'calendar': self.calendar, 'index_hits': self.index_hits, 'index_misses': self.index_misses,
+                'index_time': self.index_time, 'rules': [stats.as_dict() for stats in self.rules]}
+
+    def __repr__(self):
+        return f'CalendarStats: {self.calendar} ({self.index_hits} index hits, {self.index_misses} index misses, ' \
+               f'{len(self.rules)} rules)'
@@ -1,63 +1,159 @@
-from datetime import datetime
-from dateutil.relativedelta import relativedelta
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional, Sequence
 
+# days past its observed date that a holiday can be moved to avoid the observed dates of other holidays
+_MAX_COLLISION_DAYS = 31
 
-def weekend_to_monday(dt: datetime) -> datetime:
-    """
-    If date falls on a Saturday or Sunday, return the following Monday.
-    """
-    if dt.weekday() == 5:
-        return dt + relativedelta(days=2)
-    if dt.weekday() == 6:
-        return dt + relativedelta(days=1)
-    return dt
 
+class Observance:
+    """Observance rule defined by a table of day shifts for each weekday.
 
-def weekend_to_friday(dt: datetime) -> datetime:
-    """
-    If date falls on a Saturday or Sunday, return the previous Friday.
+    Calling an `Observance` with a holiday date returns the observed date, like the functions it replaces. Because the
+    rule only depends on the weekday, the table can also be applied directly to date ordinals or to numpy
+    `datetime64[D]` arrays. Rules can be chained with `then`, and a chain of tables collapses into a single table.
+    Collisions with other holidays, such as Boxing Day and Christmas observed on the same Monday, are handled by
+    `avoiding`.
     """
-    if dt.weekday() == 5:
-        return dt - relativedelta(days=1)
-    if dt.weekday() == 6:
-        return dt - relativedelta(days=2)
-    return dt
 
+    def __init__(self, name: str, shifts: Sequence[int], doc: Optional[str] = None):
+        """
+        Args:
+            name: Name of the rule, used in holiday descriptions
+            shifts: Days added to dates falling on each weekday, Monday through Sunday
+            doc: Description of the rule
+        """
+        shifts = tuple(int(s) for s in shifts)
+        if len(shifts) != 7:
+            raise ValueError('Observance must have seven shifts, Monday through Sunday')
+        self.__name__ = name
+        self.__doc__ = doc
+        self.shifts = shifts
+
+    def __call__(self, dt: datetime) -> datetime:
+        shift = self.shifts[dt.weekday()]
+        if shift:
+            return dt + timedelta(days=shift)
+        return dt
+
+    def apply_ordinal(self, ordinal: int) -> int:
+        """Returns the observed date ordinal for a holiday date ordinal."""
+        # date.fromordinal(1) is a Monday
+        return ordinal + self.shifts[(ordinal - 1) % 7]
+
+    def apply_ordinals(self, ordinals: Iterable[int]) -> List[int]:
+        """Returns the observed date ordinals for holiday date ordinals."""
+        shifts = self.shifts
+        return [o + shifts[(o - 1) % 7] for o in ordinals]
+
+    def apply_array(self, dates):
+        """Returns the observed dates for a numpy array of holiday dates, as `datetime64[D]`. Requires numpy."""
+        import numpy as np
+        days = np.asarray(dates, dtype='datetime64[D]')
+        # 1970-01-01 is a Thursday
+        weekdays = (days.astype(np.int64) + 3) % 7
+        return days + np.array(self.shifts, dtype=np.int64)[weekdays]
+
+    def then(self, other: 'Observance', name: Optional[str] = None) -> 'Observance':
+        """Chains another observance rule, applied to the dates observed under this rule.
+
+        Args:
+            other: Rule applied second
+            name: Name of the chained rule, defaults to '<this rule>_then_<other rule>'
+
+        Returns:
+            Observance: Chained rule
+        """
+        shifts = [s + other.shifts[(weekday + s) % 7] for weekday, s in enumerate(self.shifts)]
+        if name is None:
+            name = f'{self.__name__}_then_{other.__name__}'
+        return Observance(name, shifts, f'{self.__name__}, then {other.__name__}.')
+
+    def avoiding(self, *holidays, name: Optional[str] = None) -> 'CollisionObservance':
+        """Returns a rule that also moves the holiday past the observed dates of other holidays.
+
+        Args:
+            holidays (AbstractHoliday): Holidays whose observed dates are avoided, e.g. the earlier rules of a calendar
+            name: Name of the rule, defaults to '<this rule>_avoiding_collisions'
+
+        Returns:
+            CollisionObservance: Rule for the holiday
+        """
+        return CollisionObservance(self, holidays, name)
+
+    def __eq__(self, other):
+        if not isinstance(other, Observance):
+            return NotImplemented
+        return self.shifts == other.shifts
+
+    def __hash__(self):
+        return hash(self.shifts)
+
+    def __repr__(self):
+        return f'Observance({self.__name__}, shifts={self.shifts})'
+
+
+class CollisionObservance:
+    """Observance rule that moves a holiday past the observed dates of other holidays.
 
-def nearest_weekday(dt: datetime) -> datetime:
+    The holiday is observed under an observance rule, and if another holiday is observed on the same date, it moves to
+    the next date that is free and that the rule leaves in place. For example, with `weekend_to_monday`, Boxing Day
+    on a Sunday after Christmas on a Saturday is observed on Tuesday. The other holidays must not avoid this one in
+    turn. As the observed date depends on other holidays, the rule has no weekday table.
     """
+
+    def __init__(self, observance: Callable, holidays: Sequence, name: Optional[str] = None):
+        """
+        Args:
+            observance: Observance rule applied first
+            holidays (list of AbstractHoliday): Holidays whose observed dates are avoided
+            name: Name of the rule, defaults to '<observance>_avoiding_collisions'
+        """
+        self.observance = observance
+        self.holidays = tuple(holidays)
+        self.__name__ = f'{observance.__name__}_avoiding_collisions' if name is None else name
+
+    def __call__(self, dt: datetime) -> datetime:
+        observed = self.observance(dt)
+        last = observed + timedelta(days=_MAX_COLLISION_DAYS)
+        taken = {d for holiday in self.holidays for d in holiday.dates(observed, last, True)}
+        if observed not in taken:
+            return observed
+        for days in range(1, _MAX_COLLISION_DAYS + 1):
+            candidate = observed + timedelta(days=days)
+            if candidate not in taken and self.observance(candidate) == candidate:
+                return candidate
+        raise ValueError(f'No date within {_MAX_COLLISION_DAYS} days of {observed} is free for {self.__name__}')
+
+    def __repr__(self):
+        return f'CollisionObservance({self.__name__}, holidays={[h.name for h in self.holidays]})'
+
+
+weekend_to_monday = Observance('weekend_to_monday', (0, 0, 0, 0, 0, 2, 1), """
+    If date falls on a Saturday or Sunday, return the following Monday.
+    """)
+
+weekend_to_friday = Observance('weekend_to_friday', (0, 0, 0, 0, 0, -1, -2), """
+    If date falls on a Saturday or Sunday, return the previous Friday.
+    """)
+
+nearest_weekday = Observance('nearest_weekday', (0, 0, 0, 0, 0, -1, 1), """
     If date falls on a Saturday, return previous Friday.
     If date falls on a Sunday, return following Monday.
-    """
-    if dt.weekday() == 5:
-        return dt - relativedelta(days=1)
-    if dt.weekday() == 6:
-        return dt + relativedelta(days=1)
-    return dt
+    """)
 
-
-def sunday_to_monday(dt: datetime) -> datetime:
-    """
+sunday_to_monday = Observance('sunday_to_monday', (0, 0, 0, 0, 0, 0, 1), """
     If date falls on a Sunday, return following Monday
-    """
-    if dt.weekday() == 6:
-        return dt + relativedelta(days=1)
-    return dt
+    """)
 
-
-def saturday_to_friday(dt: datetime) -> datetime:
-    """
+saturday_to_friday = Observance('saturday_to_friday', (0, 0, 0, 0, 0, -1, 0), """
     If date falls on a Saturday, return previous Friday
-    """
-    if dt.weekday() == 5:
-        return dt - relativedelta(days=1)
-    return dt
-
+    """)
 
-def sunday_to_tuesday(dt: datetime) -> datetime:
-    """
+sunday_to_tuesday = Observance('sunday_to_tuesday', (0, 0, 0, 0, 0, 0, 2), """
     If date falls on a Sunday, return following Tuesday (e.g. UK Boxing day)
-    """
-    if dt.weekday() == 6:
-        return dt + relativedelta(days=2)
-    return dt
+    """)
+
+weekend_to_next_weekdays = Observance('weekend_to_next_weekdays', (0, 0, 0, 0, 0, 2, 2), """
+    If date falls on a Saturday, return following Monday.
+    If date falls on a Sunday, return following Tuesday (e.g. UK Christmas day, when Boxing day is on the Monday)
+    """)
@@ -0,0 +1,81 @@
+from threading import Lock
+from typing import Dict, List, Type, Union
+
+from holidaycal.calendar import AbstractCalendar, LondonBankHolidayCalendar, NYBankHolidayCalendar
+
+# calendar classes or instances by registered name
+_registered: Dict[str, Union[Type[AbstractCalendar], AbstractCalendar]] = {
+    'NYBankHolidayCalendar': NYBankHolidayCalendar,
+    'LondonBankHolidayCalendar': LondonBankHolidayCalendar,
+}
+# shared instances by name or class, read without locking
+_instances: Dict[Union[str, Type[AbstractCalendar]], AbstractCalendar] = {}
+_lock = Lock()
+
+
+def get_calendar(key: Union[str, Type[AbstractCalendar]]) -> AbstractCalendar:
+    """Returns the process-wide shared instance of a calendar.
+
+    Shared instances are created once, on first use, and can be used from any number of threads: queries read the
+    holiday index without locking and extending it to new years is done once, under the calendar's lock. Looking up
+    the same calendar by name or by class gives the same instance.
+
+    Args:
+        key: Registered name (the built-in calendars are registered under their class names) or calendar class
+
+    Returns:
+        AbstractCalendar: Shared calendar
+    """
+    calendar = _instances.get(key)
+    if calendar is not None:
+        return calendar
+    with _lock:
+        calendar = _instances.get(key)
+        if calendar is None:
+            if isinstance(key, str):
+                if key not in _registered:
+                    raise KeyError(f'No calendar is registered as {key!r}')
+                target = _registered[key]
+            elif isinstance(key, type) and issubclass(key, AbstractCalendar):
+                target = key
+            else:
+                raise TypeError(f'Calendar key must be a name or a calendar class, not {key!r}')
+
+            if isinstance(target, AbstractCalendar):
+                calendar = target
+            else:
+                calendar = _instances.get(target)
+                if calendar is None:
+                    calendar = _instances[target] = target()
+            _instances[key] = calendar
+    return calendar
+
+
+def register_calendar(calendar: Union[Type[AbstractCalendar], AbstractCalendar], name: str = None):
+    """Registers a calendar class, created on first use, or a calendar instance to share under a name.
+
+    Args:
+        calendar: Calendar class or instance
+        name: Name to register, defaults to the class name or the calendar's name
+    """
+    if isinstance(calendar, AbstractCalendar):
+        name = calendar.name if name is None else name
+    elif isinstance(calendar, type) and issubclass(calendar, AbstractCalendar):
+        name = calendar.__name__ if name is None else name
+    else:
+        raise TypeError(f'Expected a calendar class or instance, not {calendar!r}')
+    with _lock:
+        _registered[name] = calendar
+        _instances.pop(name, None)
+
+
+def unregister_calendar(name: str):
+    """Removes a registered name and its shared instance. Instances already handed out keep working."""
+    with _lock:
+        del _registered[name]
+        _instances.pop(name, None)
+
+
+def registered_calendars() -> List[str]:
+    """Returns the registered calendar names."""
+    return list(_registered)
@@ -0,0 +1,154 @@
+from array import array
+from calendar import monthrange
+from datetime import date
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from holidaycal.calendar import EPOCH_ORDINAL, AbstractCalendar, ROLL_CONVENTIONS
+
+FREQUENCIES = {'monthly': 1, 'quarterly': 3, 'semiannual': 6, 'annual': 12}
+STUBS = ('short_front', 'long_front', 'short_back', 'long_back')
+
+
+class Schedules:
+    """
+    Payment schedules of a batch of loans, stored in compact arrays.
+
+    The dates of all schedules are concatenated into `unadjusted` and `adjusted` arrays of date ordinals, and
+    schedule i is `offsets[i]:offsets[i + 1]` of them. Each schedule starts with the start date and ends with the end
+    date of its loan.
+    """
+
+    def __init__(self, offsets: Sequence[int], unadjusted: Sequence[int], adjusted: Sequence[int]):
+        """
+        Args:
+            offsets: Start of each schedule in the date arrays, followed by the total number of dates
+            unadjusted: Unadjusted date ordinals
+            adjusted: Date ordinals adjusted to business days
+        """
+        self.offsets = offsets
+        self.unadjusted = unadjusted
+        self.adjusted = adjusted
+
+    def ordinals(self, i: int, adjusted: bool = True) -> Sequence[int]:
+        """Returns the date ordinals of schedule i."""
+        ordinals = self.adjusted if adjusted else self.unadjusted
+        return ordinals[self.offsets[i]:self.offsets[i + 1]]
+
+    def dates(self, i: int, adjusted: bool = True) -> List[date]:
+        """Returns the dates of schedule i."""
+        return [date.fromordinal(o) for o in self.ordinals(i, adjusted)]
+
+    def to_numpy(self, adjusted: bool = True):
+        """Returns the offsets as an int64 array and the dates as a `datetime64[D]` array. Requires numpy."""
+        import numpy as np
+        ordinals = np.frombuffer(self.adjusted if adjusted else self.unadjusted, dtype=np.int32)
+        days = ordinals.astype(np.int64) - EPOCH_ORDINAL
+        return np.asarray(self.offsets, dtype=np.int64), days.astype('datetime64[D]')
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError('schedule index out of range')
+        return self.dates(i % len(self))
+
+    def __iter__(self) -> Iterator[List[date]]:
+        return (self.dates(i) for i in range(len(self)))
+
+    def __repr__(self):
+        return f'Schedules: {len(self)} schedules, {len(self.adjusted)} dates'
+
+
+def generate_schedules(calendar: Optional[AbstractCalendar], start_dates: Sequence[date], end_dates: Sequence[date],
+                       frequency: Union[str, int], stub: str = 'short_front',
+                       roll: Optional[str] = 'modified_following', eom: bool = False) -> Schedules:
+    """Generates the payment schedules of a batch of loans.
+
+    Regular dates are generated from the end date backwards for front stubs and from the start date forwards for back
+    stubs. A short stub is the remaining period shorter than the frequency, a long stub combines it with the adjacent
+    regular period. Identical loans share their generated dates, and each distinct date is adjusted once.
+
+    Args:
+        calendar: Calendar of business days, can be None if roll is None
+        start_dates: Start date of each loan
+        end_dates: End (maturity) date of each loan
+        frequency: Months between payments, or one of 'monthly', 'quarterly', 'semiannual' and 'annual'
+        stub: 'short_front' (default), 'long_front', 'short_back' or 'long_back'
+        roll: Roll convention used to adjust dates to business days (see `AbstractCalendar.roll`), or None to
+            leave them unadjusted. Defaults to 'modified_following'
+        eom: If True and the date regular dates are generated from is the last day of its month, regular dates are
+            the last day of their months
+
+    Returns:
+        Schedules: Unadjusted and adjusted schedules
+    """
+    months = FREQUENCIES.get(frequency, frequency)
+    if not isinstance(months, int) or months < 1:
+        raise ValueError(f'Unknown frequency {frequency!r}, expected a number of months or one of '
+                         f'{tuple(FREQUENCIES)}')
+    if stub not in STUBS:
+        raise ValueError(f'Unknown stub {stub!r}, expected one of {STUBS}')
+    if roll is not None and roll not in ROLL_CONVENTIONS:
+        raise ValueError(f'Unknown roll convention {roll!r}, expected one of {ROLL_CONVENTIONS}')
+    if len(start_dates) != len(end_dates):
+        raise ValueError('start_dates and end_dates must have the same length')
+
+    front, long = stub.endswith('front'), stub.startswith('long')
+    offsets, unadjusted = array('i', [0]), array('i')
+    generated = {}
+    for start, end in zip(start_dates, end_dates):
+        key = (start, end)
+        ordinals = generated.get(key)
+        if ordinals is None:
+            ordinals = generated[key] = _schedule(start, end, months, front, long, eom)
+        unadjusted.extend(ordinals)
+        offsets.append(len(unadjusted))
+
+    if roll is None:
+        return Schedules(offsets, unadjusted, unadjusted)
+    rolled = {o: calendar._roll(o, roll) for o in set(unadjusted)}
+    return Schedules(offsets, unadjusted, array('i', [rolled[o] for o in unadjusted]))
+
+
+def generate_schedule(calendar: Optional[AbstractCalendar], start_date: date, end_date: date,
+                      frequency: Union[str, int], stub: str = 'short_front', roll: Optional[str] = 'modified_following',
+                      eom: bool = False) -> Tuple[List[date], List[date]]:
+    """Generates the payment schedule of one loan, see `generate_schedules`.
+
+    Returns:
+        tuple: Unadjusted dates and adjusted dates
+    """
+    schedules = generate_schedules(calendar, [start_date], [end_date], frequency, stub, roll, eom)
+    return schedules.dates(0, adjusted=False), schedules.dates(0)
+
+
+def _schedule(start, end, months, front, long, eom):
+    """Returns the unadjusted date ordinals of a schedule, including the start and end dates."""
+    first, last = start.toordinal(), end.toordinal()
+    if last <= first:
+        raise ValueError(f'End date {end} must be after start date {start}')
+
+    anchor = end if front else start
+    step = -months if front else months
+    year, month, day = anchor.year, anchor.month, anchor.day
+    eom = eom and day == monthrange(year, month)[1]
+    index = year * 12 + month - 1
+
+    regular = []
+    while True:
+        index += step
+        y, m = divmod(index, 12)
+        m += 1
+        dim = monthrange(y, m)[1]
+        o = date(y, m, dim if eom or day > dim else day).toordinal()
+        if not first < o < last:
+            break
+        regular.append(o)
+
+    # o is the first date past the other end of the loan, which leaves a stub unless it is that date
+    if long and regular and o != (first if front else last):
+        regular.pop()
+    if front:
+        regular.reverse()
+    return [first] + regular + [last]
@@ -0,0 +1,98 @@
+from typing import Optional
+
+from holidaycal.snapshot import CalendarSnapshot, compile_snapshot
+
+
+def _shared_memory():
+    """Imports `multiprocessing.shared_memory`, which is new in Python 3.8."""
+    try:
+        from multiprocessing import shared_memory
+    except ImportError:
+        raise ImportError('Shared calendars require multiprocessing.shared_memory (Python 3.8 or later)') from None
+    return shared_memory
+
+
+class SharedCalendar(CalendarSnapshot):
+    """
+    Calendar snapshot in a `multiprocessing.shared_memory` block.
+
+    Created in a parent process by `publish_calendar` and opened in worker processes by `attach_calendar`. Queries read
+    the shared block in place, so its memory is used once per host however many processes attach it. The process that
+    published the calendar should `unlink` it when the workers are done, or use it as a context manager.
+    """
+
+    def __init__(self, shm, owner: bool = False):
+        """
+        Args:
+            shm (multiprocessing.shared_memory.SharedMemory): Shared memory block with a calendar snapshot
+            owner: True if this process created the block and removes it on exit
+        """
+        self._shm = shm
+        self.owner = owner
+        super(SharedCalendar, self).__init__(shm.buf, name=shm.name)
+
+    def close(self):
+        """Closes this process's access to the shared block."""
+        super(SharedCalendar, self).close()
+        self._shm.close()
+
+    def unlink(self):
+        """Removes the shared block, call once from the publishing process."""
+        self._shm.unlink()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        if self.owner:
+            self.unlink()
+
+    def __reduce__(self):
+        # pickles as the block name, e.g. as an initializer argument, and attaches on unpickling
+        return attach_calendar, (self.name,)
+
+    def __repr__(self):
+        return f'SharedCalendar: {self.name} ({self.start_year}-{self.end_year}, {len(self)} entries)'
+
+
+def publish_calendar(calendar, start_year: int, end_year: int, name: Optional[str] = None) -> SharedCalendar:
+    """Compiles a calendar's holidays and business-day counts into a new shared memory block.
+
+    Args:
+        calendar (AbstractCalendar): Calendar to publish
+        start_year (int): First year
+        end_year (int): Last year
+        name (str, optional): Name of the block, defaults to a random name
+
+    Returns:
+        SharedCalendar: Shared calendar owning the block, pass its `name` to `attach_calendar` in workers
+    """
+    data = compile_snapshot(calendar, start_year, end_year)
+    shm = _shared_memory().SharedMemory(name=name, create=True, size=len(data))
+    try:
+        shm.buf[:len(data)] = data
+        return SharedCalendar(shm, owner=True)
+    except Exception:
+        shm.close()
+        shm.unlink()
+        raise
+
+
+def attach_calendar(name: str) -> SharedCalendar:
+    """Attaches a calendar published by `publish_calendar`, without copying its data.
+
+    Args:
+        name: Name of the shared block
+
+    Returns:
+        SharedCalendar: Read-only shared calendar, close it when done
+    """
+    shared_memory = _shared_memory()
+    try:
+        # attaching processes must not remove the block when they exit (Python 3.13+)
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+    try:
+        return SharedCalendar(shm)
+    except Exception:
+        shm.close()
+        raise
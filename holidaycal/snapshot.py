@@ -0,0 +1,346 @@
+import hashlib
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from datetime import date, timedelta
+from typing import List, Optional
+
+from holidaycal.calendar import _BusinessDays, _roll_ordinal
+
+# Snapshots hold the actual and observed holidays of a calendar over a range of years. They are memory-mapped and
+# queried in place, so processes that load the same snapshot file share its pages in the page cache.
+#
+# Format (little-endian), version 2:
+#   header      magic, version, flags (unused), start year, end year, entry count, names size, weekmask bits and the
+#               SHA-256 digest of the names and entries
+#   names       rule names, UTF-8, separated by null bytes and padded to a multiple of 4 bytes
+#   ordinals    int32 date ordinal of each entry, sorted
+#   rule ids    uint16 position of each entry's rule in the names
+#   flags       uint8 per entry, ACTUAL and/or OBSERVED, padded to a multiple of 4 bytes
+#   counts      int32 number of business days before each day of the years, plus the total (version 2)
+# Version 1 snapshots end after the flags, their business-day counts are computed when they are loaded.
+MAGIC = b'HCSN'
+VERSION = 2
+ACTUAL = 1
+OBSERVED = 2
+
+_HEADER = struct.Struct('<4sHHHHIIB3x32s')
+
+
+def _pad(size: int) -> int:
+    return -size % 4
+
+
+def _entries(calendar, start_year: int, end_year: int):
+    """Returns the sorted (ordinal, rule id, flags) entries of a calendar over start_year through end_year."""
+    positions = {id(rule): i for i, rule in enumerate(calendar.rules)}
+    start, end = date(start_year, 1, 1), date(end_year, 12, 31)
+    counts = []
+    for observed in (False, True):
+        ordinals, rules = calendar._index_slice(start, end, observed)
+        counts.append(Counter((o, positions[id(r)]) for o, r in zip(ordinals, rules)))
+    actual, observed = counts
+
+    entries = []
+    for key in actual.keys() | observed.keys():
+        # a date that is both actual and observed is stored once, duplicate dates keep their multiplicity
+        both = min(actual[key], observed[key])
+        entries.extend([key + (ACTUAL | OBSERVED,)] * both)
+        entries.extend([key + (ACTUAL,)] * (actual[key] - both))
+        entries.extend([key + (OBSERVED,)] * (observed[key] - both))
+    entries.sort()
+    return entries
+
+
+def _payload(calendar, start_year: int, end_year: int):
+    """Returns the names and entry sections of a snapshot."""
+    names = '\0'.join(rule.name for rule in calendar.rules).encode('utf-8')
+    names += b'\0' * _pad(len(names))
+    entries = _entries(calendar, start_year, end_year)
+    ordinals = array('i', [e[0] for e in entries])
+    rule_ids = array('H', [e[1] for e in entries])
+    flags = array('B', [e[2] for e in entries])
+    if sys.byteorder != 'little':
+        ordinals.byteswap()
+        rule_ids.byteswap()
+    sections = ordinals.tobytes() + rule_ids.tobytes() + flags.tobytes()
+    return names, len(entries), sections
+
+
+def _business_day_counts(calendar, start_year: int, end_year: int) -> array:
+    """Returns the number of business days before each day from start_year through end_year, plus the total."""
+    bdays = calendar._business_day_index(start_year, end_year)
+    counts = array('i')
+    for block, prefix in zip(bdays.blocks, bdays.prefix):
+        counts.extend([c + prefix for c in block[:-1]])
+    counts.append(bdays.total)
+    origin = date(start_year, 1, 1).toordinal() - bdays.starts[0]
+    days = date(end_year, 12, 31).toordinal() - date(start_year, 1, 1).toordinal() + 1
+    counts = counts[origin:origin + days + 1]
+    base = counts[0]
+    return array('i', [c - base for c in counts])
+
+
+def compile_snapshot(calendar, start_year: int, end_year: int) -> bytes:
+    """Compiles the holidays of a calendar from start_year through end_year into snapshot bytes.
+
+    Args:
+        calendar (AbstractCalendar): Calendar to compile
+        start_year (int): First year
+        end_year (int): Last year
+
+    Returns:
+        bytes: Snapshot
+    """
+    if len(calendar.rules) > 0xFFFF:
+        raise ValueError('Snapshots support at most 65535 holiday rules')
+    names, count, sections = _payload(calendar, start_year, end_year)
+    digest = hashlib.sha256(names + sections).digest()
+    weekmask = sum(1 << i for i, d in enumerate(calendar.weekmask) if d)
+    header = _HEADER.pack(MAGIC, VERSION, 0, start_year, end_year, count, len(names), weekmask, digest)
+    counts = _business_day_counts(calendar, start_year, end_year)
+    if sys.byteorder != 'little':
+        counts.byteswap()
+    return header + names + sections + b'\0' * _pad(len(sections)) + counts.tobytes()
+
+
+def save_snapshot(calendar, path, start_year: int, end_year: int):
+    """Compiles the holidays of a calendar from start_year through end_year and writes them to a snapshot file."""
+    data = compile_snapshot(calendar, start_year, end_year)
+    with open(path, 'wb') as file:
+        file.write(data)
+
+
+def load_snapshot(path) -> 'CalendarSnapshot':
+    """Memory-maps a snapshot file.
+
+    Args:
+        path: Snapshot file path
+
+    Returns:
+        CalendarSnapshot: Read-only snapshot, close it to release the mapping
+    """
+    with open(path, 'rb') as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        return CalendarSnapshot(mapped, name=str(path))
+    except Exception:
+        mapped.close()
+        raise
+
+
+class CalendarSnapshot:
+    """
+    Read-only view of a compiled calendar snapshot.
+
+    Answers holiday queries directly from the snapshot buffer. Queries must be within the snapshot's years. Snapshots
+    hold holiday names rather than rules, so they have no `holiday_rules` and `holidays_between` returns names.
+    """
+
+    def __init__(self, buffer, name: Optional[str] = None):
+        """
+        Args:
+            buffer: Object supporting the buffer protocol with the snapshot bytes, e.g. `bytes` or `mmap`
+            name: Name of the snapshot, defaults to 'CalendarSnapshot'
+        """
+        self._buffer = buffer
+        self._view = view = memoryview(buffer)
+        if len(view) < _HEADER.size:
+            raise ValueError('Buffer is too small to be a calendar snapshot')
+        magic, version, _, start_year, end_year, count, names_size, weekmask, digest = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError('Buffer is not a calendar snapshot')
+        if version not in (1, VERSION):
+            raise ValueError(f'Unsupported snapshot version {version}')
+
+        self.name = 'CalendarSnapshot' if name is None else name
+        self.version = version
+        self.start_year = start_year
+        self.end_year = end_year
+        self.weekmask = tuple(bool(weekmask >> i & 1) for i in range(7))
+        self.digest = digest
+
+        offset = _HEADER.size
+        names = bytes(view[offset:offset + names_size]).rstrip(b'\0')
+        self._names = [n.decode('utf-8') for n in names.split(b'\0')] if names else []
+        offset += names_size
+        if len(view) < offset + count * 7:
+            raise ValueError('Calendar snapshot is truncated')
+        self._ordinals = self._section(view, offset, count, 'i')
+        self._rule_ids = self._section(view, offset + count * 4, count, 'H')
+        self._flags = view[offset + count * 6:offset + count * 7]
+        self._start = date(start_year, 1, 1).toordinal()
+        self._end = date(end_year, 12, 31).toordinal()
+
+        days = self._end - self._start + 1
+        offset += count * 7 + _pad(count * 7)
+        if version == 1:
+            self._counts = self._compute_counts()
+        elif len(view) < offset + (days + 1) * 4:
+            raise ValueError('Calendar snapshot is truncated')
+        else:
+            self._counts = self._section(view, offset, days + 1, 'i')
+        # one block of counts, queried like the business-day counts of a calendar
+        self._business_days = _BusinessDays(start_year, end_year, [self._start], [self._counts])
+
+    @staticmethod
+    def _section(view, offset, count, typecode):
+        size = array(typecode).itemsize
+        section = view[offset:offset + count * size]
+        if sys.byteorder == 'little':
+            return section.cast(typecode)
+        values = array(typecode, section)
+        values.byteswap()
+        return values
+
+    def holidays(self, start_date, end_date, names=False, observed=False, as_ordinals=False):
+        """Returns the holidays between start_date and end_date, inclusive, like `AbstractCalendar.holidays`."""
+        lo, hi = self._bounds(start_date, end_date)
+        flag = OBSERVED if observed else ACTUAL
+        flags, ordinals = self._flags, self._ordinals
+        if names is False:
+            selected = [ordinals[i] for i in range(lo, hi) if flags[i] & flag]
+            return array('i', selected) if as_ordinals else list(map(date.fromordinal, selected))
+        convert = int if as_ordinals else date.fromordinal
+        return [(self._names[self._rule_ids[i]], convert(ordinals[i])) for i in range(lo, hi) if flags[i] & flag]
+
+    def holidays_between(self, start_date, end_date, observed=False):
+        """Returns the holidays between start_date and end_date, inclusive, with their holiday names.
+
+        Like `AbstractCalendar.holidays_between`, except that snapshots hold rule names rather than rules.
+
+        Returns:
+            list: List of (date, holiday name), in ascending date order
+        """
+        return [(dt, name) for name, dt in self.holidays(start_date, end_date, names=True, observed=observed)]
+
+    def iter_holidays(self, start_date, direction='forward', observed=False, names=False):
+        """Lazily iterates over the holidays from start_date, like `AbstractCalendar.iter_holidays`.
+
+        Iteration stops at the end (or start, backward) of the snapshot years, which start_date must be within.
+        """
+        if direction not in ('forward', 'backward'):
+            raise ValueError(f"Unknown direction {direction!r}, expected 'forward' or 'backward'")
+        lo, hi = self._bounds(start_date, start_date)
+        flag = OBSERVED if observed else ACTUAL
+        positions = range(lo, len(self._ordinals)) if direction == 'forward' else range(hi - 1, -1, -1)
+        entries = (i for i in positions if self._flags[i] & flag)
+        if names is False:
+            return (date.fromordinal(self._ordinals[i]) for i in entries)
+        return ((self._names[self._rule_ids[i]], date.fromordinal(self._ordinals[i])) for i in entries)
+
+    def next_holiday(self, dt, observed=False):
+        """Returns the first holiday after dt, like `AbstractCalendar.next_holiday`.
+
+        Raises ValueError if there is no later holiday within the snapshot years, as later years are unknown.
+        """
+        holiday = next(self.iter_holidays(dt + timedelta(days=1), 'forward', observed), None) \
+            if dt.toordinal() < self._end else None
+        if holiday is None:
+            raise ValueError(f'No holiday after {dt} within the snapshot years {self.start_year}-{self.end_year}')
+        return holiday
+
+    def previous_holiday(self, dt, observed=False):
+        """Returns the last holiday before dt, like `AbstractCalendar.previous_holiday`.
+
+        Raises ValueError if there is no earlier holiday within the snapshot years, as earlier years are unknown.
+        """
+        holiday = next(self.iter_holidays(dt - timedelta(days=1), 'backward', observed), None) \
+            if dt.toordinal() > self._start else None
+        if holiday is None:
+            raise ValueError(f'No holiday before {dt} within the snapshot years {self.start_year}-{self.end_year}')
+        return holiday
+
+    def holiday_name(self, dt, observed=False) -> Optional[str]:
+        """Returns the name of the holiday on dt, or None, like `AbstractCalendar.holiday_name`."""
+        names = [name for name, _ in self.holidays(dt, dt, names=True, observed=observed)]
+        return ' / '.join(names) if names else None
+
+    def is_holiday(self, dt, observed=False) -> bool:
+        """Returns True if dt is a holiday."""
+        lo, hi = self._bounds(dt, dt)
+        flag = OBSERVED if observed else ACTUAL
+        return any(self._flags[i] & flag for i in range(lo, hi))
+
+    def is_business_day(self, dt) -> bool:
+        """Returns True if dt falls on a weekmask business day and is not an observed holiday."""
+        return self.weekmask[dt.weekday()] and not self.is_holiday(dt, observed=True)
+
+    def roll(self, dt, convention='following'):
+        """Adjusts dt to a business day, like `AbstractCalendar.roll`."""
+        return date.fromordinal(self._roll(dt.toordinal(), convention))
+
+    def add_business_days(self, dt, n, roll='following'):
+        """Returns the date n business days after dt, like `AbstractCalendar.add_business_days`."""
+        return date.fromordinal(self._step(self._roll(dt.toordinal(), roll), n))
+
+    def business_days_between(self, start_date, end_date) -> int:
+        """Counts the business days from start_date, inclusive, to end_date, exclusive, like
+        `AbstractCalendar.business_days_between`."""
+        start, end = start_date.toordinal(), end_date.toordinal()
+        if end < start:
+            return -(self._count_before(start + 1) - self._count_before(end + 1))
+        return self._count_before(end) - self._count_before(start)
+
+    def holiday_names(self) -> List[str]:
+        """Returns the names of the holiday rules in the snapshot."""
+        return list(self._names)
+
+    def matches(self, calendar) -> bool:
+        """Returns True if the snapshot matches the holidays that calendar's current rules give over its years."""
+        names, _, sections = _payload(calendar, self.start_year, self.end_year)
+        weekmask = tuple(bool(d) for d in calendar.weekmask)
+        return weekmask == self.weekmask and hashlib.sha256(names + sections).digest() == self.digest
+
+    def close(self):
+        """Releases the snapshot buffer, closing it if it is a memory map."""
+        for view in (self._ordinals, self._rule_ids, self._flags, self._counts, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._ordinals)
+
+    def __repr__(self):
+        return f'CalendarSnapshot: {self.name} ({self.start_year}-{self.end_year}, {len(self)} entries)'
+
+    def _bounds(self, start_date, end_date):
+        start, end = start_date.toordinal(), end_date.toordinal()
+        if start <= end and (start < self._start or end > self._end):
+            raise ValueError(f'Dates must be within the snapshot years {self.start_year}-{self.end_year}')
+        return bisect_left(self._ordinals, start), bisect_right(self._ordinals, end)
+
+    def _compute_counts(self):
+        """Returns the business-day counts of a version 1 snapshot, which does not store them."""
+        holidays = {self._ordinals[i] for i in range(len(self._ordinals)) if self._flags[i] & OBSERVED}
+        counts, total = array('i', [0]), 0
+        for o in range(self._start, self._end + 1):
+            total += self.weekmask[(o - 1) % 7] and o not in holidays
+            counts.append(total)
+        return counts
+
+    def _count_before(self, ordinal):
+        if not self._start <= ordinal <= self._end + 1:
+            raise ValueError(f'Dates must be within the snapshot years {self.start_year}-{self.end_year}')
+        return self._business_days.count_before(ordinal)
+
+    def _roll(self, ordinal, convention):
+        return _roll_ordinal(self._step, ordinal, convention)
+
+    def _step(self, ordinal, n):
+        """Returns the n-th business day counted from the first business day on or after ordinal."""
+        k = self._count_before(ordinal) + n
+        if not 0 <= k < self._business_days.total:
+            raise ValueError(f'Result is outside of the snapshot years {self.start_year}-{self.end_year}')
+        return self._business_days.nth(k)
@@ -30,3 +30,18 @@ def test_london_bank_holidays(london_bank_holidays):
     holidays = LondonBankHolidayCalendar().holidays(date(2000, 1, 1), date(2021, 12, 31), observed=True)
     observed_holidays = [h for h in holidays if h.weekday() < 5]
     assert observed_holidays.sort() == london_bank_holidays.sort()
+
+
+def test_london_christmas_and_boxing_day(london_bank_holidays):
+    # Christmas and Boxing Day falling on a weekend are observed on the next two weekdays
+    holidays = LondonBankHolidayCalendar().holidays(date(2000, 1, 1), date(2021, 12, 31), observed=True)
+    assert [h for h in holidays if h.month == 12] == sorted(h for h in london_bank_holidays if h.month == 12)
+
+    # a Saturday Christmas is observed on Monday, a Sunday Christmas on Tuesday after Boxing Day on Monday
+    calendar = LondonBankHolidayCalendar()
+    names = {
+        date(2021, 12, 27): 'Christmas', date(2021, 12, 28): 'Boxing Day',
+        date(2022, 12, 26): 'Boxing Day', date(2022, 12, 27): 'Christmas',
+    }
+    for dt, name in names.items():
+        assert calendar.holiday_name(dt, observed=True) == name
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+import pytest
+
+from holidaycal.bitmap import BusinessDayBitmap
+from holidaycal.calendar import AbstractCalendar, JointCalendar, LondonBankHolidayCalendar, NYBankHolidayCalendar
+
+
+@pytest.fixture
+def bitmap():
+    return BusinessDayBitmap.from_dates(2021, 2022, [date(2021, 1, 1), date(2021, 1, 2), date(2023, 1, 2)])
+
+
+def test_from_dates(bitmap):
+    assert bitmap.days == 730
+    assert bitmap.nbytes == 92
+    assert not bitmap.is_business_day(date(2021, 1, 1))
+    assert bitmap.is_business_day(date(2021, 1, 4))
+    assert not bitmap.is_business_day(date(2021, 1, 9))
+    assert bitmap.holidays() == [date(2021, 1, 1)]
+    business_days = bitmap.business_days()
+    assert len(business_days) == 520
+    assert business_days[:2] == [date(2021, 1, 4), date(2021, 1, 5)]
+    assert business_days[-1] == date(2022, 12, 30)
+    with pytest.raises(ValueError):
+        bitmap.is_business_day(date(2023, 1, 1))
+    with pytest.raises(ValueError):
+        BusinessDayBitmap(2022, 2021, 0, [True] * 7)
+
+
+def test_count(bitmap):
+    assert bitmap.count(date(2021, 1, 1), date(2021, 1, 8)) == 4
+    assert bitmap.count(date(2021, 1, 8), date(2021, 1, 1)) == -5
+    assert bitmap.count(date(2021, 1, 1), date(2023, 1, 1)) == 520
+    with pytest.raises(ValueError):
+        bitmap.count(date(2021, 1, 1), date(2023, 1, 2))
+
+
+def test_bytes(bitmap):
+    data = bitmap.to_bytes()
+    assert len(data) == bitmap.nbytes
+    assert BusinessDayBitmap.from_bytes(2021, 2022, data, bitmap.weekmask) == bitmap
+
+
+def test_combine():
+    a = BusinessDayBitmap.from_dates(2020, 2022, [date(2021, 3, 1)])
+    b = BusinessDayBitmap.from_dates(2021, 2023, [date(2021, 3, 2)], weekmask=(1, 1, 1, 1, 0, 0, 1))
+    both, either = a & b, a | b
+    assert (both.start_year, both.end_year) == (either.start_year, either.end_year) == (2021, 2022)
+    assert both.weekmask == (True, True, True, True, False, False, False)
+    assert either.weekmask == (True, True, True, True, True, False, True)
+    assert both.holidays()[:2] == [date(2021, 3, 1), date(2021, 3, 2)]
+    assert either.holidays() == []
+    with pytest.raises(ValueError):
+        BusinessDayBitmap.from_dates(2020, 2020, []) & BusinessDayBitmap.from_dates(2021, 2021, [])
+
+
+def test_calendar_bitmap():
+    ny, london = NYBankHolidayCalendar(), LondonBankHolidayCalendar()
+    bitmap = ny.business_day_bitmap(1990, 2039)
+    assert ny.business_day_bitmap(1990, 2039) is bitmap
+    assert (bitmap.start_year, bitmap.end_year) == (1990, 2039)
+    assert ny.business_day_bitmap().start_year == AbstractCalendar.bitmap_years[0]
+    start = date(1990, 1, 1)
+    for days in (0, 1, 365, 5000, 18261):
+        end = start + timedelta(days=days)
+        assert bitmap.count(start, end) == ny.business_days_between(start, end)
+    assert bitmap.holidays() == [dt for dt in ny.holidays(date(1990, 1, 1), date(2039, 12, 31), observed=True)
+                                 if dt.weekday() < 5]
+
+    joint = JointCalendar([ny, london])
+    combined = ny.business_day_bitmap(1990, 2039) & london.business_day_bitmap(1990, 2039)
+    assert combined == joint.business_day_bitmap(1990, 2039)
+
+
+def test_replace_years(bitmap):
+    replacement = BusinessDayBitmap.from_dates(2022, 2022, [date(2022, 1, 3)])
+    updated = bitmap.replace_years(replacement)
+    assert updated.holidays() == [date(2021, 1, 1), date(2022, 1, 3)]
+    assert bitmap.holidays() == [date(2021, 1, 1)]
+    with pytest.raises(ValueError):
+        bitmap.replace_years(BusinessDayBitmap.from_dates(2022, 2023, []))
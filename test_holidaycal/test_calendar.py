@@ -1,8 +1,12 @@
 from datetime import date
+from itertools import islice, takewhile
+import pickle
+import random
 import pytest
 
-from holidaycal.calendar import AbstractCalendar
-from holidaycal.holiday import ListHoliday, RecurringHoliday
+from holidaycal.calendar import AbstractCalendar, JointCalendar, LondonBankHolidayCalendar, NYBankHolidayCalendar, \
+    _RuleIntervals
+from holidaycal.holiday import AbstractHoliday, ListHoliday, RecurringHoliday
 from holidaycal.observance import nearest_weekday
 
 
@@ -73,3 +77,521 @@ def test_holidays_observed(empty_calendar, calendar_from_init, calendar_from_cla
     assert calendar_from_class().holidays(date(2021, 1, 1), date(2024, 1, 1), observed=True) == [
         date(2021, 1, 8), date(2021, 1, 15), date(2021, 2, 15), date(2022, 1, 7), date(2023, 1, 9)
     ]
+
+
+def test_holidays_as_ordinals(calendar_from_class):
+    calendar = calendar_from_class()
+    for observed in (False, True):
+        assert list(calendar.holidays(date(2021, 1, 1), date(2024, 1, 1), observed=observed, as_ordinals=True)) == \
+               [dt.toordinal() for dt in calendar.holidays(date(2021, 1, 1), date(2024, 1, 1), observed=observed)]
+    assert calendar.holidays(date(2021, 1, 1), date(2022, 1, 1), names=True, as_ordinals=True) == [
+        ('New Holiday', date(2021, 1, 8).toordinal()), ('List Holiday', date(2021, 1, 15).toordinal()),
+        ('List Holiday', date(2021, 2, 14).toordinal())
+    ]
+    assert list(calendar.holidays(date(2022, 1, 1), date(2021, 1, 1), as_ordinals=True)) == []
+
+
+def test_custom_rule():
+    # subclasses that implement only `dates`, as before rules worked on ordinals
+
+    class FirstOfMonth(AbstractHoliday):
+
+        def dates(self, start_date, end_date, observed=False):
+            return [date(y, m, 1) for y in range(start_date.year, end_date.year + 1) for m in range(1, 13)
+                    if start_date <= date(y, m, 1) <= end_date]
+
+    rule = FirstOfMonth('First of Month', observance=nearest_weekday)
+    calendar = AbstractCalendar(rules=[rule, RecurringHoliday('New Holiday', month=1, day=8)])
+    assert calendar.holidays(date(2021, 1, 1), date(2021, 3, 31), names=True) == [
+        ('First of Month', date(2021, 1, 1)), ('New Holiday', date(2021, 1, 8)), ('First of Month', date(2021, 2, 1)),
+        ('First of Month', date(2021, 3, 1))
+    ]
+    assert calendar.is_holiday(date(2021, 6, 1)) and not calendar.is_business_day(date(2021, 6, 1))
+    assert calendar.holiday_name(date(2021, 1, 8)) == 'New Holiday'
+    assert list(islice(calendar.iter_holidays(date(2021, 1, 2)), 2)) == [date(2021, 1, 8), date(2021, 2, 1)]
+    calendar.add_rule(ListHoliday('Closure', [date(2021, 6, 2)]))
+    assert calendar.holidays(date(2021, 6, 1), date(2021, 6, 2)) == [date(2021, 6, 1), date(2021, 6, 2)]
+
+    calendar = AbstractCalendar(rules=[rule])
+    stats = calendar.enable_instrumentation()
+    assert calendar.holidays(date(2030, 1, 1), date(2030, 12, 31), observed=True)[-1] == date(2030, 12, 1)
+    assert stats.rules[0].calls == 1 and stats.rules[0].dates == 12
+
+
+def test_holidays_between(calendar_from_class):
+    calendar = calendar_from_class()
+    holidays = calendar.holidays_between(date(2021, 1, 1), date(2021, 12, 31))
+    assert [(dt, rule.name) for dt, rule in holidays] == [
+        (date(2021, 1, 8), 'New Holiday'), (date(2021, 1, 15), 'List Holiday'), (date(2021, 2, 14), 'List Holiday')
+    ]
+    assert calendar.holidays_between(date(2021, 2, 1), date(2021, 1, 1)) == []
+
+
+def test_holiday_index_extension(calendar_from_init):
+    # extending the index backward and forward gives the same result as building it at once
+    assert calendar_from_init.holidays(date(2021, 1, 1), date(2021, 12, 31), observed=True) == [date(2021, 1, 8)]
+    assert calendar_from_init.holidays(date(2019, 1, 1), date(2019, 12, 31), observed=True) == [date(2019, 1, 8)]
+    assert calendar_from_init.holidays(date(2024, 1, 1), date(2024, 12, 31), observed=True) == [date(2024, 1, 8)]
+    expected = AbstractCalendar(rules=calendar_from_init.rules).holidays(date(2018, 1, 1), date(2025, 12, 31),
+                                                                         observed=True)
+    assert calendar_from_init.holidays(date(2018, 1, 1), date(2025, 12, 31), observed=True) == expected
+
+
+def test_holiday_index_sparse_years():
+    # a far-away query builds only its own years, not the years in between
+
+    class FirstOfMonth(AbstractHoliday):
+
+        def dates(self, start_date, end_date, observed=False):
+            years.update(range(start_date.year, end_date.year + 1))
+            return [date(y, m, 1) for y in range(start_date.year, end_date.year + 1) for m in range(1, 13)
+                    if start_date <= date(y, m, 1) <= end_date]
+
+    def business_days(start, end):
+        days = (date.fromordinal(o) for o in range(start.toordinal(), end.toordinal()))
+        return sum(dt.weekday() < 5 and dt.day != 1 for dt in days)
+
+    years = set()
+    calendar = AbstractCalendar(rules=[FirstOfMonth('First of Month')])
+    assert calendar.is_holiday(date(2021, 6, 1))
+    assert calendar.business_days_between(date(2021, 1, 1), date(2021, 12, 31)) == \
+           business_days(date(2021, 1, 1), date(2021, 12, 31))
+    assert calendar.is_holiday(date(9000, 6, 1))
+    assert calendar.business_days_between(date(9000, 1, 1), date(9000, 12, 31)) == \
+           business_days(date(9000, 1, 1), date(9000, 12, 31))
+    assert calendar.add_business_days(date(9000, 5, 30), 1) == date(9000, 6, 2)
+    assert years == {2021, 9000}
+
+    # queries next to or across built years reuse them
+    years.clear()
+    assert calendar.business_days_between(date(2019, 1, 1), date(2023, 12, 31)) == \
+           business_days(date(2019, 1, 1), date(2023, 12, 31))
+    assert years == {2019, 2020, 2022, 2023}
+
+    # rule changes update every range of years built
+    calendar.add_rule(ListHoliday('Closure', [date(2021, 6, 2), date(9000, 6, 2)]))
+    assert calendar.add_business_days(date(9000, 5, 30), 1) == date(9000, 6, 3)
+    fresh = AbstractCalendar(rules=calendar.rules)
+    for start, end in ((date(2019, 1, 1), date(2023, 12, 31)), (date(9000, 1, 1), date(9000, 12, 31))):
+        assert calendar.holidays(start, end, observed=True) == fresh.holidays(start, end, observed=True)
+        assert calendar.business_days_between(start, end) == fresh.business_days_between(start, end)
+
+
+def test_holiday_index_observed_across_years():
+    # 2022-01-01 is a Saturday, observed on 2021-12-31
+    calendar = AbstractCalendar(rules=[RecurringHoliday('New Year', month=1, day=1, observance=nearest_weekday)])
+    assert calendar.holidays(date(2021, 12, 1), date(2021, 12, 31), observed=True) == [date(2021, 12, 31)]
+    assert calendar.holidays(date(2022, 1, 1), date(2022, 12, 31), observed=True) == []
+    assert calendar.holidays(date(2021, 12, 1), date(2022, 12, 31), observed=True) == [date(2021, 12, 31)]
+
+
+def test_is_holiday(empty_calendar, calendar_from_class):
+    calendar = calendar_from_class()
+    assert calendar.is_holiday(date(2021, 2, 14))
+    assert not calendar.is_holiday(date(2021, 2, 15))
+    assert calendar.is_holiday(date(2021, 2, 15), observed=True)
+    assert calendar.is_holiday(date(1950, 1, 8))
+    with pytest.raises(ValueError):
+        empty_calendar.is_holiday(date(2021, 1, 1))
+
+
+def test_next_previous_holiday(calendar_from_class):
+    calendar = calendar_from_class()
+    assert calendar.next_holiday(date(2021, 1, 8)) == date(2021, 1, 15)
+    assert calendar.next_holiday(date(2021, 2, 14)) == date(2022, 1, 8)
+    assert calendar.next_holiday(date(2021, 2, 14), observed=True) == date(2021, 2, 15)
+    assert calendar.previous_holiday(date(2021, 1, 15)) == date(2021, 1, 8)
+    assert calendar.previous_holiday(date(2021, 1, 8)) == date(2020, 1, 8)
+
+    list_calendar = AbstractCalendar(rules=[ListHoliday('List Holiday', [date(2021, 1, 15)])])
+    assert list_calendar.next_holiday(date(2021, 1, 1)) == date(2021, 1, 15)
+    assert list_calendar.previous_holiday(date(2021, 12, 1)) == date(2021, 1, 15)
+    assert list_calendar.previous_holiday(date(2021, 1, 15)) is None
+
+
+def test_weekmask():
+    assert AbstractCalendar().weekmask == (True, True, True, True, True, False, False)
+    assert AbstractCalendar(weekmask='1111001').weekmask == (True, True, True, True, False, False, True)
+    assert AbstractCalendar(weekmask=[1, 1, 1, 1, 1, 1, 0]).weekmask == (True, True, True, True, True, True, False)
+    with pytest.raises(ValueError):
+        AbstractCalendar(weekmask='11111')
+    with pytest.raises(ValueError):
+        AbstractCalendar(weekmask='0000000')
+
+
+def test_is_business_day(calendar_from_init):
+    assert calendar_from_init.is_business_day(date(2022, 1, 6))
+    assert not calendar_from_init.is_business_day(date(2022, 1, 7))  # observed holiday
+    assert not calendar_from_init.is_business_day(date(2022, 1, 8))  # Saturday
+    friday_weekend = AbstractCalendar(rules=calendar_from_init.rules, weekmask='1111001')
+    assert friday_weekend.is_business_day(date(2022, 1, 9))  # Sunday
+
+
+def test_roll(calendar_from_init):
+    # 2022-01-07 (Friday) is an observed holiday
+    assert calendar_from_init.roll(date(2022, 1, 6)) == date(2022, 1, 6)
+    assert calendar_from_init.roll(date(2022, 1, 7)) == date(2022, 1, 10)
+    assert calendar_from_init.roll(date(2022, 1, 7), 'preceding') == date(2022, 1, 6)
+    assert calendar_from_init.roll(date(2022, 1, 7), 'modified_following') == date(2022, 1, 10)
+    assert calendar_from_init.roll(date(2022, 1, 7), 'modified_preceding') == date(2022, 1, 6)
+    # month boundaries
+    assert calendar_from_init.roll(date(2022, 4, 30)) == date(2022, 5, 2)
+    assert calendar_from_init.roll(date(2022, 4, 30), 'modified_following') == date(2022, 4, 29)
+    assert calendar_from_init.roll(date(2022, 5, 1), 'preceding') == date(2022, 4, 29)
+    assert calendar_from_init.roll(date(2022, 5, 1), 'modified_preceding') == date(2022, 5, 2)
+    with pytest.raises(ValueError):
+        calendar_from_init.roll(date(2022, 5, 1), 'nearest')
+
+
+def test_add_business_days(calendar_from_init):
+    assert calendar_from_init.add_business_days(date(2022, 1, 6), 1) == date(2022, 1, 10)
+    assert calendar_from_init.add_business_days(date(2022, 1, 10), -1) == date(2022, 1, 6)
+    assert calendar_from_init.add_business_days(date(2022, 1, 8), 0) == date(2022, 1, 10)
+    assert calendar_from_init.add_business_days(date(2022, 1, 8), 1) == date(2022, 1, 11)
+    assert calendar_from_init.add_business_days(date(2022, 1, 8), 1, roll='preceding') == date(2022, 1, 10)
+    assert calendar_from_init.add_business_days(date(2021, 12, 31), 4) == date(2022, 1, 6)
+    # offsets beyond the years already computed extend the counts
+    assert calendar_from_init.add_business_days(date(2022, 1, 3), 1294) == date(2026, 12, 25)
+    assert calendar_from_init.add_business_days(date(2026, 12, 25), -1294) == date(2022, 1, 3)
+    assert calendar_from_init.add_business_days(date(2016, 1, 4), -780) == date(2013, 1, 2)
+
+
+def test_business_days_between(calendar_from_init):
+    assert calendar_from_init.business_days_between(date(2022, 1, 3), date(2022, 1, 10)) == 4
+    assert calendar_from_init.business_days_between(date(2022, 1, 10), date(2022, 1, 3)) == -4
+    assert calendar_from_init.business_days_between(date(2022, 1, 3), date(2022, 1, 3)) == 0
+    assert calendar_from_init.business_days_between(date(2022, 1, 3), date(2026, 12, 25)) == 1294
+
+
+def test_holidays_array(calendar_from_class):
+    np = pytest.importorskip('numpy')
+    calendar = calendar_from_class()
+    holidays = calendar.holidays_array(date(2021, 1, 1), date(2022, 1, 31), observed=True)
+    assert holidays.dtype == np.dtype('datetime64[D]')
+    assert holidays.tolist() == calendar.holidays(date(2021, 1, 1), date(2022, 1, 31), observed=True)
+    busdaycal = calendar.busdaycalendar(date(2021, 1, 1), date(2022, 1, 31))
+    assert busdaycal.holidays.tolist() == [date(2021, 1, 8), date(2021, 1, 15), date(2021, 2, 15), date(2022, 1, 7)]
+    assert busdaycal.weekmask.tolist() == [True, True, True, True, True, False, False]
+
+
+def test_is_holiday_array(calendar_from_class):
+    np = pytest.importorskip('numpy')
+    calendar = calendar_from_class()
+    dates = np.arange('2020-12-01', '2023-02-01', dtype='datetime64[D]')
+    for observed in (False, True):
+        expected = [calendar.is_holiday(dt, observed) for dt in dates.tolist()]
+        assert calendar.is_holiday_array(dates, observed).tolist() == expected
+    assert calendar.is_holiday_array(np.array([], dtype='datetime64[D]')).tolist() == []
+
+
+def test_business_day_arrays(calendar_from_init):
+    np = pytest.importorskip('numpy')
+    dates = np.arange('2021-11-01', '2023-02-01', dtype='datetime64[D]')
+    date_list = dates.tolist()
+    assert calendar_from_init.is_business_day_array(dates).tolist() == \
+        [calendar_from_init.is_business_day(dt) for dt in date_list]
+    for convention in ('following', 'preceding', 'modified_following', 'modified_preceding'):
+        assert calendar_from_init.roll_array(dates, convention).tolist() == \
+            [calendar_from_init.roll(dt, convention) for dt in date_list]
+    assert calendar_from_init.add_business_days_array(dates, 300).tolist() == \
+        [calendar_from_init.add_business_days(dt, 300) for dt in date_list]
+    n = np.arange(len(dates)) - 200
+    assert calendar_from_init.add_business_days_array(dates, n, 'preceding').tolist() == \
+        [calendar_from_init.add_business_days(dt, int(k), 'preceding') for dt, k in zip(date_list, n)]
+    assert calendar_from_init.business_days_between_array(dates, dates[::-1]).tolist() == \
+        [calendar_from_init.business_days_between(a, b) for a, b in zip(date_list, date_list[::-1])]
+
+
+def test_iter_holidays(calendar_from_class):
+    calendar = calendar_from_class()
+    holidays = calendar.iter_holidays(date(2021, 1, 8), observed=True, names=True)
+    assert next(holidays) == ('New Holiday', date(2021, 1, 8))
+    assert [next(holidays) for _ in range(3)] == [
+        ('List Holiday', date(2021, 1, 15)), ('List Holiday', date(2021, 2, 15)), ('New Holiday', date(2022, 1, 7))
+    ]
+    assert list(islice(calendar.iter_holidays(date(2021, 1, 9), 'backward'), 3)) == [
+        date(2021, 1, 8), date(2020, 1, 8), date(2019, 1, 8)
+    ]
+    with pytest.raises(ValueError):
+        calendar.iter_holidays(date(2021, 1, 1), direction='sideways')
+
+
+def test_iter_holidays_matches_holidays():
+    calendar = LondonBankHolidayCalendar()
+    for observed in (False, True):
+        expected = calendar.holidays(date(1990, 1, 1), date(2040, 12, 31), names=True, observed=observed)
+        forward = calendar.iter_holidays(date(1990, 1, 1), observed=observed, names=True)
+        assert list(takewhile(lambda h: h[1] <= date(2040, 12, 31), forward)) == expected
+        backward = calendar.iter_holidays(date(2040, 12, 31), 'backward', observed=observed, names=True)
+        assert list(takewhile(lambda h: h[1] >= date(1990, 1, 1), backward)) == expected[::-1]
+
+
+def _bounded_rules(seed, count):
+    rng = random.Random(seed)
+    rules = [RecurringHoliday('Unbounded', month=1, day=1, observance=nearest_weekday), ListHoliday('Empty', [])]
+    for i in range(count):
+        year = rng.randint(1800, 2020)
+        if i % 2:
+            rules.append(ListHoliday(f'Proclamation {i}', [date(year, rng.randint(1, 12), rng.randint(1, 28))]))
+        else:
+            rules.append(RecurringHoliday(f'Rule {i}', month=rng.randint(1, 12), day=rng.randint(1, 28),
+                                          start_date=date(year, 1, 1), observance=nearest_weekday,
+                                          end_date=date(year + rng.randint(0, 40), 12, 31)))
+    return rules
+
+
+def test_rule_intervals():
+    rules = _bounded_rules(0, 300)
+    intervals = _RuleIntervals(rules)
+    rng = random.Random(1)
+    for _ in range(200):
+        start_year = rng.randint(1780, 2040)
+        end_year = start_year + rng.choice([0, 1, 10, 100])
+        expected = [i for i, rule in enumerate(rules) if rule.bounds()[0] is None or
+                    rule.bounds()[0].year <= end_year and rule.bounds()[1].year >= start_year]
+        assert intervals.overlapping(start_year, end_year) == expected
+
+
+def test_active_rules_only():
+    rules = _bounded_rules(2, 200)
+    calendar = AbstractCalendar(rules=rules)
+    expected = sorted(((dt, i) for i, rule in enumerate(rules)
+                       for dt in rule.dates(date(1950, 1, 1), date(1960, 12, 31), observed=True)))
+    stats = calendar.enable_instrumentation()
+    assert calendar.holidays(date(1950, 1, 1), date(1960, 12, 31), observed=True) == [dt for dt, _ in expected]
+    assert calendar.holidays(date(1950, 1, 1), date(1960, 12, 31), names=True, observed=True) == \
+           [(rules[i].name, dt) for dt, i in expected]
+    # rules without holidays in the years queried are not evaluated
+    called = [s.calls > 0 for s in stats.rules]
+    assert called == [(r.bounds()[0] is None or r.bounds()[0].year <= 1960 and r.bounds()[1].year >= 1950)
+                      for r in rules]
+    assert sum(called) < len(rules) // 4
+
+    calendar.rules = calendar.rules[:100]
+    assert calendar.holidays(date(1800, 1, 1), date(2060, 12, 31)) == \
+           sorted(dt for rule in rules[:100] for dt in rule.dates(date(1800, 1, 1), date(2060, 12, 31)))
+
+
+def test_iter_holidays_exhausted():
+    calendar = AbstractCalendar(rules=[
+        ListHoliday('List Holiday', [date(2021, 1, 15), date(2021, 2, 14)]),
+        RecurringHoliday('Bounded Holiday', month=3, day=1, start_date=date(2019, 1, 1), end_date=date(2022, 12, 31))
+    ])
+    assert list(calendar.iter_holidays(date(2021, 2, 1))) == [date(2021, 2, 14), date(2021, 3, 1), date(2022, 3, 1)]
+    assert list(calendar.iter_holidays(date(2021, 2, 1), 'backward')) == [
+        date(2021, 1, 15), date(2020, 3, 1), date(2019, 3, 1)
+    ]
+
+
+@pytest.fixture
+def joint_calendars():
+    first = AbstractCalendar('First', rules=[
+        RecurringHoliday('New Year', month=1, day=1, observance=nearest_weekday),
+        ListHoliday('Closure', [date(2021, 3, 1), date(2021, 3, 2)])
+    ])
+    second = AbstractCalendar('Second', rules=[
+        RecurringHoliday('New Year', month=1, day=1),
+        ListHoliday('Outage', [date(2021, 3, 2), date(2021, 3, 3)])
+    ], weekmask='1111001')
+    return first, second
+
+
+def test_joint_calendar_union(joint_calendars):
+    first, second = joint_calendars
+    joint = JointCalendar([first, second])
+    assert joint.name == 'First | Second'
+    assert joint.weekmask == (True, True, True, True, False, False, False)
+    assert joint.holidays(date(2021, 1, 1), date(2021, 12, 31), names=True) == [
+        ('New Year', date(2021, 1, 1)), ('New Year', date(2021, 1, 1)), ('Closure', date(2021, 3, 1)),
+        ('Closure', date(2021, 3, 2)), ('Outage', date(2021, 3, 2)), ('Outage', date(2021, 3, 3))
+    ]
+    assert joint.holiday_sources(date(2021, 1, 1), date(2021, 12, 31)) == [
+        (date(2021, 1, 1), (first, second)), (date(2021, 3, 1), (first,)), (date(2021, 3, 2), (first, second)),
+        (date(2021, 3, 3), (second,))
+    ]
+    # 2022-01-01 is a Saturday, observed on 2021-12-31 by the first calendar only
+    assert joint.holiday_sources(date(2021, 12, 1), date(2022, 1, 31), observed=True) == [
+        (date(2021, 12, 31), (first,)), (date(2022, 1, 1), (second,))
+    ]
+    assert joint.add_business_days(date(2021, 2, 25), 1) == date(2021, 3, 4)
+    assert joint.business_days_between(date(2021, 3, 1), date(2021, 3, 8)) == 1
+
+
+def test_joint_calendar_intersection(joint_calendars):
+    first, second = joint_calendars
+    joint = JointCalendar([first, second], mode='intersection')
+    assert joint.name == 'First & Second'
+    assert joint.weekmask == (True, True, True, True, True, False, True)
+    assert joint.holidays(date(2021, 1, 1), date(2021, 12, 31)) == [date(2021, 1, 1), date(2021, 1, 1),
+                                                                     date(2021, 3, 2), date(2021, 3, 2)]
+    assert joint.holiday_sources(date(2021, 1, 1), date(2021, 12, 31)) == [
+        (date(2021, 1, 1), (first, second)), (date(2021, 3, 2), (first, second))
+    ]
+    assert joint.is_business_day(date(2021, 3, 1))
+    assert not joint.is_business_day(date(2021, 3, 2))
+    with pytest.raises(ValueError):
+        JointCalendar([first, second], mode='xor')
+    with pytest.raises(ValueError):
+        JointCalendar([])
+
+
+def test_joint_calendar_iter_holidays(joint_calendars):
+    for mode in ('union', 'intersection'):
+        joint = JointCalendar(joint_calendars, mode=mode)
+        for observed in (False, True):
+            expected = joint.holidays(date(2019, 1, 1), date(2023, 12, 31), names=True, observed=observed)
+            forward = joint.iter_holidays(date(2019, 1, 1), observed=observed, names=True)
+            assert list(takewhile(lambda h: h[1] <= date(2023, 12, 31), forward)) == expected
+            backward = joint.iter_holidays(date(2023, 12, 31), 'backward', observed=observed, names=True)
+            assert list(takewhile(lambda h: h[1] >= date(2019, 1, 1), backward)) == expected[::-1]
+
+
+def test_joint_calendar_combine():
+    ny, london = NYBankHolidayCalendar(), LondonBankHolidayCalendar()
+    joint = JointCalendar.combine([ny, london])
+    assert joint.calendars == (ny, london)
+    assert JointCalendar.combine([ny, london]) is joint
+    assert JointCalendar.combine((ny, london)) is joint
+    assert JointCalendar.combine([london, ny]) is not joint
+    assert JointCalendar.combine([ny, london], 'intersection') is not joint
+
+    # new instances get a joint calendar of their own
+    other = JointCalendar.combine([NYBankHolidayCalendar(), london])
+    assert other is not joint and other.calendars[0] is not ny
+
+    expected = sorted(set(ny.holidays(date(2000, 1, 1), date(2021, 12, 31), observed=True)) |
+                      set(london.holidays(date(2000, 1, 1), date(2021, 12, 31), observed=True)))
+    assert [dt for dt, _ in joint.holiday_sources(date(2000, 1, 1), date(2021, 12, 31), observed=True)] == expected
+
+
+def test_joint_calendar_combine_changes(calendar_from_class):
+    first, second = calendar_from_class(), NYBankHolidayCalendar()
+    joint = JointCalendar.combine([first, second])
+    assert not joint.is_holiday(date(2021, 3, 1))
+
+    # the cached joint calendar follows the rule changes of its calendars
+    first.add_rule(ListHoliday('Closure', [date(2021, 3, 1)]))
+    assert JointCalendar.combine([first, second]) is joint
+    assert joint.is_holiday(date(2021, 3, 1))
+    # an unchanged instance of the same class is not combined with the changed rules
+    unchanged = JointCalendar.combine([calendar_from_class(), second])
+    assert unchanged is not joint and not unchanged.is_holiday(date(2021, 3, 1))
+
+    # rules reassigned without the calendar's methods are not followed, so the cached joint calendar is replaced
+    first.rules = first.rules + [ListHoliday('Closure', [date(2021, 3, 2)])]
+    combined = JointCalendar.combine([first, second])
+    assert combined is not joint and combined.calendars[0] is first and len(combined.rules) == len(joint.rules) + 1
+    assert JointCalendar.combine([first, second]) is combined
+
+
+def test_holiday_name(calendar_from_class):
+    calendar = calendar_from_class()
+    calendar.rules = calendar.rules + [ListHoliday('Coinciding', [date(2022, 1, 8)])]
+    assert calendar.holiday_name(date(2021, 1, 8)) == 'New Holiday'
+    assert calendar.holiday_name(date(2021, 1, 9)) is None
+    assert calendar.holiday_name(date(2022, 1, 8)) == 'New Holiday / Coinciding'
+    assert calendar.holiday_name(date(2022, 1, 8), observed=True) == 'Coinciding'
+    assert calendar.holiday_name(date(2022, 1, 7), observed=True) == 'New Holiday'
+    # 2028-01-08 is a Saturday, observed on 2028-01-07
+    assert calendar.holiday_name(date(2028, 1, 7)) is None
+    assert calendar.holiday_name(date(2028, 1, 7), observed=True) == 'New Holiday'
+
+    assert calendar.holiday_names_for([date(2022, 1, 8), date(2021, 2, 14), date(2021, 2, 15)]) == \
+           ['New Holiday / Coinciding', 'List Holiday', None]
+    assert calendar.holiday_names_for([date(2021, 2, 15), date(2021, 2, 14)], observed=True) == ['List Holiday', None]
+
+
+def test_holiday_rules(calendar_from_class, joint_calendars):
+    calendar = calendar_from_class()
+    new_holiday, list_holiday = calendar.rules
+    assert calendar.holiday_rules(date(2021, 2, 15), observed=True) == [(date(2021, 2, 14), list_holiday)]
+    assert calendar.holiday_rules(date(2021, 2, 14)) == [(date(2021, 2, 14), list_holiday)]
+    assert calendar.holiday_rules(date(2011, 1, 7), observed=True) == [(date(2011, 1, 8), new_holiday)]
+    assert calendar.holiday_rules(date(2021, 2, 15)) == []
+
+    first, second = joint_calendars
+    union = JointCalendar([first, second])
+    assert union.holiday_name(date(2021, 3, 2)) == 'Closure / Outage'
+    assert union.holiday_name(date(2021, 3, 3)) == 'Outage'
+    intersection = JointCalendar([first, second], mode='intersection')
+    assert intersection.holiday_name(date(2021, 3, 2)) == 'Closure / Outage'
+    assert intersection.holiday_name(date(2021, 3, 3)) is None
+    assert [rule.name for _, rule in intersection.holiday_rules(date(2021, 1, 1))] == ['New Year', 'New Year']
+
+
+def _calendar_state(calendar):
+    return (calendar.holidays(date(2019, 1, 1), date(2023, 12, 31), names=True),
+            calendar.holidays(date(2019, 1, 1), date(2023, 12, 31), names=True, observed=True),
+            [calendar.business_days_between(date(2019, 1, 1), date(y, 12, 31)) for y in range(2019, 2024)],
+            calendar.business_day_bitmap(2020, 2022).bits,
+            calendar.holiday_name(date(2021, 3, 1)), calendar.holiday_name(date(2022, 1, 7), observed=True))
+
+
+def test_calendar_rule_changes(calendar_from_class, joint_calendars):
+    calendar = calendar_from_class()
+    first, second = joint_calendars
+    union = JointCalendar([calendar, second])
+    for c in (calendar, union):
+        _calendar_state(c)
+    assert calendar.version == 0
+
+    closure = ListHoliday('Closure', [date(2021, 3, 1)])
+    calendar.add_rule(closure)
+    assert calendar.holiday_names() == ['New Holiday', 'List Holiday', 'Closure']
+    assert calendar.holiday_name(date(2021, 3, 1)) == 'Closure'
+    assert union.holiday_name(date(2021, 3, 1)) == 'Closure'
+    # the class rules are unchanged
+    assert calendar_from_class.rules[-1].name == 'List Holiday'
+
+    replacement = RecurringHoliday('Replacement', month=1, day=7, start_date=date(2022, 1, 1))
+    assert calendar.replace_rule('New Holiday', replacement).name == 'New Holiday'
+    assert calendar.holiday_names() == ['Replacement', 'List Holiday', 'Closure']
+    assert calendar.remove_rule(closure) is closure
+    with pytest.raises(ValueError):
+        calendar.remove_rule('Closure')
+
+    assert calendar.version == 3
+    assert calendar.changes_since(1) == [(1, 9999), (2022, 9999), (2021, 2021)]
+    assert calendar.changes_since(3) == []
+    assert union.version == 3
+    assert union.holiday_names() == ['Replacement', 'List Holiday', 'New Year', 'Outage']
+
+    # the updated caches match calendars built from scratch
+    assert _calendar_state(calendar) == _calendar_state(AbstractCalendar(rules=list(calendar.rules)))
+    assert _calendar_state(union) == \
+           _calendar_state(JointCalendar([AbstractCalendar(rules=list(calendar.rules)), second]))
+
+    with pytest.raises(TypeError):
+        union.add_rule(closure)
+    with pytest.raises(TypeError):
+        union.remove_rule(closure)
+    with pytest.raises(TypeError):
+        union.replace_rule(closure, closure)
+
+
+def test_calendar_change_log(calendar_from_class):
+    calendar = calendar_from_class()
+    calendar.change_log_size = 4
+    for day in range(1, 8):
+        calendar.add_rule(ListHoliday('Closure', [date(2021, 3, day)]))
+    assert calendar.version == 7
+    assert calendar.changes_since(3) == [(2021, 2021)] * 4
+    # older changes are collapsed into a change of every year
+    assert calendar.changes_since(2) == [(1, 9999)]
+    assert len(calendar._changes) == 4
+
+
+def test_calendar_pickle(calendar_from_init, joint_calendars):
+    first, second = joint_calendars
+    calendars = [calendar_from_init, NYBankHolidayCalendar(), JointCalendar([calendar_from_init, second])]
+    for calendar in calendars:
+        state = _calendar_state(calendar)
+        copy = pickle.loads(pickle.dumps(calendar))
+        assert _calendar_state(copy) == state
+        assert copy.name == calendar.name and copy.version == calendar.version
+
+    # an unpickled joint calendar follows the rule changes of its unpickled calendars
+    union = pickle.loads(pickle.dumps(calendars[2]))
+    union.calendars[0].add_rule(ListHoliday('Closure', [date(2021, 3, 1)]))
+    assert union.holiday_name(date(2021, 3, 1)) == 'Closure'
+    assert calendars[2].holiday_name(date(2021, 3, 1)) is None
@@ -0,0 +1,66 @@
+from datetime import date
+from dateutil.relativedelta import relativedelta, MO, TU, WE, TH, FR, SA, SU
+import pytest
+
+from holidaycal.compiler import compile_offset
+from holidaycal.easter import EasterDelta
+
+YEARS = list(range(1890, 2110)) + [4, 100, 1600, 1700, 2400, 9000]
+
+
+def reference_date(offset, year):
+    dt = date(year, 1, 1)
+    for o in offset if isinstance(offset, list) else [offset]:
+        dt = dt + o
+    return dt
+
+
+@pytest.mark.parametrize(
+    'offset',
+    [
+        relativedelta(month=1, weekday=MO(3)),
+        relativedelta(month=5, weekday=MO(-1)),
+        relativedelta(month=11, weekday=TH(4)),
+        relativedelta(month=2, day=29),
+        relativedelta(month=6, day=31, weekday=SU(-2)),
+        relativedelta(day=15, weekday=FR),
+        relativedelta(month=3, days=-10, weekday=SA(+2)),
+        relativedelta(days=45),
+        relativedelta(weeks=-3, weekday=WE(5)),
+        relativedelta(weekday=TU(-1)),
+        [relativedelta(month=11, weekday=MO(1)), relativedelta(days=1)],
+        [relativedelta(month=12, day=25), relativedelta(weekday=MO(-1)), relativedelta(month=3, day=31)],
+        EasterDelta(),
+        EasterDelta(days=-2),
+        EasterDelta(weeks=7, days=1),
+        EasterDelta(weekday=MO(-1)),
+        EasterDelta(month=11),
+        EasterDelta(method=1, days=1),
+        EasterDelta(method=2, days=-2),
+        [relativedelta(month=6), EasterDelta(days=39)],
+        [EasterDelta(days=49), relativedelta(weekday=SU(2))],
+    ]
+)
+def test_compiled_matches_offset(offset):
+    compiled = compile_offset(offset)
+    assert compiled is not None
+    for year in YEARS:
+        assert date.fromordinal(compiled(year)) == reference_date(offset, year)
+
+
+@pytest.mark.parametrize(
+    'offset',
+    [
+        relativedelta(years=1, month=2),
+        relativedelta(months=1),
+        relativedelta(year=2020, month=1),
+        relativedelta(month=2, leapdays=1),
+        relativedelta(month=1, hours=12),
+        EasterDelta(months=1),
+        [relativedelta(month=11, weekday=MO(1)), relativedelta(months=1)],
+        [],
+        2,
+    ]
+)
+def test_unrecognized_offsets(offset):
+    assert compile_offset(offset) is None
@@ -0,0 +1,70 @@
+from datetime import date, timedelta
+import random
+import pytest
+
+from holidaycal.calendar import NYBankHolidayCalendar
+from holidaycal.daycount import DAY_COUNT_CONVENTIONS, day_count, day_count_array, year_fraction, \
+    year_fraction_array
+
+
+@pytest.mark.parametrize('start, end, convention, expected', [
+    (date(2021, 1, 15), date(2021, 7, 15), 'ACT/360', 181),
+    (date(2021, 1, 15), date(2021, 7, 15), 'ACT/365F', 181),
+    (date(2021, 1, 31), date(2021, 3, 31), '30/360', 60),
+    (date(2021, 1, 30), date(2021, 3, 31), '30/360', 60),
+    (date(2021, 1, 29), date(2021, 3, 31), '30/360', 62),
+    (date(2021, 2, 28), date(2021, 8, 31), '30/360', 183),
+    (date(2021, 2, 28), date(2021, 8, 31), '30U/360', 180),
+    (date(2020, 2, 29), date(2021, 2, 28), '30U/360', 360),
+    (date(2021, 1, 29), date(2021, 3, 31), '30E/360', 61),
+    (date(2021, 2, 28), date(2021, 8, 31), '30E/360 ISDA', 180),
+    (date(2020, 8, 31), date(2021, 2, 28), '30E/360 ISDA', 180),
+    (date(2021, 12, 1), date(2022, 1, 1), 'BUS/252', 23),
+    (date(2022, 1, 1), date(2021, 12, 1), 'BUS/252', -22),
+])
+def test_day_count(start, end, convention, expected):
+    assert day_count(start, end, convention, NYBankHolidayCalendar()) == expected
+
+
+def test_maturity():
+    start, end = date(2020, 8, 31), date(2021, 2, 28)
+    assert day_count(start, end, '30E/360 ISDA', maturity_date=end) == 178
+    assert day_count(start, end, '30E/360 ISDA', maturity_date=date(2021, 8, 31)) == 180
+
+
+def test_year_fraction():
+    calendar = NYBankHolidayCalendar()
+    assert year_fraction(date(2021, 1, 1), date(2022, 1, 1), 'ACT/365F') == 1.0
+    assert year_fraction(date(2021, 1, 1), date(2021, 7, 1), 'ACT/360') == 181 / 360
+    assert year_fraction(date(2021, 12, 1), date(2022, 1, 1), 'BUS/252', calendar) == 23 / 252
+    start, end = date(1990, 1, 1), date(2030, 1, 1)
+    assert day_count(start, end, 'BUS/252', calendar) == \
+           sum(calendar.is_business_day(start + timedelta(days=i)) for i in range((end - start).days))
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        day_count(date(2021, 1, 1), date(2022, 1, 1), 'ACT/ACT')
+    with pytest.raises(ValueError):
+        day_count(date(2021, 1, 1), date(2022, 1, 1), 'BUS/252')
+    with pytest.raises(ValueError):
+        year_fraction(date(2021, 1, 1), date(2022, 1, 1), 'BUS/252')
+
+
+@pytest.mark.parametrize('convention', DAY_COUNT_CONVENTIONS)
+def test_day_count_array(convention):
+    np = pytest.importorskip('numpy')
+    calendar = NYBankHolidayCalendar()
+    rng = random.Random(0)
+    # month ends, the days around them and random days, with a few negative periods
+    days = [date(y, m, 1) + timedelta(days=rng.choice([-2, -1, 0, rng.randint(0, 27)]))
+            for y, m in zip([rng.randint(1990, 2040) for _ in range(2000)], [rng.randint(1, 12) for _ in range(2000)])]
+    starts, ends = days[:1000], days[1000:]
+    maturities = [rng.choice([end, end + timedelta(days=365)]) for end in ends]
+    expected = [day_count(s, e, convention, calendar, m) for s, e, m in zip(starts, ends, maturities)]
+    counts = day_count_array(starts, ends, convention, calendar, maturities)
+    assert counts.tolist() == expected
+    fractions = year_fraction_array(np.array(starts, dtype='datetime64[D]'), ends, convention, calendar, maturities)
+    assert fractions.tolist() == [year_fraction(s, e, convention, calendar, m)
+                                  for s, e, m in zip(starts, ends, maturities)]
+    assert day_count_array(starts[0], ends, convention, calendar).shape == (1000,)
@@ -1,8 +1,10 @@
 from datetime import date
+from dateutil.easter import easter
 from dateutil.relativedelta import MO, relativedelta
 import pytest
 
-from holidaycal.easter import EasterDelta
+from holidaycal import easter as easter_module
+from holidaycal.easter import EasterDelta, easter_array, easter_ordinal, easter_ordinals
 
 # Fixtures
 @pytest.fixture()
@@ -83,3 +85,34 @@ def test_repr():
 
 def test_hashable():
     assert hash(EasterDelta()) is not None
+
+
+@pytest.mark.parametrize('method', [1, 2, 3])
+def test_easter_ordinals(method):
+    assert easter_ordinal(2021, method) == easter(2021, method).toordinal()
+    expected = [easter(year, method).toordinal() for year in range(1583, 2500)]
+    easter_module._EASTER_TABLES[method].clear()
+    assert easter_ordinals(1583, 2499, method) == expected
+    # filled in from the shared table
+    assert easter_module._EASTER_TABLES[method][2021] == easter(2021, method).toordinal()
+    assert easter_ordinals(1583, 2499, method) == expected
+    assert easter_ordinals(2022, 2021, method) == []
+
+
+@pytest.mark.parametrize('method', [1, 2, 3])
+def test_easter_array(method):
+    np = pytest.importorskip('numpy')
+    expected = np.array([easter(year, method) for year in range(1, 5000)], dtype='datetime64[D]')
+    assert (easter_array(1, 4999, method) == expected).all()
+    # batches of missing years use numpy once it is imported
+    easter_module._EASTER_TABLES[method].clear()
+    assert easter_ordinals(1, 4999, method) == [d.toordinal() for d in expected.tolist()]
+
+
+def test_easter_invalid():
+    with pytest.raises(ValueError):
+        easter_ordinal(2021, 4)
+    with pytest.raises(ValueError):
+        easter_ordinals(2021, 2022, 0)
+    with pytest.raises(ValueError):
+        easter_ordinal(0)
@@ -0,0 +1,101 @@
+from datetime import date
+import csv
+import json
+import subprocess
+import sys
+import pytest
+
+from holidaycal.calendar import LondonBankHolidayCalendar, NYBankHolidayCalendar
+from holidaycal.export import main, read_binary, resolve_calendar
+
+
+def test_resolve_calendar():
+    assert isinstance(resolve_calendar('NYBankHolidayCalendar'), NYBankHolidayCalendar)
+    assert isinstance(resolve_calendar('holidaycal.calendar:LondonBankHolidayCalendar'), LondonBankHolidayCalendar)
+    with pytest.raises(KeyError):
+        resolve_calendar('Unknown')
+    with pytest.raises(TypeError):
+        resolve_calendar('datetime:date')
+
+
+def test_holidays_csv(tmp_path):
+    path = tmp_path / 'holidays.csv'
+    main(['NYBankHolidayCalendar', '--start', '1990', '--end', '2030', '--observed', '-o', str(path)])
+    with open(path, newline='') as file:
+        records = list(csv.reader(file))
+    assert records[0] == ['calendar', 'date', 'name']
+    expected = NYBankHolidayCalendar().holidays(date(1990, 1, 1), date(2030, 12, 31), names=True, observed=True)
+    assert records[1:] == [['NYBankHolidayCalendar', dt.isoformat(), name] for name, dt in expected]
+
+
+def test_pairs_jsonl(tmp_path):
+    path = tmp_path / 'pairs.jsonl'
+    main(['LondonBankHolidayCalendar', '--table', 'pairs', '--format', 'jsonl', '--start', '2021', '--end', '2021',
+          '-o', str(path)])
+    with open(path) as file:
+        records = [json.loads(line) for line in file]
+    assert {'calendar': 'LondonBankHolidayCalendar', 'name': 'Boxing Day', 'actual': '2021-12-26',
+            'observed': '2021-12-28'} in records
+    assert len(records) == len(LondonBankHolidayCalendar().holidays(date(2021, 1, 1), date(2021, 12, 31)))
+
+
+def test_pairs_match_rules(tmp_path):
+    path = tmp_path / 'pairs.csv'
+    main(['NYBankHolidayCalendar', '--table', 'pairs', '--start', '1990', '--end', '2030', '-o', str(path)])
+    with open(path, newline='') as file:
+        records = list(csv.reader(file))[1:]
+    expected = sorted((actual, observed, rule.name) for rule in NYBankHolidayCalendar.rules
+                      for actual, observed in rule.date_pairs(date(1990, 1, 1), date(2030, 12, 31)))
+    assert sorted((date.fromisoformat(a), date.fromisoformat(o), n) for _, n, a, o in records) == expected
+
+
+def test_business_days_binary(tmp_path):
+    path = tmp_path / 'business_days.bin'
+    main(['NYBankHolidayCalendar', 'LondonBankHolidayCalendar', '--table', 'business-days', '--format', 'binary',
+          '--start', '1995', '--end', '2024', '-o', str(path)])
+    with open(path, 'rb') as file:
+        blocks = list(read_binary(file))
+    assert [(name, table) for name, table, _ in blocks] == \
+           [('NYBankHolidayCalendar', 'business-days')] * 3 + [('LondonBankHolidayCalendar', 'business-days')] * 3
+    calendar = NYBankHolidayCalendar()
+    ordinals = [o for _, _, columns in blocks[:3] for o in columns[0]]
+    flags = [f for _, _, columns in blocks[:3] for f in columns[1]]
+    assert ordinals == list(range(date(1995, 1, 1).toordinal(), date(2024, 12, 31).toordinal() + 1))
+    assert flags == [calendar.is_business_day(date.fromordinal(o)) for o in ordinals]
+
+
+def test_holidays_binary(tmp_path):
+    path = tmp_path / 'holidays.bin'
+    main(['LondonBankHolidayCalendar', '--format', 'binary', '--start', '2000', '--end', '2005', '-o', str(path)])
+    with open(path, 'rb') as file:
+        (name, table, (ordinals, names)), = read_binary(file)
+    expected = LondonBankHolidayCalendar().holidays(date(2000, 1, 1), date(2005, 12, 31), names=True)
+    assert list(zip(names, map(date.fromordinal, ordinals))) == expected
+
+
+def test_workers(tmp_path):
+    args = ['NYBankHolidayCalendar', 'LondonBankHolidayCalendar', '--table', 'pairs', '--start', '1900']
+    main(args + ['-o', str(tmp_path / 'serial.csv')])
+    main(args + ['--workers', '2', '-o', str(tmp_path / 'parallel.csv')])
+    assert (tmp_path / 'serial.csv').read_bytes() == (tmp_path / 'parallel.csv').read_bytes()
+
+
+@pytest.mark.parametrize('workers', ['1', '2'])
+def test_broken_pipe(workers):
+    # the reader stops after the first line, like `head -1`
+    process = subprocess.Popen([sys.executable, '-m', 'holidaycal', 'NYBankHolidayCalendar', '--table', 'business-days',
+                                '--start', '1900', '--end', '2100', '--workers', workers],
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    assert process.stdout.readline() == b'calendar,date,business_day\n'
+    process.stdout.close()
+    stderr = process.stderr.read()
+    process.stderr.close()
+    assert process.wait() == 1
+    assert stderr == b''
+
+
+def test_invalid_arguments():
+    with pytest.raises(SystemExit):
+        main(['Unknown'])
+    with pytest.raises(SystemExit):
+        main(['NYBankHolidayCalendar', '--start', '2000', '--end', '1999'])
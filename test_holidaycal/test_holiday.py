@@ -1,9 +1,10 @@
 from datetime import date
 from dateutil.relativedelta import relativedelta, MO
+import pickle
 import pytest
 
 from holidaycal.easter import EasterDelta
-from holidaycal.holiday import AbstractHoliday, ListHoliday, RecurringHoliday
+from holidaycal.holiday import AbstractHoliday, ListHoliday, LondonBankHolidays, NYBankHolidays, RecurringHoliday
 from holidaycal.observance import nearest_weekday
 
 
@@ -81,3 +82,130 @@ def test_list_holiday():
     assert holiday.dates(date(2021, 1, 1), date(2022, 1, 1), observed=True) == \
         [date(2021, 1, 1), date(2021, 1, 1), date(2021, 1, 4)]
     assert holiday.__repr__() == 'ListHoliday: List holiday (number of dates=3, observance=nearest_weekday)'
+
+
+def test_recurring_cache():
+    holiday = RecurringHoliday('test', month=1, day=1, observance=nearest_weekday, cache_size=10)
+    assert holiday.cache_info() == (0, 0, 10, 0)
+    # reference years 2020 through 2023
+    holiday.dates(date(2021, 1, 1), date(2022, 12, 31))
+    assert holiday.cache_info() == (0, 4, 10, 4)
+    # overlapping range only computes the new years
+    assert holiday.dates(date(2022, 1, 1), date(2023, 12, 31), observed=True) == [date(2023, 1, 2)]
+    assert holiday.cache_info() == (3, 5, 10, 5)
+    holiday.cache_clear()
+    assert holiday.cache_info() == (0, 0, 10, 0)
+
+
+def test_recurring_pickle():
+    holiday = RecurringHoliday('test', month=1, day=1, observance=nearest_weekday, end_date=date(2030, 12, 31))
+    holiday.dates(date(1900, 1, 1), date(2100, 12, 31))
+    copy = pickle.loads(pickle.dumps(holiday))
+    # the date cache and cycle table are not pickled
+    assert copy.cache_info() == (0, 0, 512, 0) and copy._cycle is None
+    for start, end in [(date(2021, 1, 1), date(2022, 12, 31)), (date(1900, 1, 1), date(2100, 12, 31))]:
+        assert copy.dates(start, end, observed=True) == holiday.dates(start, end, observed=True)
+    assert copy.name == holiday.name and copy.bounds() == holiday.bounds()
+
+
+def test_recurring_pickle_compiled():
+    # compiled offsets are recompiled on unpickling
+    rules = [LondonBankHolidays.GoodFriday, LondonBankHolidays.SpringHoliday, NYBankHolidays.MLKDay,
+             NYBankHolidays.Thanksgiving, RecurringHoliday('Two offsets', offset=[relativedelta(month=5, day=31),
+                                                                                  relativedelta(weekday=MO(-1))])]
+    for rule in rules:
+        copy = pickle.loads(pickle.dumps(rule))
+        assert (copy._compiled is None) == (rule._compiled is None)
+        assert copy.dates(date(1990, 1, 1), date(2030, 12, 31)) == rule.dates(date(1990, 1, 1), date(2030, 12, 31))
+
+
+def test_recurring_cache_eviction():
+    holiday = RecurringHoliday('test', offset=relativedelta(month=11, weekday=MO(1)), cache_size=3)
+    assert holiday.dates(date(2020, 1, 1), date(2021, 12, 31)) == [date(2020, 11, 2), date(2021, 11, 1)]
+    assert holiday.cache_info().currsize == 3
+    # least recently used years are evicted first
+    assert list(holiday._cache) == [2020, 2021, 2022]
+    holiday.dates(date(2021, 1, 1), date(2021, 12, 31))
+    assert list(holiday._cache) == [2020, 2021, 2022]
+    holiday.cache_size = 1
+    holiday.dates(date(2018, 1, 1), date(2018, 12, 31))
+    assert list(holiday._cache) == [2019]
+
+    uncached = RecurringHoliday('test', month=1, day=1, cache_size=0)
+    assert uncached.dates(date(2021, 1, 1), date(2021, 12, 31)) == [date(2021, 1, 1)]
+    assert uncached.cache_info() == (0, 3, 0, 0)
+
+
+def test_recurring_uncompiled_offset():
+    # offsets the compiler does not recognize use relativedelta addition
+    holiday = RecurringHoliday('test', offset=relativedelta(months=+1, weekday=MO(1)))
+    assert holiday._compiled is None
+    assert holiday.dates(date(2021, 1, 1), date(2022, 12, 31)) == [date(2021, 2, 1), date(2022, 2, 7)]
+
+
+def test_list_holiday_sorted_unique():
+    holiday = ListHoliday('List holiday', [date(2021, 3, 1), date(2020, 3, 2), date(2021, 3, 1), date(2019, 3, 4)])
+    assert holiday.dates(date(2019, 1, 1), date(2022, 1, 1)) == [date(2019, 3, 4), date(2020, 3, 2), date(2021, 3, 1)]
+    assert holiday.dates(date(2020, 3, 2), date(2021, 2, 28)) == [date(2020, 3, 2)]
+    assert holiday.dates(date(2022, 1, 1), date(2021, 1, 1)) == []
+    assert holiday.__repr__() == 'ListHoliday: List holiday (number of dates=3)'
+
+
+def test_list_holiday_observed_range():
+    # 2021-01-03 is a Sunday observed on Monday 2021-01-04, 2022-01-01 is a Saturday observed on Friday 2021-12-31
+    holiday = ListHoliday('List holiday', [date(2021, 1, 3), date(2022, 1, 1)], observance=nearest_weekday)
+    assert holiday.dates(date(2021, 1, 4), date(2021, 12, 31), observed=True) == [date(2021, 1, 4), date(2021, 12, 31)]
+    assert holiday.dates(date(2021, 1, 4), date(2021, 12, 31)) == []
+    assert holiday.dates(date(2022, 1, 1), date(2022, 12, 31), observed=True) == []
+
+    def next_day(dt):
+        return date.fromordinal(dt.toordinal() + 1)
+
+    holiday = ListHoliday('List holiday', [date(2021, 12, 31)], observance=next_day)
+    assert holiday.dates(date(2022, 1, 1), date(2022, 12, 31), observed=True) == [date(2022, 1, 1)]
+
+
+def test_recurring_periodic():
+    assert RecurringHoliday('test', month=1, day=1, observance=nearest_weekday).periodic
+    assert RecurringHoliday('test', offset=[relativedelta(month=11, weekday=MO(1)), relativedelta(days=1)]).periodic
+    assert not RecurringHoliday('test', offset=EasterDelta(days=1)).periodic
+    assert not RecurringHoliday('test', offset=relativedelta(year=2020, month=1, day=1)).periodic
+    assert not RecurringHoliday('test', month=1, day=1, skip=lambda dt: False).periodic
+    assert not RecurringHoliday('test', month=1, day=1, observance=lambda dt: dt).periodic
+
+
+def test_recurring_cycle_table():
+    holiday = RecurringHoliday('test', offset=relativedelta(month=5, day=31, weekday=MO(-1)),
+                               observance=nearest_weekday)
+    reference = RecurringHoliday('test', offset=relativedelta(month=5, day=31, weekday=MO(-1)),
+                                 observance=nearest_weekday, skip=lambda dt: False)
+    # short queries use the year cache
+    holiday.dates(date(2021, 1, 1), date(2021, 12, 31))
+    assert holiday._cycle is None
+    # long queries build the cycle table and use it from then on
+    for observed in (False, True):
+        assert holiday.dates(date(1600, 1, 1), date(2800, 12, 31), observed) == \
+               reference.dates(date(1600, 1, 1), date(2800, 12, 31), observed)
+    assert holiday._cycle is not None
+    assert holiday.dates(date(9999, 1, 1), date(9999, 12, 31)) == [date(9999, 5, 31)]
+    assert holiday.cache_info().misses == 3
+    holiday.cache_clear()
+    assert holiday._cycle is None
+
+
+def test_dates_as_ordinals():
+    rules = [
+        RecurringHoliday('Jan 8', month=1, day=8, observance=nearest_weekday, skip=lambda dt: dt.year == 2021),
+        RecurringHoliday('Easter Monday', offset=EasterDelta(days=1)),
+        RecurringHoliday('Memorial Day', offset=relativedelta(month=5, day=31, weekday=MO(-1))),
+        ListHoliday('List', [date(2021, 1, 15), date(2022, 1, 8)], observance=nearest_weekday),
+    ]
+    for rule in rules:
+        for start, end in [(date(2019, 6, 1), date(2023, 1, 7)), (date(1900, 1, 1), date(2100, 12, 31))]:
+            for observed in (False, True):
+                ordinals = rule.dates(start, end, observed, as_ordinals=True)
+                assert ordinals.typecode == 'i'
+                assert list(ordinals) == [dt.toordinal() for dt in rule.dates(start, end, observed)]
+        # rules are slotted, without a per-instance dict
+        assert not hasattr(rule, '__dict__')
+    assert not hasattr(EasterDelta(days=1), '__dict__')
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+import pytest
+
+import holidaycal
+
+# import time budgets in seconds, generous for slow machines but well below eager imports of every module and rule
+IMPORT_BUDGET = 0.05
+FIRST_CALENDAR_BUDGET = 0.25
+
+
+def _run(code):
+    """Runs code in a new interpreter and returns what it prints, evaluated."""
+    result = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, check=True)
+    return eval(result.stdout)
+
+
+def test_import_is_lazy():
+    elapsed, modules = _run(
+        'import sys, time\n'
+        'start = time.perf_counter()\n'
+        'import holidaycal\n'
+        'elapsed = time.perf_counter() - start\n'
+        'print((elapsed, sorted(m for m in sys.modules if m.startswith(("holidaycal", "dateutil")))))\n')
+    assert modules == ['holidaycal']
+    assert elapsed < IMPORT_BUDGET
+
+
+def test_built_in_calendars_are_lazy():
+    elapsed, states = _run(
+        'import time\n'
+        'start = time.perf_counter()\n'
+        'from holidaycal import NYBankHolidayCalendar\n'
+        'NYBankHolidayCalendar()\n'
+        'elapsed = time.perf_counter() - start\n'
+        'from holidaycal.calendar import LondonBankHolidayCalendar\n'
+        'from holidaycal.holiday import LondonBankHolidays, NYBankHolidays\n'
+        'states = [type(vars(c)[a]).__name__ for c, a in [(NYBankHolidayCalendar, "rules"), '
+        '(NYBankHolidays, "ChristmasDay"), (LondonBankHolidayCalendar, "rules"), (LondonBankHolidays, "Christmas")]]\n'
+        'print((elapsed, states))\n')
+    assert states == ['list', 'RecurringHoliday', '_BuiltIn', '_BuiltIn']
+    assert elapsed < FIRST_CALENDAR_BUDGET
+
+
+def test_public_names():
+    assert set(holidaycal.__all__) <= set(dir(holidaycal))
+    for name in holidaycal.__all__:
+        assert getattr(holidaycal, name) is not None
+    from holidaycal.calendar import NYBankHolidayCalendar
+    from holidaycal.holiday import NYBankHolidays
+    assert holidaycal.NYBankHolidayCalendar is NYBankHolidayCalendar
+    assert NYBankHolidayCalendar().rules[0] is NYBankHolidays.NewYearsDay is NYBankHolidayCalendar.rules[0]
+    with pytest.raises(AttributeError):
+        holidaycal.Unknown
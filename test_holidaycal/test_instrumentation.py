@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import sys
+import pytest
+
+from holidaycal.calendar import AbstractCalendar, NYBankHolidayCalendar
+from holidaycal.holiday import ListHoliday, RecurringHoliday
+from holidaycal.instrumentation import CalendarStats, RuleCall, RuleStats
+from holidaycal.observance import nearest_weekday
+
+
+@pytest.fixture
+def calendar():
+    return AbstractCalendar(rules=[
+        RecurringHoliday('Jan 8', month=1, day=8, observance=nearest_weekday, skip=lambda dt: dt.year == 2021),
+        ListHoliday('Extra', [date(2021, 1, 8), date(2022, 3, 1)])
+    ])
+
+
+def test_rule_instrumentation():
+    rule = RecurringHoliday('Jan 8', month=1, day=8, observance=nearest_weekday, skip=lambda dt: dt.year == 2021)
+    assert rule.stats is None
+    calls = []
+    stats = rule.enable_instrumentation(calls.append)
+    assert isinstance(stats, RuleStats) and rule.stats is stats
+
+    assert rule.dates(date(2020, 1, 1), date(2022, 12, 31), observed=True) == [date(2020, 1, 8), date(2022, 1, 7)]
+    assert rule.dates(date(2020, 1, 1), date(2022, 12, 31)) == [date(2020, 1, 8), date(2022, 1, 8)]
+    assert stats.calls == 2
+    assert stats.dates == 4
+    assert stats.cache_misses == 5 and stats.cache_hits == 5
+    assert stats.time >= stats.offset_time + stats.skip_time + stats.observance_time
+    assert stats.offset_time > 0 and stats.skip_time > 0 and stats.observance_time > 0
+    assert len(calls) == 2 and isinstance(calls[0], RuleCall)
+    assert calls[0].rule == 'Jan 8' and calls[0].dates == 2 and calls[0].cache_misses == 5
+    assert calls[1].cache_hits == 5 and calls[1].offset_time == 0
+    assert stats.as_dict()['calls'] == 2
+
+    stats.reset()
+    assert stats.calls == 0 and stats.time == 0
+
+    rule.disable_instrumentation()
+    assert rule.stats is None
+    assert not hasattr(rule, '__dict__')
+    rule.dates(date(2020, 1, 1), date(2022, 12, 31))
+    assert len(calls) == 2 and stats.calls == 0
+
+
+def test_calendar_instrumentation(calendar):
+    stats = calendar.enable_instrumentation()
+    assert isinstance(stats, CalendarStats) and calendar.stats is stats
+    assert [s.rule for s in stats.rules] == ['Jan 8', 'Extra']
+
+    calendar.holidays(date(2021, 1, 1), date(2022, 12, 31))
+    calendar.holidays(date(2022, 1, 1), date(2022, 12, 31))
+    assert stats.index_misses == 1 and stats.index_hits == 1 and stats.index_time > 0
+    assert [s.calls for s in stats.rules] == [1, 1]
+    assert [s.dates for s in stats.rules] == [1, 2]
+    assert len(stats.slowest(1)) == 1
+    assert stats.as_dict()['rules'][1]['rule'] == 'Extra'
+
+    stats.reset()
+    assert stats.index_hits == 0 and stats.rules[0].calls == 0
+
+    calendar.disable_instrumentation()
+    assert calendar.stats is None
+    assert all(rule.stats is None for rule in calendar.rules)
+    assert calendar.holidays(date(2021, 1, 1), date(2022, 12, 31)) == \
+           [date(2021, 1, 8), date(2022, 1, 8), date(2022, 3, 1)]
+
+
+def test_shared_rule_instrumentation():
+    # instances of a built-in calendar share their rules, and each keeps its own measurements
+    a, b = NYBankHolidayCalendar(), NYBankHolidayCalendar()
+    stats_a, stats_b = a.enable_instrumentation(), b.enable_instrumentation()
+    a.holidays(date(2021, 1, 1), date(2021, 12, 31))
+    assert sum(s.calls for s in stats_a.rules) == len(stats_a.rules)
+    assert sum(s.calls for s in stats_b.rules) == len(stats_b.rules)
+
+    b.disable_instrumentation()
+    assert b.stats is None and a.stats is stats_a
+    assert all(rule.stats is not None for rule in a.rules)
+    a.holidays(date(2022, 1, 1), date(2022, 12, 31))
+    assert sum(s.calls for s in stats_a.rules) == 2 * len(stats_a.rules)
+    assert sum(s.calls for s in stats_b.rules) == len(stats_b.rules)
+
+    # enabling again replaces the calendar's own measurements only
+    assert a.enable_instrumentation() is not stats_a
+    a.disable_instrumentation()
+    assert all(rule.stats is None for rule in a.rules)
+
+
+def test_rule_instrumentation_subscribers():
+    rule = RecurringHoliday('Jan 8', month=1, day=8)
+    first, second = rule.enable_instrumentation(), rule.enable_instrumentation()
+    assert rule.stats is second
+    rule.dates(date(2021, 1, 1), date(2021, 12, 31))
+    assert first.calls == second.calls == 1
+    rule.disable_instrumentation(second)
+    assert rule.stats is first
+    rule.dates(date(2021, 1, 1), date(2021, 12, 31))
+    assert first.calls == 2 and second.calls == 1
+    rule.disable_instrumentation()
+    assert rule.stats is None
+
+
+@pytest.fixture
+def switch_often():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_rule_instrumentation_threads(switch_often):
+    # calls of a shared rule from several threads overlap
+    rule = RecurringHoliday('Jan 8', month=1, day=8, observance=nearest_weekday, skip=lambda dt: dt.year == 2021,
+                            cache_size=0)
+    calls = []
+    stats = rule.enable_instrumentation(calls.append)
+    ranges = [(date(1900 + i % 400, 1, 1), date(1900 + i % 400 + i % 7, 12, 31)) for i in range(2000)]
+
+    def query(bounds):
+        return len(rule.dates(*bounds, observed=True))
+
+    with ThreadPoolExecutor(8) as pool:
+        counts = list(pool.map(query, ranges))
+    assert stats.calls == len(ranges) == len(calls)
+    assert stats.dates == sum(counts)
+    # each call only has the offset, skip and observance times of its own years
+    assert all(call.time >= call.offset_time + call.skip_time + call.observance_time for call in calls)
+    assert all(call.offset_time > 0 and call.skip_time > 0 for call in calls)
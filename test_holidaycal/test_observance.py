@@ -1,7 +1,10 @@
-from datetime import date
+from datetime import date, datetime, timedelta
+import pytest
 
+from holidaycal.calendar import AbstractCalendar
+from holidaycal.holiday import ListHoliday, RecurringHoliday
 from holidaycal.observance import nearest_weekday, saturday_to_friday, sunday_to_monday, \
-    weekend_to_friday, weekend_to_monday, sunday_to_tuesday
+    weekend_to_friday, weekend_to_monday, weekend_to_next_weekdays, sunday_to_tuesday, CollisionObservance, Observance
 
 
 def test_nearest_weekday():
@@ -39,3 +42,88 @@ def test_sunday_to_tuesday():
     assert sunday_to_tuesday(date(2021, 10, 2)) == date(2021, 10, 2)  # Sat
     assert sunday_to_tuesday(date(2021, 10, 3)) == date(2021, 10, 5)  # Sun to Tuesday
     assert sunday_to_tuesday(date(2021, 10, 4)) == date(2021, 10, 4)  # Monday
+
+
+def test_weekend_to_next_weekdays():
+    assert weekend_to_next_weekdays(date(2021, 9, 30)) == date(2021, 9, 30)  # Thursday
+    assert weekend_to_next_weekdays(date(2021, 10, 2)) == date(2021, 10, 4)  # Sat to Mon
+    assert weekend_to_next_weekdays(date(2021, 10, 3)) == date(2021, 10, 5)  # Sun to Tuesday
+
+
+def test_observance_table():
+    assert nearest_weekday.shifts == (0, 0, 0, 0, 0, -1, 1)
+    assert nearest_weekday.__name__ == 'nearest_weekday'
+    assert nearest_weekday.__repr__() == 'Observance(nearest_weekday, shifts=(0, 0, 0, 0, 0, -1, 1))'
+    with pytest.raises(ValueError):
+        Observance('too short', (0, 0, 0))
+
+
+def test_observance_datetime():
+    assert weekend_to_monday(datetime(2021, 10, 2, 9, 30)) == datetime(2021, 10, 4, 9, 30)
+
+
+def test_observance_ordinals():
+    dates = [date(2021, 9, 27) + timedelta(days=i) for i in range(14)]
+    ordinals = [dt.toordinal() for dt in dates]
+    for observance in (nearest_weekday, saturday_to_friday, sunday_to_monday, weekend_to_friday,
+                       weekend_to_monday, weekend_to_next_weekdays, sunday_to_tuesday):
+        expected = [observance(dt).toordinal() for dt in dates]
+        assert [observance.apply_ordinal(o) for o in ordinals] == expected
+        assert observance.apply_ordinals(ordinals) == expected
+
+
+def test_observance_array():
+    np = pytest.importorskip('numpy')
+    dates = np.arange('2021-09-27', '2021-10-11', dtype='datetime64[D]')
+    for observance in (nearest_weekday, weekend_to_friday, sunday_to_tuesday):
+        assert observance.apply_array(dates).tolist() == [observance(dt) for dt in dates.tolist()]
+
+
+def test_observance_then():
+    chained = saturday_to_friday.then(sunday_to_monday)
+    assert chained == nearest_weekday
+    assert chained.__name__ == 'saturday_to_friday_then_sunday_to_monday'
+    # Saturday to Monday, then Monday to Tuesday
+    monday_to_tuesday = Observance('monday_to_tuesday', (1, 0, 0, 0, 0, 0, 0))
+    chained = weekend_to_monday.then(monday_to_tuesday, name='weekend_to_tuesday')
+    assert chained.shifts == (1, 0, 0, 0, 0, 3, 2)
+    assert chained(date(2021, 10, 2)) == date(2021, 10, 5)
+    assert hash(chained) == hash(Observance('other', (1, 0, 0, 0, 0, 3, 2)))
+
+
+def test_observance_avoiding():
+    christmas = RecurringHoliday('Christmas', month=12, day=25, observance=weekend_to_monday)
+    avoiding = weekend_to_monday.avoiding(christmas)
+    assert isinstance(avoiding, CollisionObservance) and avoiding.__name__ == 'weekend_to_monday_avoiding_collisions'
+    boxing_day = RecurringHoliday('Boxing Day', month=12, day=26, observance=avoiding)
+    calendar = AbstractCalendar(rules=[christmas, boxing_day])
+    expected = {
+        2019: [date(2019, 12, 25), date(2019, 12, 26)],  # Wednesday and Thursday
+        2020: [date(2020, 12, 25), date(2020, 12, 28)],  # Friday, Boxing Day on Saturday to Monday
+        2021: [date(2021, 12, 27), date(2021, 12, 28)],  # Saturday and Sunday, Boxing Day to Tuesday
+        2022: [date(2022, 12, 26), date(2022, 12, 27)],  # Sunday and Monday, Boxing Day to Tuesday
+    }
+    for year, dates in expected.items():
+        assert calendar.holidays(date(year, 12, 1), date(year, 12, 31), observed=True) == dates
+        assert boxing_day.dates(date(year, 12, 1), date(year, 12, 31), observed=True) == dates[1:]
+    assert boxing_day.date_pairs(date(2021, 1, 1), date(2021, 12, 31)) == [(date(2021, 12, 26), date(2021, 12, 28))]
+    assert calendar.holiday_name(date(2021, 12, 28), observed=True) == 'Boxing Day'
+
+    # moves past every holiday in the way, to a date the observance leaves in place
+    closures = ListHoliday('Closures', [date(2021, 12, 28), date(2021, 12, 29), date(2021, 12, 30), date(2021, 12, 31)])
+    assert weekend_to_monday.avoiding(christmas, closures)(date(2021, 12, 26)) == date(2022, 1, 3)
+    assert nearest_weekday.avoiding(closures)(date(2021, 12, 31)) == date(2022, 1, 3)
+    assert sunday_to_monday.avoiding(christmas, name='after_christmas').__name__ == 'after_christmas'
+
+
+def test_observance_avoiding_changes():
+    # cached rules do not keep observed dates that depend on the holidays they avoid
+    christmas = RecurringHoliday('Christmas', month=12, day=25, observance=weekend_to_monday)
+    avoiding = weekend_to_monday.avoiding(christmas)
+    boxing_day = RecurringHoliday('Boxing Day', month=12, day=26, observance=avoiding)
+    boxing_days = ListHoliday('Boxing Days', [date(2021, 12, 26)], observance=avoiding)
+    for rule in (boxing_day, boxing_days):
+        assert rule.dates(date(2021, 12, 1), date(2021, 12, 31), observed=True) == [date(2021, 12, 28)]
+    avoiding.holidays = (RecurringHoliday('Christmas', month=12, day=25),)
+    for rule in (boxing_day, boxing_days):
+        assert rule.dates(date(2021, 12, 1), date(2021, 12, 31), observed=True) == [date(2021, 12, 27)]
@@ -0,0 +1,108 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+import random
+import sys
+import pytest
+
+from holidaycal.calendar import AbstractCalendar, JointCalendar, LondonBankHolidayCalendar, NYBankHolidayCalendar
+from holidaycal.holiday import ListHoliday, RecurringHoliday
+from holidaycal.registry import get_calendar, register_calendar, registered_calendars, unregister_calendar
+
+
+def test_get_calendar():
+    calendar = get_calendar('NYBankHolidayCalendar')
+    assert isinstance(calendar, NYBankHolidayCalendar)
+    assert get_calendar(NYBankHolidayCalendar) is calendar
+    assert get_calendar('NYBankHolidayCalendar') is calendar
+    assert 'LondonBankHolidayCalendar' in registered_calendars()
+    with pytest.raises(KeyError):
+        get_calendar('Unknown')
+    with pytest.raises(TypeError):
+        get_calendar(date)
+
+
+def test_register_calendar():
+    custom = AbstractCalendar('Custom', rules=[RecurringHoliday('Jan 8', month=1, day=8)])
+    register_calendar(custom)
+    assert get_calendar('Custom') is custom
+    register_calendar(LondonBankHolidayCalendar, 'London')
+    assert get_calendar('London') is get_calendar(LondonBankHolidayCalendar)
+    unregister_calendar('Custom')
+    unregister_calendar('London')
+    assert 'Custom' not in registered_calendars()
+    with pytest.raises(KeyError):
+        get_calendar('Custom')
+    with pytest.raises(TypeError):
+        register_calendar('Custom')
+
+
+def _queries(calendar, seed):
+    rng = random.Random(seed)
+    results = []
+    for _ in range(100):
+        start = date(rng.randint(1800, 2200), rng.randint(1, 12), rng.randint(1, 28))
+        end = date(start.year + rng.randint(0, 30), 12, 31)
+        results.append((
+            calendar.holidays(start, end, names=True, observed=rng.random() < 0.5),
+            calendar.is_holiday(end, observed=True),
+            calendar.add_business_days(start, rng.randint(-500, 500)),
+            calendar.business_days_between(start, end),
+            calendar.holiday_name(start),
+        ))
+    return results
+
+
+@pytest.fixture
+def switch_often():
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.parametrize('key', ['NYBankHolidayCalendar', 'LondonBankHolidayCalendar'])
+def test_shared_calendar_stress(key, switch_often):
+    calendar_class = NYBankHolidayCalendar if key == 'NYBankHolidayCalendar' else LondonBankHolidayCalendar
+    for rule in calendar_class.rules:
+        if isinstance(rule, RecurringHoliday):
+            rule.cache_clear()
+    # reference results from an unshared calendar with a rule cache that is too small to keep every year
+    reference_calendar = AbstractCalendar(rules=[
+        RecurringHoliday(r.name, r.month, r.day, r.offset, r.start_date, r.end_date, r._observance, cache_size=4)
+        if isinstance(r, RecurringHoliday) else r for r in calendar_class.rules
+    ])
+    expected = [_queries(reference_calendar, seed) for seed in range(32)]
+
+    unregister_calendar(key)
+    register_calendar(calendar_class, key)
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        calendars = list(pool.map(lambda _: get_calendar(key), range(64)))
+        results = list(pool.map(lambda seed: _queries(get_calendar(key), seed), range(32)))
+    assert all(c is calendars[0] for c in calendars)
+    assert results == expected
+
+
+def test_calendar_changes_stress(switch_often):
+    first = AbstractCalendar('First', rules=[RecurringHoliday('Jan 8', month=1, day=8)])
+    second = AbstractCalendar('Second', rules=[RecurringHoliday('Jan 9', month=1, day=9)])
+    joint = JointCalendar([first, second])
+    closures = [ListHoliday(f'Closure {i}', [date(2000 + i, 3, 1)]) for i in range(40)]
+
+    def work(i):
+        if i % 4 == 0:
+            (first if i % 8 else second).add_rule(closures[i // 4])
+        rng = random.Random(i)
+        start = date(rng.randint(1950, 2050), 1, 1)
+        joint.holidays(start, date(start.year + 20, 12, 31))
+        joint.business_days_between(start, date(start.year + 20, 12, 31))
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(work, range(160)))
+
+    fresh = JointCalendar([AbstractCalendar(rules=list(first.rules)), AbstractCalendar(rules=list(second.rules))])
+    assert len(first.rules) + len(second.rules) == 42
+    for observed in (False, True):
+        assert joint.holidays(date(1900, 1, 1), date(2100, 12, 31), names=True, observed=observed) == \
+               fresh.holidays(date(1900, 1, 1), date(2100, 12, 31), names=True, observed=observed)
+    assert joint.business_days_between(date(1900, 1, 1), date(2100, 12, 31)) == \
+           fresh.business_days_between(date(1900, 1, 1), date(2100, 12, 31))
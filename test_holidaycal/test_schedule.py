@@ -0,0 +1,94 @@
+from datetime import date
+import pytest
+
+from holidaycal.calendar import NYBankHolidayCalendar
+from holidaycal.schedule import generate_schedule, generate_schedules
+
+
+@pytest.mark.parametrize('stub, expected', [
+    ('short_front', [date(2021, 1, 15), date(2021, 3, 30), date(2021, 6, 30), date(2021, 9, 30), date(2021, 12, 30),
+                     date(2022, 3, 30), date(2022, 6, 30)]),
+    ('long_front', [date(2021, 1, 15), date(2021, 6, 30), date(2021, 9, 30), date(2021, 12, 30), date(2022, 3, 30),
+                    date(2022, 6, 30)]),
+    ('short_back', [date(2021, 1, 15), date(2021, 4, 15), date(2021, 7, 15), date(2021, 10, 15), date(2022, 1, 15),
+                    date(2022, 4, 15), date(2022, 6, 30)]),
+    ('long_back', [date(2021, 1, 15), date(2021, 4, 15), date(2021, 7, 15), date(2021, 10, 15), date(2022, 1, 15),
+                   date(2022, 6, 30)]),
+])
+def test_stubs(stub, expected):
+    unadjusted, adjusted = generate_schedule(None, date(2021, 1, 15), date(2022, 6, 30), 'quarterly', stub, roll=None)
+    assert unadjusted == adjusted == expected
+
+
+def test_no_stub():
+    for stub in ('short_front', 'long_front', 'short_back', 'long_back'):
+        unadjusted, _ = generate_schedule(None, date(2021, 1, 15), date(2022, 1, 15), 6, stub, roll=None)
+        assert unadjusted == [date(2021, 1, 15), date(2021, 7, 15), date(2022, 1, 15)]
+
+
+def test_end_of_month():
+    unadjusted, _ = generate_schedule(None, date(2021, 1, 31), date(2021, 5, 31), 'monthly', 'short_back', roll=None)
+    assert unadjusted == [date(2021, 1, 31), date(2021, 2, 28), date(2021, 3, 31), date(2021, 4, 30),
+                          date(2021, 5, 31)]
+    unadjusted, _ = generate_schedule(None, date(2021, 1, 31), date(2021, 5, 31), 'monthly', 'short_back', roll=None,
+                                      eom=True)
+    assert unadjusted == [date(2021, 1, 31), date(2021, 2, 28), date(2021, 3, 31), date(2021, 4, 30),
+                          date(2021, 5, 31)]
+    unadjusted, _ = generate_schedule(None, date(2020, 2, 29), date(2021, 2, 28), 'quarterly', 'short_back',
+                                      roll=None)
+    assert unadjusted == [date(2020, 2, 29), date(2020, 5, 29), date(2020, 8, 29), date(2020, 11, 29),
+                          date(2021, 2, 28)]
+    unadjusted, _ = generate_schedule(None, date(2020, 2, 29), date(2021, 2, 28), 'quarterly', 'short_back',
+                                      roll=None, eom=True)
+    assert unadjusted == [date(2020, 2, 29), date(2020, 5, 31), date(2020, 8, 31), date(2020, 11, 30),
+                          date(2021, 2, 28)]
+
+
+def test_roll():
+    calendar = NYBankHolidayCalendar()
+    unadjusted, adjusted = generate_schedule(calendar, date(2021, 1, 31), date(2021, 7, 31), 'quarterly', eom=True)
+    assert unadjusted == [date(2021, 1, 31), date(2021, 4, 30), date(2021, 7, 31)]
+    assert adjusted == [date(2021, 1, 29), date(2021, 4, 30), date(2021, 7, 30)]
+    _, adjusted = generate_schedule(calendar, date(2021, 1, 31), date(2021, 7, 31), 'quarterly', roll='following')
+    assert adjusted == [date(2021, 2, 1), date(2021, 4, 30), date(2021, 8, 2)]
+
+
+def test_generate_schedules():
+    calendar = NYBankHolidayCalendar()
+    starts = [date(2021, 1, 15), date(2020, 3, 31), date(2021, 1, 15)]
+    ends = [date(2022, 6, 30), date(2030, 3, 31), date(2022, 6, 30)]
+    schedules = generate_schedules(calendar, starts, ends, 'quarterly', 'long_front', eom=True)
+    assert len(schedules) == 3
+    assert list(schedules.offsets) == [0, 6, 47, 53]
+    for i, (start, end) in enumerate(zip(starts, ends)):
+        unadjusted, adjusted = generate_schedule(calendar, start, end, 'quarterly', 'long_front', eom=True)
+        assert schedules.dates(i, adjusted=False) == unadjusted
+        assert schedules.dates(i) == schedules[i] == adjusted
+    assert list(schedules) == [schedules[i] for i in range(3)]
+    assert schedules[-1] == schedules[2]
+    with pytest.raises(IndexError):
+        schedules[3]
+
+
+def test_to_numpy():
+    np = pytest.importorskip('numpy')
+    schedules = generate_schedules(NYBankHolidayCalendar(), [date(2021, 1, 15)], [date(2022, 1, 15)], 'semiannual')
+    offsets, dates = schedules.to_numpy()
+    assert offsets.tolist() == [0, 3]
+    assert dates.tolist() == schedules.dates(0)
+    assert dates.dtype == np.dtype('datetime64[D]')
+
+
+def test_invalid():
+    with pytest.raises(ValueError):
+        generate_schedule(None, date(2021, 1, 15), date(2021, 1, 15), 'monthly', roll=None)
+    with pytest.raises(ValueError):
+        generate_schedule(None, date(2021, 1, 15), date(2022, 1, 15), 'weekly', roll=None)
+    with pytest.raises(ValueError):
+        generate_schedule(None, date(2021, 1, 15), date(2022, 1, 15), 0, roll=None)
+    with pytest.raises(ValueError):
+        generate_schedule(None, date(2021, 1, 15), date(2022, 1, 15), 'monthly', 'middle', roll=None)
+    with pytest.raises(ValueError):
+        generate_schedule(NYBankHolidayCalendar(), date(2021, 1, 15), date(2022, 1, 15), 'monthly', roll='nearest')
+    with pytest.raises(ValueError):
+        generate_schedules(None, [date(2021, 1, 15)], [], 'monthly', roll=None)
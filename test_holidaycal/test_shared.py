@@ -0,0 +1,47 @@
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+import pickle
+import pytest
+
+from holidaycal.calendar import LondonBankHolidayCalendar, NYBankHolidayCalendar
+from holidaycal.shared import attach_calendar, publish_calendar
+
+pytest.importorskip('multiprocessing.shared_memory')
+
+
+def _queries(calendar):
+    return (calendar.holidays(date(1990, 1, 1), date(2030, 12, 31), names=True, observed=True),
+            calendar.business_days_between(date(1990, 1, 1), date(2031, 1, 1)),
+            calendar.add_business_days(date(2021, 12, 24), 1),
+            calendar.roll(date(2021, 7, 31), 'modified_following'),
+            calendar.holiday_name(date(2021, 12, 27), observed=True),
+            calendar.next_holiday(date(2021, 12, 27), observed=True),
+            calendar.previous_holiday(date(2021, 12, 27), observed=True))
+
+
+def _attach_and_query(name):
+    with attach_calendar(name) as calendar:
+        return _queries(calendar)
+
+
+@pytest.mark.parametrize('cls', [NYBankHolidayCalendar, LondonBankHolidayCalendar])
+def test_publish_and_attach(cls):
+    calendar = cls()
+    with publish_calendar(calendar, 1990, 2030) as published:
+        assert published.owner and published.matches(calendar)
+        with attach_calendar(published.name) as attached:
+            assert not attached.owner
+            assert _queries(attached) == _queries(published) == _queries(calendar)
+    with pytest.raises(FileNotFoundError):
+        attach_calendar(published.name)
+
+
+def test_workers():
+    calendar = NYBankHolidayCalendar()
+    with publish_calendar(calendar, 1990, 2030) as published:
+        with ProcessPoolExecutor(2) as pool:
+            results = list(pool.map(_attach_and_query, [published.name] * 4))
+        unpickled = pickle.loads(pickle.dumps(published))
+        assert _queries(unpickled) == _queries(calendar)
+        unpickled.close()
+    assert results == [_queries(calendar)] * 4
@@ -0,0 +1,135 @@
+from datetime import date
+from itertools import islice
+import pytest
+
+from holidaycal.calendar import AbstractCalendar, LondonBankHolidayCalendar, NYBankHolidayCalendar
+from holidaycal.holiday import ListHoliday, RecurringHoliday
+from holidaycal.observance import nearest_weekday
+from holidaycal.snapshot import CalendarSnapshot, compile_snapshot, load_snapshot, save_snapshot
+
+
+@pytest.fixture
+def calendar():
+    return AbstractCalendar(rules=[
+        RecurringHoliday('Jan 8', month=1, day=8, observance=nearest_weekday),
+        ListHoliday('Extra', [date(2021, 1, 8), date(2022, 3, 1)])
+    ])
+
+
+@pytest.mark.parametrize('cls', [NYBankHolidayCalendar, LondonBankHolidayCalendar])
+def test_snapshot_matches_calendar(cls, tmp_path):
+    calendar = cls()
+    path = tmp_path / 'calendar.snap'
+    save_snapshot(calendar, path, 1990, 2030)
+    with load_snapshot(path) as snapshot:
+        assert snapshot.start_year == 1990 and snapshot.end_year == 2030
+        assert snapshot.holiday_names() == calendar.holiday_names()
+        for observed in (False, True):
+            for names in (False, True):
+                assert snapshot.holidays(date(1990, 1, 1), date(2030, 12, 31), names=names, observed=observed) == \
+                       calendar.holidays(date(1990, 1, 1), date(2030, 12, 31), names=names, observed=observed)
+                assert snapshot.holidays(date(1990, 1, 1), date(2030, 12, 31), names, observed, as_ordinals=True) == \
+                       calendar.holidays(date(1990, 1, 1), date(2030, 12, 31), names, observed, as_ordinals=True)
+        assert snapshot.matches(calendar)
+
+
+@pytest.mark.parametrize('cls', [NYBankHolidayCalendar, LondonBankHolidayCalendar])
+def test_snapshot_lookups_match_calendar(cls):
+    calendar = cls()
+    snapshot = CalendarSnapshot(compile_snapshot(calendar, 2000, 2030))
+    start, end = date(2000, 1, 1), date(2030, 12, 31)
+    for observed in (False, True):
+        assert snapshot.holidays_between(start, end, observed) == \
+               [(dt, rule.name) for dt, rule in calendar.holidays_between(start, end, observed)]
+        for dt in (date(2000, 1, 1), date(2010, 5, 31), date(2021, 12, 25), date(2022, 12, 27), date(2030, 6, 1)):
+            assert snapshot.holiday_name(dt, observed) == calendar.holiday_name(dt, observed)
+            assert snapshot.next_holiday(dt, observed) == calendar.next_holiday(dt, observed)
+            assert snapshot.previous_holiday(dt + (end - dt) // 2, observed) == \
+                   calendar.previous_holiday(dt + (end - dt) // 2, observed)
+        for direction in ('forward', 'backward'):
+            for names in (False, True):
+                assert list(islice(snapshot.iter_holidays(date(2021, 1, 1), direction, observed, names), 50)) == \
+                       list(islice(calendar.iter_holidays(date(2021, 1, 1), direction, observed, names), 50))
+
+
+def test_snapshot_lookups_stop_at_snapshot_years(calendar):
+    snapshot = CalendarSnapshot(compile_snapshot(calendar, 2021, 2022))
+    assert list(snapshot.iter_holidays(date(2022, 1, 8))) == [date(2022, 1, 8), date(2022, 3, 1)]
+    assert list(snapshot.iter_holidays(date(2021, 6, 1), 'backward', names=True)) == \
+           [('Extra', date(2021, 1, 8)), ('Jan 8', date(2021, 1, 8))]
+    assert snapshot.holiday_name(date(2021, 1, 8)) == 'Jan 8 / Extra'
+    assert snapshot.holiday_name(date(2021, 1, 9)) is None
+    assert snapshot.next_holiday(date(2021, 1, 8)) == date(2022, 1, 8)
+    assert snapshot.previous_holiday(date(2022, 3, 1), observed=True) == date(2022, 1, 7)
+    with pytest.raises(ValueError):
+        snapshot.next_holiday(date(2022, 3, 1))
+    with pytest.raises(ValueError):
+        snapshot.previous_holiday(date(2021, 1, 8))
+    with pytest.raises(ValueError):
+        snapshot.iter_holidays(date(2023, 1, 1))
+    with pytest.raises(ValueError):
+        snapshot.iter_holidays(date(2021, 1, 1), 'sideways')
+
+
+def test_snapshot_queries(calendar):
+    snapshot = CalendarSnapshot(compile_snapshot(calendar, 2021, 2022))
+    assert len(snapshot) == 5
+    assert snapshot.holidays(date(2021, 1, 1), date(2022, 12, 31), names=True) == \
+           [('Jan 8', date(2021, 1, 8)), ('Extra', date(2021, 1, 8)), ('Jan 8', date(2022, 1, 8)),
+            ('Extra', date(2022, 3, 1))]
+    assert snapshot.holidays(date(2022, 1, 1), date(2022, 12, 31), observed=True) == \
+           [date(2022, 1, 7), date(2022, 3, 1)]
+    assert snapshot.holidays(date(2022, 1, 1), date(2021, 1, 1)) == []
+    assert snapshot.is_holiday(date(2022, 1, 8))
+    assert not snapshot.is_holiday(date(2022, 1, 8), observed=True)
+    assert not snapshot.is_business_day(date(2022, 1, 7))
+    assert snapshot.is_business_day(date(2022, 1, 10))
+    with pytest.raises(ValueError):
+        snapshot.holidays(date(2020, 12, 31), date(2021, 1, 10))
+    with pytest.raises(ValueError):
+        snapshot.is_holiday(date(2023, 1, 1))
+
+
+def test_snapshot_matches(calendar):
+    snapshot = CalendarSnapshot(compile_snapshot(calendar, 2021, 2022))
+    assert snapshot.matches(calendar)
+    changed = AbstractCalendar(rules=calendar.rules[:1])
+    assert not snapshot.matches(changed)
+    assert not snapshot.matches(AbstractCalendar(rules=calendar.rules, weekmask='1111110'))
+
+
+def test_invalid_snapshot(calendar):
+    data = compile_snapshot(calendar, 2021, 2022)
+    with pytest.raises(ValueError):
+        CalendarSnapshot(b'XXXX' + data[4:])
+    with pytest.raises(ValueError):
+        CalendarSnapshot(data[:10])
+    with pytest.raises(ValueError):
+        CalendarSnapshot(data[:-1])
+
+
+@pytest.mark.parametrize('version', [1, 2])
+def test_snapshot_business_days(version):
+    calendar = NYBankHolidayCalendar()
+    data = compile_snapshot(calendar, 1990, 2030)
+    if version == 1:
+        # version 1 snapshots end after the flags section
+        count = len(CalendarSnapshot(data))
+        end = len(data) - (date(2030, 12, 31) - date(1990, 1, 1)).days * 4 - 8 - (-count * 7 % 4)
+        data = data[:4] + (1).to_bytes(2, 'little') + data[6:end]
+    snapshot = CalendarSnapshot(data)
+    assert snapshot.version == version
+    for start, end in [(date(1990, 1, 1), date(2031, 1, 1)), (date(2021, 12, 24), date(2022, 1, 4)),
+                       (date(2022, 1, 4), date(2021, 12, 24)), (date(2021, 7, 5), date(2021, 7, 5))]:
+        assert snapshot.business_days_between(start, end) == calendar.business_days_between(start, end)
+    for dt in [date(2021, 7, 31), date(2021, 12, 25), date(2022, 1, 1), date(2021, 7, 5)]:
+        for convention in ('following', 'preceding', 'modified_following', 'modified_preceding'):
+            assert snapshot.roll(dt, convention) == calendar.roll(dt, convention)
+        for n in (-20, -1, 0, 1, 250):
+            assert snapshot.add_business_days(dt, n) == calendar.add_business_days(dt, n)
+    with pytest.raises(ValueError):
+        snapshot.business_days_between(date(1989, 12, 31), date(2000, 1, 1))
+    with pytest.raises(ValueError):
+        snapshot.add_business_days(date(2030, 12, 1), 100)
+    with pytest.raises(ValueError):
+        snapshot.roll(date(2021, 7, 31), 'nearest')